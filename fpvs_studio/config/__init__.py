@@ -1,15 +1,27 @@
 """Configuration utilities for FPVS Studio."""
 
+from .asset_index import AssetIndex, build_asset_index, update_asset_index
 from .serialization import (
+    asset_index_path,
     experiment_from_dict,
     experiment_to_dict,
+    load_asset_index,
     load_experiment,
+    refresh_saved_asset_index,
+    save_asset_index,
     save_experiment,
 )
 
 __all__ = [
+    "AssetIndex",
+    "asset_index_path",
+    "build_asset_index",
     "experiment_from_dict",
     "experiment_to_dict",
+    "load_asset_index",
     "load_experiment",
+    "refresh_saved_asset_index",
+    "save_asset_index",
     "save_experiment",
+    "update_asset_index",
 ]
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+from fpvs_studio.models.condition import ConditionModel
+
+ASSET_INDEX_VERSION = 1
+ASSET_INDEX_SUFFIX = ".assets.json"
+
+# Stimulus file types; engine.stimulus_loading.ALLOWED_EXTENSIONS is this set.
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".bmp"})
+
+_HASH_CHUNK_BYTES = 1 << 20
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...); C4, C8
+# and CC share the range but are not frames.
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+@dataclass
+class AssetFile:
+    """One stimulus file as last seen on disk."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class AssetContent:
+    """One distinct file content; identical files in several places share it.
+
+    ``error`` is set, and the dimensions are 0, when the header could not be read.
+    """
+
+    size: int
+    width: int
+    height: int
+    error: Optional[str] = None
+
+
+@dataclass
+class IndexedCondition:
+    """A condition's stimulus file lists, in presentation (sorted) order."""
+
+    condition_id: str
+    base_dir: str
+    oddball_dir: str
+    base_files: list[str]
+    oddball_files: list[str]
+
+
+@dataclass
+class AssetIndexStats:
+    """What :func:`update_asset_index` had to do; not persisted."""
+
+    listed_dirs: int = 0
+    stat_files: int = 0
+    hashed_files: int = 0
+    parsed_contents: int = 0
+
+
+@dataclass
+class AssetIndex:
+    """Persistent record of every condition's stimuli.
+
+    ``files`` maps each path to its size, mtime and SHA-256; ``contents``
+    maps each SHA-256 to the size and pixel dimensions of that content, so
+    files duplicated across conditions are measured once. ``directories``
+    holds each stimulus directory's mtime when it was last listed.
+    """
+
+    conditions: dict[str, IndexedCondition] = field(default_factory=dict)
+    files: dict[str, AssetFile] = field(default_factory=dict)
+    contents: dict[str, AssetContent] = field(default_factory=dict)
+    directories: dict[str, int] = field(default_factory=dict)
+    version: int = ASSET_INDEX_VERSION
+
+    def condition_paths(self, condition_id: str) -> tuple[list[Path], list[Path]]:
+        """Return ``(base_paths, oddball_paths)`` for one condition."""
+
+        condition = self.conditions[condition_id]
+        return [Path(name) for name in condition.base_files], [
+            Path(name) for name in condition.oddball_files
+        ]
+
+    def content_hashes(self) -> dict[Path, str]:
+        """Map every indexed path to its SHA-256, for the decoded pixel cache."""
+
+        return {Path(name): entry.sha256 for name, entry in self.files.items()}
+
+    def duplicates(self) -> dict[str, list[str]]:
+        """Group paths whose contents are identical, keyed by SHA-256."""
+
+        groups: dict[str, list[str]] = {}
+        for name, entry in self.files.items():
+            groups.setdefault(entry.sha256, []).append(name)
+        return {digest: sorted(names) for digest, names in groups.items() if len(names) > 1}
+
+    def header_errors(self) -> list[str]:
+        """Return one message per file whose image header could not be read."""
+
+        return [
+            f"{name}: {self.contents[entry.sha256].error}"
+            for name, entry in sorted(self.files.items())
+            if self.contents[entry.sha256].error is not None
+        ]
+
+    def index_hash(self) -> str:
+        """Return a SHA-256 over what each condition shows, in order.
+
+        Covers file names and contents but not paths or mtimes, so copying
+        a stimulus set elsewhere keeps the hash.
+        """
+
+        shown = [
+            [
+                condition.condition_id,
+                [[Path(name).name, self.files[name].sha256] for name in condition.base_files],
+                [[Path(name).name, self.files[name].sha256] for name in condition.oddball_files],
+            ]
+            for condition in self.conditions.values()
+        ]
+        return hashlib.sha256(json.dumps(shown, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fp:
+        while chunk := fp.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _jpeg_dimensions(fp: BinaryIO) -> tuple[int, int]:
+    fp.seek(2)
+    while True:
+        byte = fp.read(1)
+        while byte and byte != b"\xff":
+            byte = fp.read(1)
+        while byte == b"\xff":
+            byte = fp.read(1)
+        if not byte:
+            raise ValueError("JPEG ended before a frame header.")
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker == 0xD9:
+            raise ValueError("JPEG ended before a frame header.")
+        length_bytes = fp.read(2)
+        if len(length_bytes) < 2:
+            raise ValueError("Truncated JPEG segment.")
+        (length,) = struct.unpack(">H", length_bytes)
+        if marker in _JPEG_SOF_MARKERS:
+            header = fp.read(5)
+            if len(header) < 5:
+                raise ValueError("Truncated JPEG frame header.")
+            height, width = struct.unpack(">xHH", header)
+            return width, height
+        fp.seek(length - 2, os.SEEK_CUR)
+
+
+def image_dimensions(path: Path) -> tuple[int, int]:
+    """Read ``(width, height)`` from a PNG, JPEG or BMP header without decoding.
+
+    Raises:
+        ValueError: if the file is not a recognizable PNG, JPEG or BMP.
+    """
+
+    with path.open("rb") as fp:
+        head = fp.read(26)
+        if head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head.startswith(b"BM") and len(head) >= 26:
+            (header_size,) = struct.unpack("<I", head[14:18])
+            if header_size == 12:  # OS/2 BITMAPCOREHEADER
+                width, height = struct.unpack("<HH", head[18:22])
+            else:
+                width, height = struct.unpack("<ii", head[18:26])
+            return width, abs(height)
+        if head.startswith(b"\xff\xd8"):
+            return _jpeg_dimensions(fp)
+    raise ValueError(f"Unrecognized image format: {path}")
+
+
+def _list_directory(
+    directory: Path,
+    previous: Optional[AssetIndex],
+    listed: dict[str, list[str]],
+    index: AssetIndex,
+    stats: AssetIndexStats,
+) -> list[str]:
+    key = str(directory)
+    if key in listed:
+        return listed[key]
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Stimulus directory not found: {directory}")
+    mtime_ns = directory.stat().st_mtime_ns
+    cached = None
+    if previous is not None and previous.directories.get(key) == mtime_ns:
+        cached = next(
+            (
+                files
+                for condition in previous.conditions.values()
+                for folder, files in (
+                    (condition.base_dir, condition.base_files),
+                    (condition.oddball_dir, condition.oddball_files),
+                )
+                if folder == key
+            ),
+            None,
+        )
+    if cached is None:
+        stats.listed_dirs += 1
+        cached = [
+            str(path)
+            for path in sorted(directory.iterdir())
+            if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file()
+        ]
+    index.directories[key] = mtime_ns
+    listed[key] = cached
+    return cached
+
+
+def update_asset_index(
+    conditions: Iterable[ConditionModel],
+    previous: Optional[AssetIndex] = None,
+) -> tuple[AssetIndex, AssetIndexStats]:
+    """Index every condition's stimuli, reusing ``previous`` where nothing changed.
+
+    A directory whose mtime is unchanged is not listed again, a file whose
+    size and mtime are unchanged is not hashed again, and a content hash
+    already in the index is not parsed again. Directories shared between
+    conditions are listed once. A header that cannot be read is recorded on
+    its :class:`AssetContent` (see :meth:`AssetIndex.header_errors`) so the
+    remaining files are still indexed.
+
+    Raises:
+        FileNotFoundError: if a stimulus directory does not exist.
+        ValueError: if a stimulus directory has no images.
+    """
+
+    index = AssetIndex()
+    stats = AssetIndexStats()
+    listed: dict[str, list[str]] = {}
+    known_contents = previous.contents if previous is not None else {}
+
+    for condition in conditions:
+        lists = []
+        for label, directory in (
+            ("base", Path(condition.base_image_dir)),
+            ("oddball", Path(condition.oddball_image_dir)),
+        ):
+            files = _list_directory(directory, previous, listed, index, stats)
+            if not files:
+                raise ValueError(
+                    f"No {label} images found for condition {condition.id} in {directory}"
+                )
+            lists.append(files)
+        index.conditions[condition.id] = IndexedCondition(
+            condition.id,
+            str(condition.base_image_dir),
+            str(condition.oddball_image_dir),
+            *lists,
+        )
+
+        for name in lists[0] + lists[1]:
+            if name in index.files:
+                continue
+            stat = os.stat(name)
+            stats.stat_files += 1
+            entry = previous.files.get(name) if previous is not None else None
+            if entry is None or entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns:
+                stats.hashed_files += 1
+                entry = AssetFile(stat.st_size, stat.st_mtime_ns, file_sha256(Path(name)))
+            index.files[name] = entry
+            if entry.sha256 not in index.contents:
+                content = known_contents.get(entry.sha256)
+                if content is None:
+                    stats.parsed_contents += 1
+                    try:
+                        width, height = image_dimensions(Path(name))
+                    except ValueError as exc:
+                        content = AssetContent(entry.size, 0, 0, str(exc))
+                    else:
+                        content = AssetContent(entry.size, width, height)
+                index.contents[entry.sha256] = content
+
+    return index, stats
+
+
+def build_asset_index(conditions: Iterable[ConditionModel]) -> AssetIndex:
+    """Index every condition's stimuli from scratch."""
+
+    return update_asset_index(conditions)[0]
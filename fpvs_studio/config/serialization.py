@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import json
+import os
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any
-
+from typing import Any, Iterable
+
+from fpvs_studio.config.asset_index import (
+    ASSET_INDEX_SUFFIX,
+    ASSET_INDEX_VERSION,
+    AssetContent,
+    AssetFile,
+    AssetIndex,
+    IndexedCondition,
+    update_asset_index,
+)
 from fpvs_studio.models.condition import ConditionModel
 from fpvs_studio.models.experiment import ExperimentModel
 
@@ -53,6 +64,9 @@ def experiment_to_dict(experiment: ExperimentModel) -> dict[str, Any]:
         "fixation_max_changes": experiment.fixation_max_changes,
         "fixation_base_color": experiment.fixation_base_color,
         "fixation_target_color": experiment.fixation_target_color,
+        "fixation_min_gap_ms": experiment.fixation_min_gap_ms,
+        "fixation_edge_margin_ms": experiment.fixation_edge_margin_ms,
+        "fixation_max_changes_per_block": experiment.fixation_max_changes_per_block,
         "instruction_text": experiment.instruction_text,
         "attention_question_text": experiment.attention_question_text,
         "monitor_refresh_hz": experiment.monitor_refresh_hz,
@@ -86,6 +100,9 @@ def experiment_from_dict(data: dict[str, Any]) -> ExperimentModel:
         fixation_max_changes=data.get("fixation_max_changes", 0),
         fixation_base_color=data.get("fixation_base_color", "#0000FF"),
         fixation_target_color=data.get("fixation_target_color", "#FF0000"),
+        fixation_min_gap_ms=data.get("fixation_min_gap_ms", 0.0),
+        fixation_edge_margin_ms=data.get("fixation_edge_margin_ms", 0.0),
+        fixation_max_changes_per_block=data.get("fixation_max_changes_per_block"),
         instruction_text=data.get("instruction_text", ""),
         attention_question_text=data.get("attention_question_text", ""),
         monitor_refresh_hz=data.get("monitor_refresh_hz"),
@@ -112,3 +129,68 @@ def load_experiment(path: Path) -> ExperimentModel:
     with path.open("r", encoding="utf-8") as fp:
         data = json.load(fp)
     return experiment_from_dict(data)
+
+
+def asset_index_path(manifest_path: Path) -> Path:
+    """Return where the asset index of ``manifest_path`` is stored (``name.assets.json``)."""
+
+    return manifest_path.with_name(f"{manifest_path.stem}{ASSET_INDEX_SUFFIX}")
+
+
+def asset_index_to_dict(index: AssetIndex) -> dict[str, Any]:
+    return {**asdict(index), "index_hash": index.index_hash()}
+
+
+def asset_index_from_dict(data: dict[str, Any]) -> AssetIndex:
+    if data.get("version") != ASSET_INDEX_VERSION:
+        raise ValueError(f"Unsupported asset index version: {data.get('version')}")
+    return AssetIndex(
+        conditions={
+            key: IndexedCondition(**value) for key, value in data.get("conditions", {}).items()
+        },
+        files={key: AssetFile(**value) for key, value in data.get("files", {}).items()},
+        contents={key: AssetContent(**value) for key, value in data.get("contents", {}).items()},
+        directories=dict(data.get("directories", {})),
+    )
+
+
+def save_asset_index(index: AssetIndex, path: Path) -> None:
+    """
+    Save an asset index to a JSON file, replacing any previous one atomically.
+    """
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        json.dump(asset_index_to_dict(index), fp, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_asset_index(path: Path) -> AssetIndex:
+    """
+    Load an asset index from a JSON file.
+    Raises FileNotFoundError, json.JSONDecodeError or ValueError as appropriate.
+    """
+
+    with path.open("r", encoding="utf-8") as fp:
+        data = json.load(fp)
+    return asset_index_from_dict(data)
+
+
+def refresh_saved_asset_index(path: Path, conditions: Iterable[ConditionModel]) -> AssetIndex:
+    """
+    Bring the asset index at ``path`` up to date with the stimulus folders.
+    Only changed directories are listed and only changed files rehashed;
+    the file is rewritten only if something changed. An unreadable or
+    outdated index file is rebuilt from scratch.
+    """
+
+    previous = None
+    if path.exists():
+        try:
+            previous = load_asset_index(path)
+        except (ValueError, TypeError, KeyError):
+            previous = None
+    index, _ = update_asset_index(conditions, previous)
+    if index != previous:
+        save_asset_index(index, path)
+    return index
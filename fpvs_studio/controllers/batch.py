@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from fpvs_studio.controllers.counterbalancing import (
+    COUNTERBALANCE_SCHEMES,
+    CounterbalanceScheme,
+    order_table_for,
+)
+from fpvs_studio.controllers.run_controller import RunConfig, RunController
+from fpvs_studio.engine.dummy_presenter import DummyPresenter
+from fpvs_studio.engine.event_log_file import read_event_log
+from fpvs_studio.models.experiment import ExperimentModel
+
+BATCH_RESULTS_FILENAME = "batch_results.csv"
+
+# (n_done, n_total), called on the calling thread after each participant
+BatchProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class BatchParticipantResult:
+    """One row of the batch table: a simulated participant and its outputs."""
+
+    participant_index: int
+    participant_id: str
+    seed: int
+    output_dir: Path
+    aborted: bool = False
+    error: Optional[str] = None
+    n_blocks: int = 0
+    block_order: str = ""
+    n_fixation_changes: int = 0
+    reported_change_count: Optional[int] = None
+    correct: Optional[bool] = None
+    absolute_error: Optional[int] = None
+    n_events: int = 0
+    output_bytes: int = 0
+    elapsed_s: float = 0.0
+
+
+def participant_seed(base_seed: int, participant_index: int) -> int:
+    """Return a 63-bit seed that depends only on the batch seed and the index."""
+
+    digest = hashlib.sha256(f"{base_seed}:{participant_index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little") >> 1
+
+
+def participant_ids(n_participants: int, prefix: str = "sim") -> list[str]:
+    """Return zero-padded ids (``sim0001``, ...) that sort in run order."""
+
+    width = max(4, len(str(n_participants)))
+    return [f"{prefix}{index + 1:0{width}d}" for index in range(n_participants)]
+
+
+def simulate_participant(
+    experiment: ExperimentModel,
+    participant_index: int,
+    participant_id: str,
+    seed: int,
+    output_dir: Path,
+    frame_accurate: bool = False,
+    counterbalance: Optional[CounterbalanceScheme] = None,
+) -> BatchParticipantResult:
+    """Run one participant through RunController + DummyPresenter.
+
+    Errors are recorded on the result rather than raised, so one failing
+    participant does not stop a batch. Must stay module-level so process
+    pools can pickle it.
+    """
+
+    row = BatchParticipantResult(participant_index, participant_id, seed, output_dir)
+    start = time.perf_counter()
+    try:
+        controller = RunController(DummyPresenter(output_dir, frame_accurate=frame_accurate))
+        config = RunConfig(
+            participant_id=participant_id,
+            output_dir=output_dir,
+            rng_seed=seed,
+            participant_index=participant_index,
+            counterbalance=counterbalance,
+        )
+        result = controller.run_experiment(experiment, config)
+        row.aborted = result.aborted
+        row.n_fixation_changes = result.n_fixation_changes
+        row.reported_change_count = result.reported_change_count
+        row.correct = result.correct
+        row.absolute_error = result.absolute_error
+        if result.binary_event_log_path is not None:
+            with read_event_log(result.binary_event_log_path) as log:
+                row.n_events = len(log)
+                blocks = [
+                    segment["condition_id"]
+                    for segment in log.metadata["segments"]
+                    if segment["segment_type"] == "BLOCK"
+                ]
+            row.n_blocks = len(blocks)
+            row.block_order = "|".join(blocks)
+        row.output_bytes = sum(path.stat().st_size for path in output_dir.iterdir() if path.is_file())
+    except Exception as exc:  # pylint: disable=broad-except
+        row.error = f"{type(exc).__name__}: {exc}"
+    row.elapsed_s = time.perf_counter() - start
+    return row
+
+
+def run_batch(
+    experiment: ExperimentModel,
+    output_dir: Path,
+    n_participants: int,
+    base_seed: int = 0,
+    max_workers: Optional[int] = None,
+    frame_accurate: bool = False,
+    progress: Optional[BatchProgressCallback] = None,
+    id_prefix: str = "sim",
+    counterbalance: Optional[CounterbalanceScheme] = None,
+) -> list[BatchParticipantResult]:
+    """Simulate ``n_participants`` runs on a process pool, in participant order.
+
+    Each participant writes to ``output_dir / participant_id`` with the seed
+    from :func:`participant_seed`, so any participant can be re-run alone
+    with the same outputs. ``max_workers`` defaults to the number of CPUs;
+    ``max_workers=1`` runs serially in the calling process. Timing is
+    validated once up front and raises :class:`TimingValidationError`.
+    With ``counterbalance`` each participant's block order comes from that
+    scheme's order table, built once here before the pool starts.
+    """
+
+    if n_participants < 0:
+        raise ValueError("Number of participants cannot be negative.")
+    experiment.derive_timing()
+    if counterbalance is not None:
+        order_table_for(experiment, counterbalance)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [
+        (
+            experiment,
+            index,
+            participant_id,
+            participant_seed(base_seed, index),
+            output_dir / participant_id,
+        )
+        for index, participant_id in enumerate(participant_ids(n_participants, id_prefix))
+    ]
+    if max_workers == 1 or n_participants <= 1:
+        results: list[Optional[BatchParticipantResult]] = []
+        for job in jobs:
+            results.append(
+                simulate_participant(*job, frame_accurate=frame_accurate, counterbalance=counterbalance)
+            )
+            if progress:
+                progress(len(results), n_participants)
+        return results  # type: ignore[return-value]
+
+    results = [None] * n_participants
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                simulate_participant,
+                *job,
+                frame_accurate=frame_accurate,
+                counterbalance=counterbalance,
+            ): job[1]
+            for job in jobs
+        }
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(n_done, n_participants)
+    return results  # type: ignore[return-value]
+
+
+def write_batch_table(path: Path, results: Sequence[BatchParticipantResult]) -> None:
+    """Write one CSV row per participant, with ``BatchParticipantResult`` columns."""
+
+    names = [field.name for field in fields(BatchParticipantResult)]
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(names)
+        for result in results:
+            values = asdict(result)
+            writer.writerow(["" if values[name] is None else values[name] for name in names])
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 4:
+        print(
+            "Usage: python -m fpvs_studio.controllers.batch <experiment.json> <output_dir> "
+            "<n_participants> [base_seed] [workers] [--frame-accurate] "
+            f"[--counterbalance={'|'.join(COUNTERBALANCE_SCHEMES)}]"
+        )
+        return 1
+
+    from fpvs_studio.config.serialization import load_experiment
+    from fpvs_studio.models.exceptions import TimingValidationError
+
+    frame_accurate = "--frame-accurate" in argv
+    counterbalance: Optional[CounterbalanceScheme] = None
+    for arg in argv:
+        if arg.startswith("--counterbalance="):
+            scheme = arg.split("=", 1)[1]
+            if scheme not in COUNTERBALANCE_SCHEMES:
+                print(f"Unknown counterbalancing scheme: {scheme}")
+                return 1
+            counterbalance = scheme  # type: ignore[assignment]
+    args = [arg for arg in argv if not arg.startswith("--")]
+    experiment = load_experiment(Path(args[1]))
+    output_dir = Path(args[2])
+    n_participants = int(args[3])
+    base_seed = int(args[4]) if len(args) > 4 else 0
+    max_workers = int(args[5]) if len(args) > 5 else None
+
+    def report_progress(n_done: int, n_total: int) -> None:
+        print(f"\rSimulated participants: {n_done}/{n_total}", end="" if n_done < n_total else "\n")
+
+    start = time.perf_counter()
+    try:
+        results = run_batch(
+            experiment,
+            output_dir,
+            n_participants,
+            base_seed=base_seed,
+            max_workers=max_workers,
+            frame_accurate=frame_accurate,
+            progress=report_progress,
+            counterbalance=counterbalance,
+        )
+    except TimingValidationError as exc:
+        print(f"Timing error: {exc}")
+        return 2
+    table_path = output_dir / BATCH_RESULTS_FILENAME
+    write_batch_table(table_path, results)
+
+    failed = [result for result in results if result.error is not None]
+    print(f"{len(results)} participants in {time.perf_counter() - start:.1f} s; {len(failed)} failed")
+    print(f"Output: {sum(result.output_bytes for result in results) / 1e6:.1f} MB")
+    first_blocks = Counter(result.block_order.split("|")[0] for result in results if result.block_order)
+    for condition_id, count in sorted(first_blocks.items()):
+        print(f"First block {condition_id}: {count}")
+    for n_changes, count in sorted(Counter(r.n_fixation_changes for r in results).items()):
+        print(f"Fixation changes {n_changes}: {count}")
+    print(f"Table: {table_path}")
+    return 3 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal, Sequence
+
+from fpvs_studio.models.experiment import ExperimentModel
+
+CounterbalanceScheme = Literal["latin_square", "williams"]
+
+COUNTERBALANCE_SCHEMES: tuple[CounterbalanceScheme, ...] = ("latin_square", "williams")
+
+
+def latin_square(n_conditions: int) -> list[list[int]]:
+    """Return the cyclic Latin square: row ``r`` is ``r, r+1, ..., r-1`` (mod n)."""
+
+    return [
+        [(row + column) % n_conditions for column in range(n_conditions)]
+        for row in range(n_conditions)
+    ]
+
+
+def williams_square(n_conditions: int) -> list[list[int]]:
+    """Return a Williams design balanced for first-order carryover.
+
+    Every condition follows every other condition equally often across the
+    rows. Even ``n`` needs ``n`` rows; odd ``n`` needs ``2n``, the second
+    half being the first half reversed.
+    """
+
+    first = [0]
+    low, high = 1, n_conditions - 1
+    while len(first) < n_conditions:
+        first.append(low)
+        low += 1
+        if len(first) < n_conditions:
+            first.append(high)
+            high -= 1
+    rows = [[(value + row) % n_conditions for value in first] for row in range(n_conditions)]
+    if n_conditions % 2 and n_conditions > 1:
+        rows += [row[::-1] for row in rows]
+    return rows
+
+
+def carryover_counts(orders: Sequence[Sequence[int]], n_conditions: int) -> list[list[int]]:
+    """Count how often condition ``j`` directly follows condition ``i`` in ``orders``."""
+
+    counts = [[0] * n_conditions for _ in range(n_conditions)]
+    for order in orders:
+        for previous, current in zip(order, order[1:]):
+            counts[previous][current] += 1
+    return counts
+
+
+@dataclass(frozen=True)
+class OrderTable:
+    """Precomputed cycle orders for every participant slot of a design.
+
+    ``sequences[s][c]`` is the condition order of cycle ``c`` for slot
+    ``s``; participant ``p`` uses slot ``p % len(sequences)``, so a
+    complete design is covered by every ``len(sequences)`` participants.
+    """
+
+    scheme: CounterbalanceScheme
+    condition_ids: tuple[str, ...]
+    sequences: tuple[tuple[tuple[str, ...], ...], ...]
+
+    def cycle_orders(self, participant_index: int) -> tuple[tuple[str, ...], ...]:
+        """Return the per-cycle condition orders for one participant."""
+
+        if participant_index < 0:
+            raise ValueError("Participant index cannot be negative.")
+        return self.sequences[participant_index % len(self.sequences)]
+
+
+@lru_cache(maxsize=64)
+def build_order_table(
+    condition_ids: tuple[str, ...],
+    num_cycles: int,
+    scheme: CounterbalanceScheme,
+) -> OrderTable:
+    """Build (and cache) the order table for a condition set and cycle count.
+
+    Slot ``s`` starts on row ``s`` of the square and moves a fixed number of
+    rows on for each later cycle. The shift is the same for every slot, so
+    each cycle on its own uses every row once and keeps the square's
+    position and carryover balance. It is the smallest shift for which no
+    row's first condition repeats the previous cycle's last one; when only
+    a zero shift qualifies, every cycle repeats the slot's row.
+    """
+
+    if not condition_ids:
+        raise ValueError("Counterbalancing needs at least one condition.")
+    if num_cycles < 1:
+        raise ValueError("Counterbalancing needs at least one cycle.")
+    if scheme == "latin_square":
+        rows = latin_square(len(condition_ids))
+    elif scheme == "williams":
+        rows = williams_square(len(condition_ids))
+    else:
+        raise ValueError(f"Unknown counterbalancing scheme: {scheme!r}")
+
+    n_rows = len(rows)
+    shift = next(
+        (
+            candidate % n_rows
+            for candidate in range(1, n_rows + 1)
+            if all(
+                rows[(row + candidate) % n_rows][0] != rows[row][-1] for row in range(n_rows)
+            )
+        ),
+        1 % n_rows,
+    )
+    sequences = [
+        tuple(
+            tuple(condition_ids[index] for index in rows[(slot + cycle * shift) % n_rows])
+            for cycle in range(num_cycles)
+        )
+        for slot in range(n_rows)
+    ]
+    return OrderTable(scheme=scheme, condition_ids=condition_ids, sequences=tuple(sequences))
+
+
+def order_table_for(experiment: ExperimentModel, scheme: CounterbalanceScheme) -> OrderTable:
+    """Return the cached order table for an experiment's conditions and cycles."""
+
+    return build_order_table(
+        tuple(condition.id for condition in experiment.conditions), experiment.num_cycles, scheme
+    )
+
+
+def participant_cycle_orders(
+    experiment: ExperimentModel,
+    scheme: CounterbalanceScheme,
+    participant_index: int,
+) -> tuple[tuple[str, ...], ...]:
+    """Return the counterbalanced per-cycle condition orders for one participant."""
+
+    return order_table_for(experiment, scheme).cycle_orders(participant_index)
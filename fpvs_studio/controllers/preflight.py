@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from fpvs_studio.config.asset_index import AssetIndex, update_asset_index
+from fpvs_studio.config.serialization import refresh_saved_asset_index
+from fpvs_studio.controllers.validation import ValidationReport, validate_experiment
+from fpvs_studio.models.experiment import ExperimentModel
+
+PREFLIGHT_CACHE_SUFFIX = ".preflight.json"
+PREFLIGHT_CACHE_VERSION = 1
+
+# (n_done, n_total), called on the calling thread after each decoded image
+PreflightProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class ImageCheck:
+    """Result of fully decoding one stimulus; ``error`` is set if it failed."""
+
+    width: int = 0
+    height: int = 0
+    mode: str = ""
+    decode_s: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class PreflightReport:
+    """Outcome of :func:`preflight_experiment`.
+
+    ``texture_bytes`` is the RGBA texture memory for every stimulus path and
+    ``max_condition_texture_bytes`` the largest single condition, which is
+    what texture streaming keeps resident. ``projected_load_s`` is the
+    measured decode time of every path spread over the worker count, i.e.
+    a cold start without the decoded pixel cache.
+    """
+
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    validation: Optional[ValidationReport] = None
+    n_files: int = 0
+    n_contents: int = 0
+    n_decoded: int = 0
+    n_cached: int = 0
+    texture_bytes: int = 0
+    max_condition_texture_bytes: int = 0
+    projected_load_s: float = 0.0
+    asset_index_hash: str = ""
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def preflight_cache_path(manifest_path: Path) -> Path:
+    """Return ``<manifest stem>.preflight.json`` next to the experiment manifest."""
+
+    return manifest_path.with_name(f"{manifest_path.stem}{PREFLIGHT_CACHE_SUFFIX}")
+
+
+def check_image(path: Path) -> ImageCheck:
+    """Decode one image with pyglet as the presenter would, recording size and mode.
+
+    Like the presenter's decoder it needs no display or GL context. Must
+    stay module-level so process pools can pickle it; errors are recorded
+    on the result rather than raised.
+    """
+
+    start = time.perf_counter()
+    try:
+        from fpvs_studio.engine.stimulus_loading import import_pyglet_headless, rgba_pixels
+
+        pyglet = import_pyglet_headless()
+        image = pyglet.image.load(str(path)).get_image_data()
+        rgba_pixels(image)
+        return ImageCheck(image.width, image.height, image.format, time.perf_counter() - start)
+    except Exception as exc:  # pylint: disable=broad-except
+        error = f"{type(exc).__name__}: {exc}"
+        return ImageCheck(decode_s=time.perf_counter() - start, error=error)
+
+
+def _load_cache(path: Optional[Path], decoder_name: str) -> dict[str, ImageCheck]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != PREFLIGHT_CACHE_VERSION or data.get("decoder") != decoder_name:
+            return {}
+        return {digest: ImageCheck(**value) for digest, value in data["results"].items()}
+    except (ValueError, TypeError, KeyError):
+        return {}
+
+
+def _save_cache(path: Path, decoder_name: str, results: dict[str, ImageCheck]) -> None:
+    data = {
+        "version": PREFLIGHT_CACHE_VERSION,
+        "decoder": decoder_name,
+        "results": {digest: asdict(check) for digest, check in sorted(results.items())},
+    }
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=1)
+    os.replace(tmp_path, path)
+
+
+def check_images(
+    paths: dict[str, Path],
+    max_workers: Optional[int] = None,
+    progress: Optional[PreflightProgressCallback] = None,
+    checker: Callable[[Path], ImageCheck] = check_image,
+) -> dict[str, ImageCheck]:
+    """Run ``checker`` on a process pool over ``{content hash: path}``.
+
+    ``max_workers`` defaults to the number of CPUs; ``max_workers=1`` runs
+    serially in the calling process.
+    """
+
+    total = len(paths)
+    results: dict[str, ImageCheck] = {}
+    if max_workers == 1 or total <= 1:
+        for digest, path in paths.items():
+            results[digest] = checker(path)
+            if progress:
+                progress(len(results), total)
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(checker, path): digest for digest, path in paths.items()}
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(n_done, total)
+    return results
+
+
+def _check_assets(
+    report: PreflightReport,
+    index: AssetIndex,
+    checks: dict[str, ImageCheck],
+    workers: int,
+) -> None:
+    report.n_files = len(index.files)
+    report.n_contents = len(index.contents)
+    report.asset_index_hash = index.index_hash()
+
+    first_paths: dict[str, str] = {}
+    for name, entry in sorted(index.files.items()):
+        first_paths.setdefault(entry.sha256, name)
+        header_error = index.contents[entry.sha256].error
+        if header_error is not None:
+            report.errors.append(f"{name} has an unreadable header: {header_error}")
+    for digest, check in checks.items():
+        content = index.contents[digest]
+        name = first_paths[digest]
+        if check.error is not None:
+            report.errors.append(f"{name} does not decode: {check.error}")
+        elif (check.width, check.height) != (content.width, content.height):
+            report.errors.append(
+                f"{name} decodes to {check.width}x{check.height} but its header "
+                f"says {content.width}x{content.height}."
+            )
+
+    sizes: Counter[tuple[int, int]] = Counter()
+    decode_s = 0.0
+    for condition in index.conditions.values():
+        names = condition.base_files + condition.oddball_files
+        digests = [
+            index.files[name].sha256
+            for name in names
+            if index.contents[index.files[name].sha256].error is None
+        ]
+        condition_sizes = Counter(
+            (index.contents[digest].width, index.contents[digest].height) for digest in digests
+        )
+        sizes.update(condition_sizes)
+        if len(condition_sizes) > 1:
+            listed = ", ".join(f"{w}x{h} ({n})" for (w, h), n in condition_sizes.most_common())
+            report.errors.append(f"Condition {condition.condition_id} mixes image sizes: {listed}.")
+        modes = Counter(checks[digest].mode for digest in digests if checks[digest].mode)
+        if len(modes) > 1:
+            listed = ", ".join(f"{mode} ({n})" for mode, n in modes.most_common())
+            report.warnings.append(
+                f"Condition {condition.condition_id} mixes color modes: {listed}."
+            )
+        condition_bytes = sum(width * height * 4 for (width, height) in condition_sizes.elements())
+        report.texture_bytes += condition_bytes
+        report.max_condition_texture_bytes = max(
+            report.max_condition_texture_bytes, condition_bytes
+        )
+        decode_s += sum(checks[digest].decode_s for digest in digests)
+
+    if len(sizes) > 1:
+        report.warnings.append(
+            f"Conditions use {len(sizes)} different image sizes; each is scaled separately."
+        )
+    report.projected_load_s = decode_s / max(1, min(workers, report.n_files))
+
+
+def preflight_experiment(
+    experiment: ExperimentModel,
+    asset_index_path: Optional[Path] = None,
+    cache_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    decode: bool = True,
+    progress: Optional[PreflightProgressCallback] = None,
+    checker: Callable[[Path], ImageCheck] = check_image,
+) -> PreflightReport:
+    """Check an experiment and its stimuli without opening a window.
+
+    Timing, the run plan and fixation feasibility come from
+    :func:`validate_experiment`. Stimulus folders are indexed (and the
+    index at ``asset_index_path`` refreshed, if given), then every distinct
+    image content is decoded with ``checker`` on a process pool to catch
+    corrupt files, header/decode disagreements and mixed sizes or color
+    modes. Decode results are kept in ``cache_path`` by content hash, and
+    the asset index only rehashes files whose size or mtime changed, so an
+    unchanged stimulus set is re-validated with one ``stat`` per file.
+    ``decode=False`` stops at header dimensions.
+
+    Problems are reported on the result rather than raised.
+    """
+
+    start = time.perf_counter()
+    report = PreflightReport(validation=validate_experiment(experiment))
+    report.errors.extend(report.validation.errors)
+    report.warnings.extend(report.validation.warnings)
+
+    try:
+        if asset_index_path is not None:
+            index = refresh_saved_asset_index(asset_index_path, experiment.conditions)
+        else:
+            index, _ = update_asset_index(experiment.conditions)
+    except (OSError, ValueError) as exc:
+        report.errors.append(str(exc))
+        report.elapsed_s = time.perf_counter() - start
+        return report
+
+    decoder_name = f"{checker.__module__}.{checker.__qualname__}"
+    checks = _load_cache(cache_path, decoder_name) if decode else {}
+    readable = {digest for digest, content in index.contents.items() if content.error is None}
+    checks = {digest: checks[digest] for digest in readable if digest in checks}
+    report.n_cached = len(checks)
+    if decode:
+        pending: dict[str, Path] = {}
+        for name, entry in sorted(index.files.items()):
+            if entry.sha256 in readable and entry.sha256 not in checks:
+                pending.setdefault(entry.sha256, Path(name))
+        checks.update(check_images(pending, max_workers, progress, checker))
+        report.n_decoded = len(pending)
+        if cache_path is not None and pending:
+            _save_cache(cache_path, decoder_name, checks)
+    else:
+        checks = {
+            digest: ImageCheck(content.width, content.height)
+            for digest, content in index.contents.items()
+            if digest in readable
+        }
+
+    _check_assets(report, index, checks, max_workers or os.cpu_count() or 1)
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 2:
+        print(
+            "Usage: python -m fpvs_studio.controllers.preflight <experiment.json> [workers] "
+            "[--headers-only]"
+        )
+        return 1
+
+    from fpvs_studio.config.serialization import asset_index_path, load_experiment
+
+    args = [arg for arg in argv if not arg.startswith("--")]
+    experiment_path = Path(args[1])
+    max_workers = int(args[2]) if len(args) > 2 else None
+    experiment = load_experiment(experiment_path)
+
+    def report_progress(n_done: int, n_total: int) -> None:
+        print(f"\rDecoded images: {n_done}/{n_total}", end="" if n_done < n_total else "\n")
+
+    report = preflight_experiment(
+        experiment,
+        asset_index_path=asset_index_path(experiment_path),
+        cache_path=preflight_cache_path(experiment_path),
+        max_workers=max_workers,
+        decode="--headers-only" not in argv,
+        progress=report_progress,
+    )
+
+    validation = report.validation
+    if validation is not None and validation.timing is not None:
+        print(
+            f"Run: {validation.n_blocks} blocks, {validation.total_duration_seconds} s, "
+            f"{validation.timing.frames_per_second} Hz"
+        )
+    print(
+        f"Stimuli: {report.n_files} files, {report.n_contents} distinct; "
+        f"{report.n_decoded} decoded, {report.n_cached} cached"
+    )
+    print(
+        f"Texture memory: {report.texture_bytes / 1024**2:.1f} MB total, "
+        f"{report.max_condition_texture_bytes / 1024**2:.1f} MB largest condition"
+    )
+    print(f"Projected load time: {report.projected_load_s:.1f} s")
+    if report.asset_index_hash:
+        print(f"Asset index hash: {report.asset_index_hash}")
+    for warning in report.warnings:
+        print(f"Warning: {warning}")
+    for error in report.errors:
+        print(f"Error: {error}")
+    print(f"Pre-flight {'passed' if report.ok else 'FAILED'} in {report.elapsed_s:.1f} s")
+    return 0 if report.ok else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -2,12 +2,22 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 import random
 
-from fpvs_studio.controllers.scheduling import build_run_plan, draw_attention_changes, RunPlan
+from fpvs_studio.controllers.counterbalancing import CounterbalanceScheme, participant_cycle_orders
+from fpvs_studio.controllers.scheduling import (
+    build_run_plan,
+    draw_attention_changes,
+    draw_fixation_schedule,
+    fixation_constraints_enabled,
+    RunPlan,
+)
 from fpvs_studio.engine.presenter_base import Presenter, RunResult
+from fpvs_studio.markers.async_marker import AsyncMarkerBackend
+from fpvs_studio.markers.base import MarkerBackend
 from fpvs_studio.markers.null_marker import NullMarkerBackend
+from fpvs_studio.markers.pulse_marker import PulseMarkerBackend
 from fpvs_studio.models.exceptions import TimingValidationError
 from fpvs_studio.models.experiment import ExperimentModel
 from fpvs_studio.models.timing import TimingDerived
@@ -18,6 +28,10 @@ class RunConfig:
     participant_id: str
     output_dir: Path
     rng_seed: Optional[int] = None
+    async_markers: bool = False
+    marker_pulse_width_ms: Optional[float] = None
+    participant_index: Optional[int] = None
+    counterbalance: Optional[CounterbalanceScheme] = None
 
 
 class RunController:
@@ -25,8 +39,22 @@ class RunController:
     Orchestrates a single FPVS run:
     - Validates timing
     - Builds a RunPlan
-    - Draws n_fixation_changes
+    - Draws n_fixation_changes and, if the experiment constrains them, their
+      frames (see draw_fixation_schedule); otherwise presenters space them evenly
     - Calls a Presenter with a NullMarkerBackend
+
+    With ``RunConfig.async_markers`` the backend is wrapped in an
+    :class:`AsyncMarkerBackend`; its request-to-send latency is attached to
+    the result and written next to the event log. With
+    ``RunConfig.marker_pulse_width_ms`` every trigger becomes a pulse that
+    returns to 0 on the first frame after that width (see
+    :class:`PulseMarkerBackend`); the pulse timings are written next to the
+    event log as well. With ``RunConfig.counterbalance`` the cycle orders
+    come from the cached order table for that scheme, looked up by
+    ``RunConfig.participant_index``.
+
+    Presenters that checkpoint their runs (RealPresenter, HeadlessPresenter)
+    can continue an interrupted one through :meth:`resume_experiment`.
     """
 
     def __init__(self, presenter: Presenter) -> None:
@@ -48,17 +76,81 @@ class RunController:
                 monitor_refresh_hz=None,
             )
 
-        _timing: TimingDerived = experiment.derive_timing(experiment.monitor_refresh_hz)
+        timing: TimingDerived = experiment.derive_timing(experiment.monitor_refresh_hz)
 
-        run_plan: RunPlan = build_run_plan(experiment, rng)
+        cycle_orders = None
+        if config.counterbalance is not None:
+            if config.participant_index is None:
+                raise ValueError("Counterbalancing requires a participant index.")
+            cycle_orders = participant_cycle_orders(
+                experiment, config.counterbalance, config.participant_index
+            )
+        run_plan: RunPlan = build_run_plan(experiment, rng, cycle_orders)
         n_changes = draw_attention_changes(experiment, rng)
+        if n_changes > 0 and fixation_constraints_enabled(experiment):
+            run_plan.fixation_change_frames = draw_fixation_schedule(
+                experiment, run_plan, n_changes, rng, timing.frames_per_second
+            )
+
+        run_plan.rng_state = rng.getstate()
 
-        result = self._presenter.run_experiment(
-            experiment=experiment,
-            participant_id=config.participant_id,
-            run_plan=run_plan,
-            n_fixation_changes=n_changes,
-            marker=NullMarkerBackend(),
+        return self._present(
+            config,
+            lambda marker: self._presenter.run_experiment(
+                experiment=experiment,
+                participant_id=config.participant_id,
+                run_plan=run_plan,
+                n_fixation_changes=n_changes,
+                marker=marker,
+            ),
         )
 
+    def resume_experiment(
+        self,
+        experiment: ExperimentModel,
+        checkpoint_file: Path,
+        config: RunConfig,
+    ) -> RunResult:
+        """Continue an interrupted run from its checkpoint file.
+
+        The run plan, fixation schedule and participant come from the
+        checkpoint; ``config`` only selects the marker options. The
+        presenter appends to the original logs.
+        """
+
+        resume = getattr(self._presenter, "resume_experiment", None)
+        if resume is None:
+            raise ValueError(f"{type(self._presenter).__name__} cannot resume runs.")
+        return self._present(config, lambda marker: resume(experiment, checkpoint_file, marker))
+
+    def _present(
+        self,
+        config: RunConfig,
+        present: Callable[[MarkerBackend], RunResult],
+    ) -> RunResult:
+        marker: MarkerBackend = NullMarkerBackend()
+        pulse_marker: Optional[PulseMarkerBackend] = None
+        if config.marker_pulse_width_ms is not None:
+            pulse_marker = PulseMarkerBackend(marker, round(config.marker_pulse_width_ms * 1_000_000))
+            marker = pulse_marker
+        if config.async_markers:
+            marker = AsyncMarkerBackend(marker)
+        try:
+            result = present(marker)
+        finally:
+            marker.close()
+
+        if isinstance(marker, AsyncMarkerBackend):
+            result.marker_latency = marker.latency_stats()
+            if result.event_log_path is not None:
+                result.marker_latency_path = result.event_log_path.with_name(
+                    result.event_log_path.name.replace("_events.csv", "_marker_latency.csv")
+                )
+                marker.write_csv(result.marker_latency_path)
+        if pulse_marker is not None and result.event_log_path is not None:
+            result.marker_pulses_path = result.event_log_path.with_name(
+                result.event_log_path.name.replace("_events.csv", "_marker_pulses.csv")
+            )
+            pulse_marker.write_csv(result.marker_pulses_path)
+
         return result
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import math
 import random
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Iterable, List, Literal, Optional
+from itertools import accumulate
+from typing import Any, Iterable, List, Literal, Optional, Sequence
 
 from fpvs_studio.models.experiment import ExperimentModel
 
@@ -31,9 +34,17 @@ class RunPlan:
     ExperimentModel while accounting for rest periods, attention checks,
     and total cycles. Phase 0 keeps the structure available without
     implementing any scheduling logic.
+
+    ``fixation_change_frames`` holds run-wide block frame indices drawn by
+    :func:`draw_fixation_schedule`; presenters fall back to evenly spaced
+    changes when it is ``None``. ``rng_state`` is the controller's
+    ``random.Random`` state once the plan was drawn, kept in checkpoints so
+    a resumed run continues the same random stream.
     """
 
     segments: List[RunSegment]
+    fixation_change_frames: Optional[List[int]] = None
+    rng_state: Optional[tuple[Any, ...]] = None
 
     def __iter__(self) -> Iterable[RunSegment]:
         return iter(self.segments)
@@ -42,8 +53,14 @@ class RunPlan:
 def build_run_plan(
     experiment: ExperimentModel,
     rng: random.Random,
+    cycle_orders: Optional[Sequence[Sequence[str]]] = None,
 ) -> RunPlan:
-    """Build a deterministic run plan for the given experiment."""
+    """Build a deterministic run plan for the given experiment.
+
+    ``cycle_orders`` gives each cycle's condition order explicitly (see
+    :mod:`fpvs_studio.controllers.counterbalancing`) and takes precedence
+    over ``randomize_within_cycle``.
+    """
 
     if not experiment.conditions:
         raise ValueError("Experiment must have at least one condition to build a run plan.")
@@ -55,14 +72,22 @@ def build_run_plan(
         raise ValueError("Rest duration cannot be negative.")
 
     condition_ids = [condition.id for condition in experiment.conditions]
+    if cycle_orders is not None:
+        if len(cycle_orders) != experiment.num_cycles:
+            raise ValueError("Cycle orders must list one order per cycle.")
+        if any(sorted(order) != sorted(condition_ids) for order in cycle_orders):
+            raise ValueError("Each cycle order must contain every condition exactly once.")
     total_blocks = experiment.num_cycles * len(condition_ids)
     segments: List[RunSegment] = []
     block_index = 0
 
     for cycle_index in range(experiment.num_cycles):
-        cycle_conditions = list(condition_ids)
-        if experiment.randomize_within_cycle:
-            rng.shuffle(cycle_conditions)
+        if cycle_orders is not None:
+            cycle_conditions = list(cycle_orders[cycle_index])
+        else:
+            cycle_conditions = list(condition_ids)
+            if experiment.randomize_within_cycle:
+                rng.shuffle(cycle_conditions)
 
         for condition_id in cycle_conditions:
             segments.append(
@@ -113,3 +138,199 @@ def draw_attention_changes(
         raise ValueError("Minimum fixation changes cannot exceed the maximum value.")
 
     return rng.randint(experiment.fixation_min_changes, experiment.fixation_max_changes)
+
+
+def _ms_to_frames(ms: float, frames_per_second: float) -> int:
+    return max(0, math.ceil(ms * frames_per_second / 1000.0 - 1e-9))
+
+
+def fixation_constraints_enabled(experiment: ExperimentModel) -> bool:
+    """Return whether the experiment sets any fixation gap, edge margin or quota.
+
+    Without one, runs keep the evenly spaced changes experiments had
+    before these constraints existed.
+    """
+
+    return (
+        experiment.fixation_min_gap_ms > 0
+        or experiment.fixation_edge_margin_ms > 0
+        or experiment.fixation_max_changes_per_block is not None
+    )
+
+
+def fixation_constraint_frames(
+    experiment: ExperimentModel,
+    frames_per_second: float,
+) -> tuple[int, int]:
+    """Return the experiment's (min gap, edge margin) in frames, rounded up."""
+
+    return (
+        max(1, _ms_to_frames(experiment.fixation_min_gap_ms, frames_per_second)),
+        _ms_to_frames(experiment.fixation_edge_margin_ms, frames_per_second),
+    )
+
+
+def rest_after_blocks(run_plan: RunPlan) -> List[bool]:
+    """Return, for each block of ``run_plan``, whether a rest separates it from the next block."""
+
+    rest_after: List[bool] = []
+    for segment in run_plan.segments:
+        if segment.segment_type == "BLOCK":
+            rest_after.append(False)
+        elif rest_after and segment.duration_seconds:
+            rest_after[-1] = True
+    return rest_after
+
+
+def _block_margins(
+    n_blocks: int,
+    min_gap_frames: int,
+    edge_margin_frames: int,
+    rest_after: Optional[Sequence[bool]],
+) -> List[tuple[int, int]]:
+    # Blocks without a rest between them share an edge; the gap is kept across
+    # it by splitting min_gap_frames - 1 unusable frames between the two sides.
+    trailing_gap = (min_gap_frames - 1) // 2
+    leading_gap = min_gap_frames - 1 - trailing_gap
+    margins = []
+    for index in range(n_blocks):
+        after_shared = index > 0 and not (rest_after is not None and rest_after[index - 1])
+        before_shared = index < n_blocks - 1 and not (rest_after is not None and rest_after[index])
+        margins.append(
+            (
+                max(edge_margin_frames, leading_gap if after_shared else 0),
+                max(edge_margin_frames, trailing_gap if before_shared else 0),
+            )
+        )
+    return margins
+
+
+def _block_windows(
+    block_frame_counts: Sequence[int],
+    min_gap_frames: int,
+    edge_margin_frames: int,
+    rest_after: Optional[Sequence[bool]],
+) -> List[tuple[int, int]]:
+    if rest_after is not None and len(rest_after) != len(block_frame_counts):
+        raise ValueError("rest_after must have one entry per block.")
+    margins = _block_margins(
+        len(block_frame_counts), min_gap_frames, edge_margin_frames, rest_after
+    )
+    return [
+        (leading, max(0, n_frames - leading - trailing))
+        for n_frames, (leading, trailing) in zip(block_frame_counts, margins)
+    ]
+
+
+def _window_capacity(window: int, min_gap_frames: int, max_per_block: Optional[int]) -> int:
+    capacity = (window - 1) // min_gap_frames + 1 if window > 0 else 0
+    return capacity if max_per_block is None else min(capacity, max_per_block)
+
+
+def fixation_change_capacity(
+    block_frame_counts: Sequence[int],
+    min_gap_frames: int,
+    edge_margin_frames: int,
+    max_per_block: Optional[int] = None,
+    rest_after: Optional[Sequence[bool]] = None,
+) -> int:
+    """Return the most fixation changes the constraints allow across the blocks."""
+
+    if min_gap_frames < 1:
+        raise ValueError("Minimum gap between fixation changes must be at least one frame.")
+    return sum(
+        _window_capacity(window, min_gap_frames, max_per_block)
+        for _, window in _block_windows(
+            block_frame_counts, min_gap_frames, edge_margin_frames, rest_after
+        )
+    )
+
+
+def sample_fixation_changes(
+    block_frame_counts: Sequence[int],
+    n_changes: int,
+    min_gap_frames: int,
+    edge_margin_frames: int,
+    rng: random.Random,
+    max_per_block: Optional[int] = None,
+    rest_after: Optional[Sequence[bool]] = None,
+) -> List[int]:
+    """Draw ``n_changes`` run-wide block frame indices under spacing constraints.
+
+    Changes are at least ``min_gap_frames`` apart, at least
+    ``edge_margin_frames`` from either block edge, and at most
+    ``max_per_block`` per block. Blocks run back to back unless
+    ``rest_after[i]`` says a rest follows block ``i`` (see
+    :func:`rest_after_blocks`), so the gap also holds across block edges
+    without a rest. Changes are first allocated to blocks by sampling
+    distinct capacity slots, then placed within each block by sampling from
+    the window with the mandatory gaps removed and adding them back, so no
+    draw is ever rejected.
+    """
+
+    if n_changes < 0:
+        raise ValueError("Number of fixation changes cannot be negative.")
+    if edge_margin_frames < 0:
+        raise ValueError("Fixation edge margin cannot be negative.")
+    if max_per_block is not None and max_per_block < 0:
+        raise ValueError("Maximum fixation changes per block cannot be negative.")
+    if min_gap_frames < 1:
+        raise ValueError("Minimum gap between fixation changes must be at least one frame.")
+
+    windows = _block_windows(block_frame_counts, min_gap_frames, edge_margin_frames, rest_after)
+    capacities = [_window_capacity(window, min_gap_frames, max_per_block) for _, window in windows]
+    cumulative = list(accumulate(capacities))
+    total_capacity = cumulative[-1] if cumulative else 0
+    if n_changes > total_capacity:
+        raise ValueError(
+            f"{n_changes} fixation changes do not fit: the gap, edge margin and per-block "
+            f"limits allow at most {total_capacity}."
+        )
+
+    counts = [0] * len(windows)
+    for slot in rng.sample(range(total_capacity), n_changes):
+        counts[bisect_right(cumulative, slot)] += 1
+
+    frames: List[int] = []
+    offset = 0
+    for n_frames, (leading, window), count in zip(block_frame_counts, windows, counts):
+        if count:
+            slack = (count - 1) * (min_gap_frames - 1)
+            start = offset + leading
+            positions = sorted(rng.sample(range(window - slack), count))
+            frames.extend(
+                start + position + index * (min_gap_frames - 1)
+                for index, position in enumerate(positions)
+            )
+        offset += n_frames
+    return frames
+
+
+def draw_fixation_schedule(
+    experiment: ExperimentModel,
+    run_plan: RunPlan,
+    n_changes: int,
+    rng: random.Random,
+    frames_per_second: float,
+) -> List[int]:
+    """Draw fixation change frames for a run plan from the experiment's constraints.
+
+    Block lengths follow the presenters' frame counts, and millisecond
+    gaps and margins round up to whole frames.
+    """
+
+    block_frame_counts = [
+        int((segment.duration_seconds or experiment.block_duration_seconds) * frames_per_second)
+        for segment in run_plan.segments
+        if segment.segment_type == "BLOCK"
+    ]
+    min_gap_frames, edge_margin_frames = fixation_constraint_frames(experiment, frames_per_second)
+    return sample_fixation_changes(
+        block_frame_counts,
+        n_changes,
+        min_gap_frames,
+        edge_margin_frames,
+        rng,
+        experiment.fixation_max_changes_per_block,
+        rest_after_blocks(run_plan),
+    )
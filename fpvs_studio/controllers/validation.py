@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from fpvs_studio.controllers.scheduling import (
+    build_run_plan,
+    fixation_change_capacity,
+    fixation_constraint_frames,
+    rest_after_blocks,
+)
+from fpvs_studio.models.condition import ConditionModel
+from fpvs_studio.models.exceptions import TimingValidationError
+from fpvs_studio.models.experiment import ExperimentModel
+from fpvs_studio.models.timing import TimingDerived, compute_timing
+
+# The fields that affect validation (see validation_key). Texts, colors and
+# condition labels, paths and trigger codes never change the outcome.
+ValidationKey = tuple[object, ...]
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """Outcome of :func:`validate_experiment`; cached, so it is immutable."""
+
+    errors: tuple[str, ...] = ()
+    warnings: tuple[str, ...] = ()
+    timing: Optional[TimingDerived] = None
+    n_blocks: int = 0
+    n_segments: int = 0
+    total_duration_seconds: int = 0
+    total_block_frames: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def validation_key(experiment: ExperimentModel) -> ValidationKey:
+    """Return the timing- and schedule-relevant fields of an experiment."""
+
+    return (
+        experiment.base_rate_hz,
+        experiment.oddball_rate_hz,
+        experiment.image_on_ms,
+        experiment.blank_ms,
+        experiment.monitor_refresh_hz,
+        experiment.block_duration_seconds,
+        experiment.num_cycles,
+        len(experiment.conditions),
+        experiment.rest_enabled,
+        experiment.rest_default_seconds,
+        experiment.attention_enabled,
+        experiment.fixation_min_changes,
+        experiment.fixation_max_changes,
+        experiment.fixation_min_gap_ms,
+        experiment.fixation_edge_margin_ms,
+        experiment.fixation_max_changes_per_block,
+    )
+
+
+@lru_cache(maxsize=256)
+def _validate_key(key: ValidationKey) -> ValidationReport:
+    (
+        base_rate_hz,
+        oddball_rate_hz,
+        image_on_ms,
+        blank_ms,
+        monitor_refresh_hz,
+        block_duration_seconds,
+        num_cycles,
+        n_conditions,
+        rest_enabled,
+        rest_default_seconds,
+        attention_enabled,
+        fixation_min_changes,
+        fixation_max_changes,
+        fixation_min_gap_ms,
+        fixation_edge_margin_ms,
+        fixation_max_changes_per_block,
+    ) = key
+    experiment = ExperimentModel(
+        experiment_id="",
+        name="",
+        base_rate_hz=base_rate_hz,
+        oddball_rate_hz=oddball_rate_hz,
+        image_on_ms=image_on_ms,
+        blank_ms=blank_ms,
+        block_duration_seconds=block_duration_seconds,
+        num_cycles=num_cycles,
+        randomize_within_cycle=False,
+        rest_enabled=rest_enabled,
+        rest_default_seconds=rest_default_seconds,
+        attention_enabled=attention_enabled,
+        fixation_min_changes=fixation_min_changes,
+        fixation_max_changes=fixation_max_changes,
+        fixation_min_gap_ms=fixation_min_gap_ms,
+        fixation_edge_margin_ms=fixation_edge_margin_ms,
+        fixation_max_changes_per_block=fixation_max_changes_per_block,
+        monitor_refresh_hz=monitor_refresh_hz,
+        conditions=[
+            ConditionModel(f"c{index}", "", 0, 0, Path(""), Path(""))
+            for index in range(n_conditions)
+        ],
+    )
+    errors: list[str] = []
+    warnings: list[str] = []
+
+    timing: Optional[TimingDerived] = None
+    if monitor_refresh_hz is None:
+        warnings.append("Monitor refresh rate is not set; frame timing was not checked.")
+    else:
+        try:
+            timing = compute_timing(experiment, monitor_refresh_hz)
+        except TimingValidationError as exc:
+            errors.append(str(exc))
+
+    try:
+        run_plan = build_run_plan(experiment, random.Random(0))
+    except ValueError as exc:
+        errors.append(str(exc))
+        return ValidationReport(tuple(errors), tuple(warnings), timing)
+
+    blocks = [segment for segment in run_plan.segments if segment.segment_type == "BLOCK"]
+    total_duration_seconds = sum(segment.duration_seconds or 0 for segment in run_plan.segments)
+    if block_duration_seconds <= 0:
+        errors.append("Block duration must be greater than zero.")
+
+    total_block_frames: Optional[int] = None
+    change_capacity: Optional[int] = None
+    if timing is not None:
+        block_frame_counts = [
+            int((segment.duration_seconds or block_duration_seconds) * timing.frames_per_second)
+            for segment in blocks
+        ]
+        total_block_frames = sum(block_frame_counts)
+        change_capacity = fixation_change_capacity(
+            block_frame_counts,
+            *fixation_constraint_frames(experiment, timing.frames_per_second),
+            max_per_block=fixation_max_changes_per_block,
+            rest_after=rest_after_blocks(run_plan),
+        )
+
+    if attention_enabled:
+        if fixation_min_changes > fixation_max_changes:
+            errors.append("Minimum fixation changes cannot exceed the maximum value.")
+        elif fixation_min_gap_ms < 0 or fixation_edge_margin_ms < 0:
+            errors.append("Fixation gap and edge margin cannot be negative.")
+        elif change_capacity is not None and fixation_max_changes > change_capacity:
+            errors.append(
+                f"Up to {fixation_max_changes} fixation changes do not fit in "
+                f"{total_block_frames} block frames; the gap, edge margin and per-block "
+                f"limits allow at most {change_capacity}."
+            )
+
+    return ValidationReport(
+        errors=tuple(errors),
+        warnings=tuple(warnings),
+        timing=timing,
+        n_blocks=len(blocks),
+        n_segments=len(run_plan.segments),
+        total_duration_seconds=total_duration_seconds,
+        total_block_frames=total_block_frames,
+    )
+
+
+def validate_experiment(experiment: ExperimentModel) -> ValidationReport:
+    """Check timing, run-plan length, total duration and fixation feasibility.
+
+    Results are memoized on :func:`validation_key`, so re-validating after
+    an edit that does not touch those fields is a dictionary lookup. Safe
+    to call from worker threads.
+    """
+
+    return _validate_key(validation_key(experiment))
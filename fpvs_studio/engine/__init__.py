@@ -1,6 +1,7 @@
 """Presentation engine interfaces and placeholders."""
 
 from .dummy_presenter import DummyPresenter
+from .headless_presenter import HeadlessPresenter
 from .presenter_base import Presenter, RunResult
 
 try:  # Optional import: RealPresenter requires heavy graphics dependencies
@@ -8,4 +9,4 @@ try:  # Optional import: RealPresenter requires heavy graphics dependencies
 except Exception:  # pragma: no cover - fallback when optional deps are missing
     RealPresenter = None  # type: ignore[assignment]
 
-__all__ = ["DummyPresenter", "Presenter", "RunResult", "RealPresenter"]
+__all__ = ["DummyPresenter", "HeadlessPresenter", "Presenter", "RunResult", "RealPresenter"]
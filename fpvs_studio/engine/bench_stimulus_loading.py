@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from fpvs_studio.engine.pixel_cache import DecodedPixelCache
+from fpvs_studio.engine.stimulus_loading import (
+    DecodedImage,
+    decode_images,
+    import_pyglet_headless,
+    list_stimulus_files,
+)
+
+
+def _serial_load(paths: list[Path]) -> None:
+    """Baseline: the original RealPresenter loader, one pyglet.image.load per file."""
+
+    pyglet = import_pyglet_headless()
+    for path in paths:
+        pyglet.image.load(str(path)).get_image_data()
+
+
+def _read_pixels(images: list[DecodedImage]) -> None:
+    """Read every pixel, as a texture upload would, so lazily mapped entries are paged in."""
+
+    for image in images:
+        bytes(image.data)
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 2:
+        print(
+            "Usage: python -m fpvs_studio.engine.bench_stimulus_loading "
+            "<image_dir> [max_workers] [pixel_cache_dir]"
+        )
+        return 1
+
+    image_dir = Path(argv[1])
+    max_workers = int(argv[2]) if len(argv) > 2 and argv[2] else None
+    cache_dir = Path(argv[3]) if len(argv) > 3 else None
+    paths = list_stimulus_files(image_dir)
+    if not paths:
+        print(f"Error: no images found in {image_dir}")
+        return 2
+
+    start = time.perf_counter()
+    _serial_load(paths)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decode_images(paths, max_workers=1)
+    serial_decode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decode_images(paths, max_workers=max_workers)
+    parallel_seconds = time.perf_counter() - start
+
+    print(f"Images: {len(paths)} (CPUs: {os.cpu_count()})")
+    print(f"Serial load:     {serial_seconds:.3f} s")
+    print(f"Serial decode:   {serial_decode_seconds:.3f} s (RGBA, one process)")
+    print(f"Parallel decode: {parallel_seconds:.3f} s (workers={max_workers or 'cpu_count'})")
+    print(f"Speedup:         {serial_seconds / parallel_seconds:.2f}x")
+
+    if cache_dir is not None:
+        cache = DecodedPixelCache(cache_dir)
+        cache.clear()
+
+        def timed_load(cache: DecodedPixelCache) -> float:
+            start = time.perf_counter()
+            _read_pixels(cache.load_images(paths, max_workers=max_workers))
+            return time.perf_counter() - start
+
+        cold_seconds = timed_load(cache)
+        warm_seconds = timed_load(DecodedPixelCache(cache_dir))
+        (cache_dir / "sources.json").unlink()
+        rehash_seconds = timed_load(DecodedPixelCache(cache_dir))
+
+        print(f"Pixel cache cold: {cold_seconds:.3f} s (decode + store + read)")
+        print(f"Pixel cache warm: {warm_seconds:.3f} s (stat + map + read every pixel)")
+        print(f"Warm, rehashing sources: {rehash_seconds:.3f} s")
+        print(f"Warm speedup vs serial: {serial_seconds / warm_seconds:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.engine.event_log_file import EventLogSpool, read_event_log
+from fpvs_studio.engine.frame_schedule import (
+    EVENT_BASE_ONSET,
+    EVENT_ODDBALL_ONSET,
+    FIXATION_BASE,
+    BlockSchedule,
+)
+
+CHECKPOINT_SUFFIX = "_checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class RunCheckpoint:
+    """Where a run stood at its last segment boundary.
+
+    ``next_segment_index`` is the first segment that had not started;
+    every earlier segment finished and its events reached the logs.
+    ``fixation_changes_done`` and ``fixation_state`` describe the fixation
+    schedule up to that point, and ``texture_cursors`` maps each condition
+    to the ``[base, oddball]`` textures shown so far. ``log_prefix`` names
+    the log files a resumed run appends to.
+    """
+
+    experiment_id: str
+    participant_id: str
+    log_prefix: str
+    segments: list[dict[str, Any]]
+    n_fixation_changes: int
+    fixation_change_frames: Optional[list[int]]
+    next_segment_index: int
+    fixation_changes_done: int = 0
+    fixation_state: int = FIXATION_BASE
+    texture_cursors: dict[str, list[int]] = field(default_factory=dict)
+    rng_state: Optional[list[Any]] = None
+    complete: bool = False
+    version: int = CHECKPOINT_VERSION
+
+
+def checkpoint_path(output_dir: Path, log_prefix: str) -> Path:
+    return output_dir / f"{log_prefix}{CHECKPOINT_SUFFIX}"
+
+
+def write_checkpoint(path: Path, checkpoint: RunCheckpoint) -> None:
+    """Write a checkpoint atomically: synced to a temporary file, then moved into place."""
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        json.dump(asdict(checkpoint), fp, indent=2)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path: Path) -> RunCheckpoint:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {data.get('version')}: {path}")
+    return RunCheckpoint(**data)
+
+
+def run_plan_from_checkpoint(checkpoint: RunCheckpoint) -> RunPlan:
+    """Rebuild the checkpointed run's plan, fixation schedule and RNG state."""
+
+    rng_state = None
+    if checkpoint.rng_state is not None:
+        version, internal_state, gauss_next = checkpoint.rng_state
+        rng_state = (version, tuple(internal_state), gauss_next)
+    return RunPlan(
+        segments=[RunSegment(**segment) for segment in checkpoint.segments],
+        fixation_change_frames=checkpoint.fixation_change_frames,
+        rng_state=rng_state,
+    )
+
+
+class RunCheckpointer:
+    """Writes a :class:`RunCheckpoint` for one run at each segment boundary.
+
+    Fixation and texture progress are accumulated once per segment up
+    front, so :meth:`write` only serializes a few fields.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        experiment_id: str,
+        participant_id: str,
+        log_prefix: str,
+        run_plan: RunPlan,
+        block_schedules: Sequence[Optional[BlockSchedule]],
+        n_fixation_changes: int,
+    ) -> None:
+        self.path = path
+        self._run_plan = run_plan
+        self._template = RunCheckpoint(
+            experiment_id=experiment_id,
+            participant_id=participant_id,
+            log_prefix=log_prefix,
+            segments=[asdict(segment) for segment in run_plan.segments],
+            n_fixation_changes=n_fixation_changes,
+            fixation_change_frames=run_plan.fixation_change_frames,
+            next_segment_index=0,
+            rng_state=list(run_plan.rng_state) if run_plan.rng_state is not None else None,
+        )
+        # progress[i] is (changes done, fixation state, texture cursors) before segment i
+        changes_done = 0
+        fixation_state = FIXATION_BASE
+        cursors: dict[str, list[int]] = {}
+        self._progress = [(changes_done, fixation_state, dict(cursors))]
+        for schedule in block_schedules:
+            if schedule is not None:
+                changes_done += sum(schedule.fixation_changes)
+                if schedule.n_frames:
+                    fixation_state = schedule.fixation_states[-1]
+                base, oddball = cursors.get(schedule.condition_id, [0, 0])
+                cursors[schedule.condition_id] = [
+                    base + schedule.event_types.count(EVENT_BASE_ONSET),
+                    oddball + schedule.event_types.count(EVENT_ODDBALL_ONSET),
+                ]
+            self._progress.append((changes_done, fixation_state, dict(cursors)))
+
+    def checkpoint(self, next_segment_index: int, complete: bool = False) -> RunCheckpoint:
+        changes_done, fixation_state, cursors = self._progress[next_segment_index]
+        checkpoint = RunCheckpoint(**asdict(self._template))
+        checkpoint.next_segment_index = next_segment_index
+        checkpoint.fixation_changes_done = changes_done
+        checkpoint.fixation_state = fixation_state
+        checkpoint.texture_cursors = cursors
+        checkpoint.complete = complete
+        return checkpoint
+
+    def write(self, next_segment_index: int, complete: bool = False) -> None:
+        write_checkpoint(self.path, self.checkpoint(next_segment_index, complete))
+
+    def verify(self, checkpoint: RunCheckpoint) -> None:
+        """Raise ``ValueError`` if this run's progress disagrees with ``checkpoint``.
+
+        Catches resuming with an edited experiment, different timing or
+        changed image folders, which would silently shift the schedule.
+        """
+
+        if checkpoint.complete:
+            raise ValueError("The checkpointed run already completed.")
+        if not 0 <= checkpoint.next_segment_index < len(self._progress):
+            raise ValueError("Checkpoint segment index is outside the run plan.")
+        expected = self.checkpoint(checkpoint.next_segment_index)
+        for name in ("fixation_changes_done", "fixation_state", "texture_cursors"):
+            if getattr(expected, name) != getattr(checkpoint, name):
+                raise ValueError(f"Checkpoint {name} no longer matches the run plan.")
+
+
+def open_resumed_event_log(
+    path: Path,
+    metadata: Mapping[str, Any],
+    resumed_segment_index: int,
+) -> EventLogSpool:
+    """Start a resumed run's binary log, keeping the events of earlier attempts.
+
+    Events already in ``path`` are spooled first and keep their clock
+    anchor; each resume is listed under ``"resumes"`` with its own anchor
+    and the index of its first event. If an earlier attempt never wrote its
+    binary log (the process was killed), the file holds the new events
+    only; ``_events.csv`` has every attempt's events either way.
+    """
+
+    resumes: list[dict[str, Any]] = []
+    anchors = {"anchor_wall": metadata["anchor_wall"], "anchor_ns": metadata["anchor_ns"]}
+    previous = None
+    if path.exists():
+        with read_event_log(path) as log:
+            previous = log.to_batch()
+            resumes = list(log.metadata.get("resumes", []))
+            anchors = {name: log.metadata[name] for name in anchors}
+    resumes.append(
+        {
+            "segment_index": resumed_segment_index,
+            "anchor_wall": metadata["anchor_wall"],
+            "anchor_ns": metadata["anchor_ns"],
+            "first_event": len(previous) if previous is not None else 0,
+        }
+    )
+    spool = EventLogSpool(path, {**metadata, **anchors, "resumes": resumes})
+    if previous is not None:
+        spool.append(previous)
+    return spool
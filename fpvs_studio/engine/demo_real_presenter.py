@@ -4,7 +4,7 @@ import random
 import sys
 from pathlib import Path
 
-from fpvs_studio.config.serialization import load_experiment
+from fpvs_studio.config.serialization import asset_index_path, load_experiment
 from fpvs_studio.controllers.scheduling import build_run_plan, draw_attention_changes
 from fpvs_studio.engine.real_presenter import RealPresenter
 from fpvs_studio.markers.null_marker import NullMarkerBackend
@@ -29,7 +29,14 @@ def main(argv: list[str]) -> int:
     run_plan = build_run_plan(experiment, rng)
     n_changes = draw_attention_changes(experiment, rng)
 
-    presenter = RealPresenter(base_output_dir=output_dir)
+    def report_progress(n_done: int, n_total: int) -> None:
+        print(f"\rDecoding stimuli: {n_done}/{n_total}", end="" if n_done < n_total else "\n")
+
+    presenter = RealPresenter(
+        base_output_dir=output_dir,
+        load_progress=report_progress,
+        asset_index_path=asset_index_path(experiment_path),
+    )
     result = presenter.run_experiment(
         experiment=experiment,
         participant_id=participant_id,
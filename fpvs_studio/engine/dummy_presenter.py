@@ -1,13 +1,174 @@
 from __future__ import annotations
 
+from array import array
+from dataclasses import asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.engine.event_buffer import (
+    EVENT_COLUMNS,
+    EVENT_CSV_HEADER,
+    LOG_BASE_ONSET,
+    LOG_BLOCK_END,
+    LOG_BLOCK_START,
+    LOG_FIXATION_CHANGE,
+    LOG_INSTRUCTION_END,
+    LOG_INSTRUCTION_START,
+    LOG_ODDBALL_ONSET,
+    LOG_REST_END,
+    LOG_REST_START,
+    LOG_RUN_COMPLETE,
+    LOG_SEGMENT_SKIPPED,
+    NO_VALUE,
+    EventBatch,
+    EventBuffer,
+    format_event_rows,
+)
+from fpvs_studio.engine.event_log_file import EVENT_LOG_SUFFIX, event_log_metadata, write_event_log
+from fpvs_studio.engine.frame_schedule import (
+    FIXATION_BASE,
+    FIXATION_TARGET,
+    block_frame_count,
+    total_block_frames,
+)
 from fpvs_studio.engine.presenter_base import Presenter, RunResult
+from fpvs_studio.engine.run_session import planned_change_frames
 from fpvs_studio.markers.base import MarkerBackend
+from fpvs_studio.models.exceptions import TimingValidationError
 from fpvs_studio.models.experiment import ExperimentModel
+from fpvs_studio.models.timing import TimingDerived
+
+
+def simulate_run_events(
+    experiment: ExperimentModel,
+    run_plan: RunPlan,
+    timing: TimingDerived,
+    change_frame_indices: Sequence[int] = (),
+    anchor_ns: int = 0,
+) -> EventBatch:
+    """Return the events a RealPresenter run of ``run_plan`` logs, without running it.
+
+    Every segment starts on the frame the previous one ended, and event
+    ``n`` frames after ``anchor_ns`` is stamped ``anchor_ns + n * 1e9 // fps``
+    (the :class:`~fpvs_studio.engine.headless_presenter.VirtualClock`
+    timeline), as if the participant answered every prompt immediately.
+    Onsets are derived per base cycle rather than per frame, so a multi-hour
+    session takes milliseconds. ``change_frame_indices`` are run-wide block
+    frame indices, as for :func:`~fpvs_studio.engine.frame_schedule.compile_run_schedules`.
+    """
+
+    columns = {name: array(typecode) for name, typecode in EVENT_COLUMNS.items()}
+    condition_ids = [condition.id for condition in experiment.conditions]
+    conditions_by_id = {condition.id: condition for condition in experiment.conditions}
+    fps = timing.frames_per_second
+    frames_per_cycle = timing.frames_per_base_cycle
+    oddball_every = timing.oddball_every_n_base
+    change_frames = sorted(set(change_frame_indices))
+    change_cursor = 0
+    fixation_state = FIXATION_BASE
+
+    def add(
+        event_codes: Sequence[int],
+        frames: Sequence[int],
+        segment_index: int = NO_VALUE,
+        condition_index: int = NO_VALUE,
+        cycle_indices: Optional[Sequence[int]] = None,
+        trigger_codes: Optional[Sequence[int]] = None,
+        frame_indices: Optional[Sequence[int]] = None,
+        fixation_states: Optional[Sequence[int]] = None,
+    ) -> None:
+        n_events = len(frames)
+        missing = array("i", [NO_VALUE]) * n_events
+        columns["event_codes"].extend(array("b", event_codes))
+        columns["segment_indices"].extend(array("i", [segment_index]) * n_events)
+        columns["condition_indices"].extend(array("i", [condition_index]) * n_events)
+        columns["cycle_indices"].extend(missing if cycle_indices is None else array("i", cycle_indices))
+        columns["trigger_codes"].extend(missing if trigger_codes is None else array("i", trigger_codes))
+        columns["frame_indices"].extend(missing if frame_indices is None else array("i", frame_indices))
+        columns["fixation_states"].extend(
+            array("b", [NO_VALUE]) * n_events if fixation_states is None else array("b", fixation_states)
+        )
+        columns["timestamps_ns"].extend(
+            array("q", [anchor_ns + frame * 1_000_000_000 // fps for frame in frames])
+        )
+
+    add([LOG_INSTRUCTION_START, LOG_INSTRUCTION_END], [0, 0])
+    run_frame = 0
+    block_frame_offset = 0
+    for segment_index, segment in enumerate(run_plan.segments):
+        condition_index = (
+            condition_ids.index(segment.condition_id) if segment.condition_id in condition_ids else NO_VALUE
+        )
+        if segment.segment_type == "BLOCK" and segment.condition_id:
+            if segment.condition_id not in conditions_by_id:
+                raise ValueError(f"Unknown condition {segment.condition_id}")
+            condition = conditions_by_id[segment.condition_id]
+            n_frames = block_frame_count(segment, experiment, timing)
+            add([LOG_BLOCK_START], [run_frame], segment_index, condition_index)
+
+            cycle_starts = range(0, n_frames, frames_per_cycle)
+            n_cycles = len(cycle_starts)
+            event_codes = array("b", [LOG_BASE_ONSET]) * n_cycles
+            trigger_codes = array("i", [condition.trigger_code_base]) * n_cycles
+            if oddball_every > 0:
+                oddball_cycles = range(oddball_every - 1, n_cycles, oddball_every)
+                event_codes[oddball_every - 1 :: oddball_every] = array("b", [LOG_ODDBALL_ONSET]) * len(
+                    oddball_cycles
+                )
+                trigger_codes[oddball_every - 1 :: oddball_every] = array(
+                    "i", [condition.trigger_code_oddball]
+                ) * len(oddball_cycles)
+
+            # Fixation changes are logged before the onset sharing their frame.
+            first_cycle = 0
+            block_end = block_frame_offset + n_frames
+            while change_cursor < len(change_frames) and change_frames[change_cursor] < block_end:
+                frame = change_frames[change_cursor] - block_frame_offset
+                change_cursor += 1
+                if frame < 0:
+                    continue
+                next_cycle = -(-frame // frames_per_cycle)
+                add(
+                    event_codes[first_cycle:next_cycle],
+                    [run_frame + start for start in cycle_starts[first_cycle:next_cycle]],
+                    segment_index,
+                    condition_index,
+                    cycle_indices=range(first_cycle, next_cycle),
+                    trigger_codes=trigger_codes[first_cycle:next_cycle],
+                )
+                first_cycle = next_cycle
+                fixation_state = FIXATION_TARGET if fixation_state == FIXATION_BASE else FIXATION_BASE
+                add(
+                    [LOG_FIXATION_CHANGE],
+                    [run_frame + frame],
+                    segment_index,
+                    condition_index,
+                    cycle_indices=[frame // frames_per_cycle],
+                    frame_indices=[block_frame_offset + frame],
+                    fixation_states=[fixation_state],
+                )
+            add(
+                event_codes[first_cycle:],
+                [run_frame + start for start in cycle_starts[first_cycle:]],
+                segment_index,
+                condition_index,
+                cycle_indices=range(first_cycle, n_cycles),
+                trigger_codes=trigger_codes[first_cycle:],
+            )
+
+            run_frame += n_frames
+            block_frame_offset += n_frames
+            add([LOG_BLOCK_END], [run_frame], segment_index, condition_index)
+        elif segment.segment_type == "REST" and segment.duration_seconds is not None:
+            add([LOG_REST_START], [run_frame], segment_index, condition_index)
+            run_frame += int(segment.duration_seconds * fps)
+            add([LOG_REST_END], [run_frame], segment_index, condition_index)
+        else:
+            add([LOG_SEGMENT_SKIPPED], [run_frame], segment_index, condition_index)
+    add([LOG_RUN_COMPLETE], [run_frame])
+    return EventBatch(**columns)
 
 
 class DummyPresenter(Presenter):
@@ -16,10 +177,18 @@ class DummyPresenter(Presenter):
 
     It iterates the RunPlan, counts block segments, and writes simple CSV logs
     with synthetic timestamps. No markers are sent and no graphics are shown.
+    Segment starts and ends are also written to the binary event log format
+    used by RealPresenter.
+
+    With ``frame_accurate=True`` the event logs instead hold every event a
+    RealPresenter run would log, in the same columns, with frame-derived
+    timestamps (see :func:`simulate_run_events`). This mode needs
+    ``experiment.monitor_refresh_hz``.
     """
 
-    def __init__(self, base_output_dir: Path) -> None:
+    def __init__(self, base_output_dir: Path, frame_accurate: bool = False) -> None:
         self._base_output_dir = base_output_dir
+        self._frame_accurate = frame_accurate
 
     def run_experiment(
         self,
@@ -31,22 +200,57 @@ class DummyPresenter(Presenter):
     ) -> RunResult:
         self._base_output_dir.mkdir(parents=True, exist_ok=True)
 
+        timing: Optional[TimingDerived] = None
+        if self._frame_accurate:
+            if experiment.monitor_refresh_hz is None:
+                raise TimingValidationError(
+                    "Monitor refresh rate must be set for frame-accurate simulation.",
+                    base_rate_hz=experiment.base_rate_hz,
+                    oddball_rate_hz=experiment.oddball_rate_hz,
+                    monitor_refresh_hz=experiment.monitor_refresh_hz,
+                )
+            timing = experiment.derive_timing(experiment.monitor_refresh_hz)
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         prefix = f"{experiment.experiment_id}_{participant_id}_{timestamp}"
         event_log_path = self._base_output_dir / f"{prefix}_events.csv"
         summary_path = self._base_output_dir / f"{prefix}_summary.csv"
+        binary_event_log_path = self._base_output_dir / f"{prefix}_events{EVENT_LOG_SUFFIX}"
 
         block_count = 0
         current_time = datetime.now()
         event_rows: list[str] = []
-        for segment in run_plan:
+        condition_ids = [condition.id for condition in experiment.conditions]
+        events = EventBuffer(2 * len(run_plan.segments))
+        events.anchor_wall = current_time
+        elapsed_ns = 0
+        for segment_index, segment in enumerate(run_plan):
+            is_block = segment.segment_type == "BLOCK"
+            condition_index = (
+                condition_ids.index(segment.condition_id)
+                if segment.condition_id in condition_ids
+                else NO_VALUE
+            )
+            events.record(
+                LOG_BLOCK_START if is_block else LOG_REST_START,
+                events.anchor_ns + elapsed_ns,
+                segment_index,
+                condition_index,
+            )
             segment_start = current_time.isoformat()
             event_rows.append(
                 f"{segment_start},segment_start,{segment.segment_type},{segment.condition_id or ''}"
             )
-            if segment.segment_type == "BLOCK":
+            if is_block:
                 block_count += 1
             current_time += timedelta(seconds=segment.duration_seconds or 0)
+            elapsed_ns += (segment.duration_seconds or 0) * 1_000_000_000
+            events.record(
+                LOG_BLOCK_END if is_block else LOG_REST_END,
+                events.anchor_ns + elapsed_ns,
+                segment_index,
+                condition_index,
+            )
             event_rows.append(
                 f"{current_time.isoformat()},segment_end,{segment.segment_type},{segment.condition_id or ''}"
             )
@@ -64,7 +268,24 @@ class DummyPresenter(Presenter):
         correct = reported_change_count == true_change_count
         absolute_error = abs(reported_change_count - true_change_count)
 
-        event_log_path.write_text("timestamp,event_type,segment_type,condition_id\n" + "\n".join(event_rows))
+        if timing is not None:
+            change_frame_indices = (
+                planned_change_frames(
+                    run_plan, total_block_frames(run_plan, experiment, timing), n_fixation_changes
+                )
+                if experiment.attention_enabled and n_fixation_changes > 0
+                else []
+            )
+            batch = simulate_run_events(
+                experiment, run_plan, timing, change_frame_indices, events.anchor_ns
+            )
+            rows = format_event_rows(
+                batch, events.anchor_wall, events.anchor_ns, run_plan.segments, condition_ids
+            )
+            event_log_path.write_text("".join(f"{row}\n" for row in [EVENT_CSV_HEADER, *rows]))
+        else:
+            batch = events.snapshot()
+            event_log_path.write_text("timestamp,event_type,segment_type,condition_id\n" + "\n".join(event_rows))
         summary_content = "\n".join(
             [
                 "participant_id,experiment_id,n_fixation_changes,reported_change_count,correct,absolute_error",
@@ -73,6 +294,22 @@ class DummyPresenter(Presenter):
             ]
         )
         summary_path.write_text(summary_content)
+        write_event_log(
+            binary_event_log_path,
+            batch,
+            event_log_metadata(
+                experiment.experiment_id,
+                participant_id,
+                run_plan.segments,
+                condition_ids,
+                events.anchor_wall.isoformat(timespec="microseconds"),
+                events.anchor_ns,
+                monitor_refresh_hz=experiment.monitor_refresh_hz,
+                base_rate_hz=experiment.base_rate_hz,
+                oddball_rate_hz=experiment.oddball_rate_hz,
+                **(asdict(timing) if timing is not None else {}),
+            ),
+        )
 
         return RunResult(
             participant_id=participant_id,
@@ -88,4 +325,5 @@ class DummyPresenter(Presenter):
             absolute_error=absolute_error,
             event_log_path=event_log_path,
             run_summary_path=summary_path,
+            binary_event_log_path=binary_event_log_path,
         )
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Sequence
+
+from fpvs_studio.controllers.scheduling import RunSegment
+from fpvs_studio.engine.frame_schedule import FIXATION_TARGET
+from fpvs_studio.models.experiment import ExperimentModel
+
+NO_VALUE = -1
+
+LOG_INSTRUCTION_START = 0
+LOG_INSTRUCTION_END = 1
+LOG_BLOCK_START = 2
+LOG_BLOCK_END = 3
+LOG_REST_START = 4
+LOG_REST_END = 5
+LOG_SEGMENT_SKIPPED = 6
+LOG_BASE_ONSET = 7
+LOG_ODDBALL_ONSET = 8
+LOG_FIXATION_CHANGE = 9
+LOG_RUN_COMPLETE = 10
+LOG_ABORTED = 11
+LOG_PREFETCH_COMPLETE = 12
+LOG_PREFETCH_MISS = 13
+LOG_RESUMED = 14
+
+EVENT_LOG_TYPES: tuple[str, ...] = (
+    "instruction_start",
+    "instruction_end",
+    "block_start",
+    "block_end",
+    "rest_start",
+    "rest_end",
+    "segment_skipped",
+    "base_onset",
+    "oddball_onset",
+    "fixation_change",
+    "run_complete",
+    "aborted",
+    "prefetch_complete",
+    "prefetch_miss",
+    "resumed",
+)
+
+# Indexed by frame_schedule event type (EVENT_NONE, EVENT_BASE_ONSET, EVENT_ODDBALL_ONSET).
+ONSET_LOG_CODES: tuple[int, ...] = (NO_VALUE, LOG_BASE_ONSET, LOG_ODDBALL_ONSET)
+
+EVENT_CSV_HEADER = (
+    "timestamp,event_type,segment_type,condition_id,base_cycle_index,"
+    "trigger_code,block_frame_index,fixation_state,elapsed_ns"
+)
+
+# Column name -> array typecode, shared by EventBuffer, EventBatch and the binary log.
+EVENT_COLUMNS: dict[str, str] = {
+    "event_codes": "b",
+    "segment_indices": "i",
+    "condition_indices": "i",
+    "cycle_indices": "i",
+    "trigger_codes": "i",
+    "frame_indices": "i",
+    "fixation_states": "b",
+    "timestamps_ns": "q",
+}
+
+
+@dataclass
+class EventBatch:
+    """A detached copy of recorded events, in the same columns as :class:`EventBuffer`."""
+
+    event_codes: array
+    segment_indices: array
+    condition_indices: array
+    cycle_indices: array
+    trigger_codes: array
+    frame_indices: array
+    fixation_states: array
+    timestamps_ns: array
+
+    def __len__(self) -> int:
+        return len(self.event_codes)
+
+
+def experiment_condition_ids(experiment: ExperimentModel) -> list[str]:
+    """Return the condition ids that event ``condition_index`` values refer to."""
+
+    return [condition.id for condition in experiment.conditions]
+
+
+def concat_batches(batches: Sequence[EventBatch]) -> EventBatch:
+    """Join batches into one, in order."""
+
+    columns = {name: array(typecode) for name, typecode in EVENT_COLUMNS.items()}
+    for batch in batches:
+        for name, column in columns.items():
+            column.extend(getattr(batch, name))
+    return EventBatch(**columns)
+
+
+def format_event_rows(
+    batch: EventBatch,
+    anchor_wall: datetime,
+    anchor_ns: int,
+    segments: Sequence[RunSegment],
+    condition_ids: Sequence[str],
+) -> list[str]:
+    """Format events as CSV rows matching :data:`EVENT_CSV_HEADER`."""
+
+    def optional(value: int) -> str:
+        return "" if value == NO_VALUE else str(value)
+
+    rows: list[str] = []
+    for index in range(len(batch)):
+        segment_index = batch.segment_indices[index]
+        condition_index = batch.condition_indices[index]
+        fixation_state = batch.fixation_states[index]
+        elapsed_ns = batch.timestamps_ns[index] - anchor_ns
+        if fixation_state == NO_VALUE:
+            fixation_label = ""
+        else:
+            fixation_label = "target" if fixation_state == FIXATION_TARGET else "base"
+        rows.append(
+            ",".join(
+                [
+                    (anchor_wall + timedelta(microseconds=elapsed_ns / 1000)).isoformat(
+                        timespec="microseconds"
+                    ),
+                    EVENT_LOG_TYPES[batch.event_codes[index]],
+                    segments[segment_index].segment_type if segment_index != NO_VALUE else "",
+                    condition_ids[condition_index] if condition_index != NO_VALUE else "",
+                    optional(batch.cycle_indices[index]),
+                    optional(batch.trigger_codes[index]),
+                    optional(batch.frame_indices[index]),
+                    fixation_label,
+                    str(elapsed_ns),
+                ]
+            )
+        )
+    return rows
+
+
+class EventBuffer:
+    """Preallocated columnar event log with monotonic timestamps.
+
+    Each event is a row of integers: a ``LOG_*`` event code, the segment and
+    condition index, base cycle, trigger code, block frame and fixation
+    state (``NO_VALUE`` when not applicable), plus a ``perf_counter_ns``
+    timestamp. A single wall-clock anchor is taken when the buffer is
+    created, and wall times are reconstructed from it only when the CSV is
+    written. The columns double in size if ``capacity`` is exceeded, so
+    size it from the compiled schedules to keep :meth:`record` from
+    allocating.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.anchor_wall = datetime.now()
+        self.anchor_ns = time.perf_counter_ns()
+        self.event_codes = array("b")
+        self.segment_indices = array("i")
+        self.condition_indices = array("i")
+        self.cycle_indices = array("i")
+        self.trigger_codes = array("i")
+        self.frame_indices = array("i")
+        self.fixation_states = array("b")
+        self.timestamps_ns = array("q")
+        self._grow(self.capacity)
+
+    def _grow(self, extra: int) -> None:
+        for name, typecode in EVENT_COLUMNS.items():
+            getattr(self, name).extend(array(typecode, bytes(array(typecode).itemsize * extra)))
+
+    def record(
+        self,
+        event_code: int,
+        timestamp_ns: int,
+        segment_index: int = NO_VALUE,
+        condition_index: int = NO_VALUE,
+        cycle_index: int = NO_VALUE,
+        trigger_code: int = NO_VALUE,
+        frame_index: int = NO_VALUE,
+        fixation_state: int = NO_VALUE,
+    ) -> None:
+        """Store one event in the next row."""
+
+        index = self.count
+        if index == self.capacity:
+            self._grow(self.capacity)
+            self.capacity *= 2
+        self.event_codes[index] = event_code
+        self.segment_indices[index] = segment_index
+        self.condition_indices[index] = condition_index
+        self.cycle_indices[index] = cycle_index
+        self.trigger_codes[index] = trigger_code
+        self.frame_indices[index] = frame_index
+        self.fixation_states[index] = fixation_state
+        self.timestamps_ns[index] = timestamp_ns
+        self.count = index + 1
+
+    def wall_time(self, timestamp_ns: int) -> datetime:
+        """Convert a recorded ``perf_counter_ns`` value to wall-clock time."""
+
+        return self.anchor_wall + timedelta(microseconds=(timestamp_ns - self.anchor_ns) / 1000)
+
+    def snapshot(self) -> EventBatch:
+        """Copy the recorded events into a batch, leaving the buffer unchanged."""
+
+        return EventBatch(
+            **{name: getattr(self, name)[: self.count] for name in EVENT_COLUMNS}
+        )
+
+    def take(self) -> EventBatch:
+        """Copy the recorded events into a batch and reuse the buffer's rows."""
+
+        batch = self.snapshot()
+        self.count = 0
+        return batch
+
+    def format_rows(
+        self,
+        segments: Sequence[RunSegment],
+        condition_ids: Sequence[str],
+    ) -> list[str]:
+        """Format the recorded events as CSV rows matching :data:`EVENT_CSV_HEADER`."""
+
+        return format_event_rows(
+            self.snapshot(), self.anchor_wall, self.anchor_ns, segments, condition_ids
+        )
+
+    def write_csv(
+        self,
+        path: Path,
+        segments: Sequence[RunSegment],
+        condition_ids: Sequence[str],
+    ) -> None:
+        """Write the events CSV; segment and condition indices are resolved here."""
+
+        path.write_text("\n".join([EVENT_CSV_HEADER, *self.format_rows(segments, condition_ids)]))
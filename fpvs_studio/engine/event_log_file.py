@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import IO, Any, Callable, Mapping, Optional, Sequence, Union
+
+from fpvs_studio.controllers.scheduling import RunSegment
+from fpvs_studio.engine.event_buffer import EVENT_COLUMNS, EVENT_LOG_TYPES, EventBatch
+
+try:  # Optional import: the reader returns NumPy arrays when NumPy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - fallback when NumPy is missing
+    np = None  # type: ignore[assignment]
+
+EVENT_LOG_SUFFIX = ".fpvsev"
+EVENT_LOG_VERSION = 1
+
+_MAGIC = b"FPVE"
+# magic, version, column count, metadata length, event count
+_HEADER = struct.Struct("<4sHHIQ")
+_ALIGN = 8
+_NUMPY_DTYPES = {"b": "<i1", "i": "<i4", "q": "<i8"}
+# Filter value for unknown names; never stored, unlike NO_VALUE (-1).
+_NO_MATCH = -2
+
+Column = Union["np.ndarray", array]
+
+
+def _padding(offset: int) -> int:
+    return (-offset) % _ALIGN
+
+
+def _column_bytes(column: array) -> bytes:
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _write_log_file(
+    path: Path,
+    n_events: int,
+    metadata: Mapping[str, Any],
+    write_column: Callable[[IO[bytes], str], int],
+) -> None:
+    meta = {**metadata, "event_types": list(EVENT_LOG_TYPES), "columns": list(EVENT_COLUMNS.items())}
+    meta_bytes = json.dumps(meta, sort_keys=True).encode("utf-8")
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as fp:
+        fp.write(_HEADER.pack(_MAGIC, EVENT_LOG_VERSION, len(EVENT_COLUMNS), len(meta_bytes), n_events))
+        fp.write(meta_bytes)
+        offset = _HEADER.size + len(meta_bytes)
+        for name in EVENT_COLUMNS:
+            fp.write(b"\0" * _padding(offset))
+            offset += _padding(offset)
+            offset += write_column(fp, name)
+    os.replace(tmp_path, path)
+
+
+def write_event_log(
+    path: Path,
+    batch: EventBatch,
+    metadata: Mapping[str, Any],
+) -> None:
+    """Write events as a versioned binary columnar file.
+
+    Layout: a fixed header, UTF-8 JSON metadata, then one little-endian
+    fixed-width column per entry of ``EVENT_COLUMNS``, in that order, each
+    starting on an 8-byte boundary. ``metadata`` should hold the experiment
+    id, timing parameters and the clock anchor; the event type names are
+    added automatically. The file is written to a temporary name first and
+    then moved into place.
+    """
+
+    def write_column(fp: IO[bytes], name: str) -> int:
+        return fp.write(_column_bytes(getattr(batch, name)))
+
+    _write_log_file(path, len(batch), metadata, write_column)
+
+
+class EventLogSpool:
+    """Builds a :func:`write_event_log` file from batches as they arrive.
+
+    Each :meth:`append` writes the batch's columns to one spool file per
+    column next to ``path``, so a run's events are not kept in memory
+    until it ends. :meth:`finish` writes the header and ``metadata`` and
+    concatenates the spools into the final file; :meth:`discard` removes
+    them without writing it.
+    """
+
+    def __init__(self, path: Path, metadata: Mapping[str, Any]) -> None:
+        self.path = path
+        self.metadata = dict(metadata)
+        self.n_events = 0
+        self._spools: dict[str, IO[bytes]] = {}
+        try:
+            for name in EVENT_COLUMNS:
+                self._spools[name] = path.with_name(f"{path.name}.{name}.spool").open("w+b")
+        except OSError:
+            self.discard()
+            raise
+
+    def append(self, batch: EventBatch) -> None:
+        """Add a batch's events after those already spooled."""
+
+        for name, spool in self._spools.items():
+            spool.write(_column_bytes(getattr(batch, name)))
+        self.n_events += len(batch)
+
+    def finish(self) -> None:
+        """Write the final file and remove the spools."""
+
+        def write_column(fp: IO[bytes], name: str) -> int:
+            spool = self._spools[name]
+            spool.seek(0)
+            shutil.copyfileobj(spool, fp)
+            return spool.tell()
+
+        try:
+            _write_log_file(self.path, self.n_events, self.metadata, write_column)
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Close and remove the spool files."""
+
+        for spool in self._spools.values():
+            spool.close()
+            Path(spool.name).unlink(missing_ok=True)
+        self._spools = {}
+
+
+def event_log_metadata(
+    experiment_id: str,
+    participant_id: str,
+    segments: Sequence[RunSegment],
+    condition_ids: Sequence[str],
+    anchor_wall: str,
+    anchor_ns: int,
+    **timing: Any,
+) -> dict[str, Any]:
+    """Build the metadata block shared by both presenters."""
+
+    return {
+        "experiment_id": experiment_id,
+        "participant_id": participant_id,
+        "anchor_wall": anchor_wall,
+        "anchor_ns": anchor_ns,
+        "condition_ids": list(condition_ids),
+        "segments": [
+            {"segment_type": segment.segment_type, "condition_id": segment.condition_id}
+            for segment in segments
+        ],
+        "timing": timing,
+    }
+
+
+class EventLogFile:
+    """Memory-mapped reader for files written by :func:`write_event_log`.
+
+    Columns are exposed without copying: as NumPy arrays when NumPy is
+    installed, otherwise as typed memoryviews. Filtered selections are new
+    arrays (``array.array`` without NumPy). Arrays returned by the reader
+    are only valid while the file is open.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, n_columns, meta_len, n_events = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"Not an FPVS event log: {path}")
+            if version != EVENT_LOG_VERSION:
+                raise ValueError(f"Unsupported event log version {version}: {path}")
+            meta_start = _HEADER.size
+            self.metadata: dict[str, Any] = json.loads(
+                bytes(self._mmap[meta_start : meta_start + meta_len]).decode("utf-8")
+            )
+            typecodes = dict(self.metadata["columns"])
+            if len(typecodes) != n_columns:
+                raise ValueError(f"Corrupt event log header: {path}")
+
+            self.n_events = n_events
+            self.columns: dict[str, Column] = {}
+            offset = meta_start + meta_len
+            for name, typecode in typecodes.items():
+                offset += _padding(offset)
+                n_bytes = array(typecode).itemsize * n_events
+                if offset + n_bytes > len(self._mmap):
+                    raise ValueError(f"Truncated event log: {path}")
+                self.columns[name] = self._column(typecode, offset, n_events)
+                offset += n_bytes
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _column(self, typecode: str, offset: int, count: int) -> Column:
+        if np is not None:
+            return np.frombuffer(self._mmap, dtype=_NUMPY_DTYPES[typecode], count=count, offset=offset)
+        view = memoryview(self._mmap)[offset : offset + array(typecode).itemsize * count]
+        return view.cast(typecode)  # type: ignore[return-value]
+
+    def __len__(self) -> int:
+        return self.n_events
+
+    def __enter__(self) -> "EventLogFile":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def to_batch(self) -> EventBatch:
+        """Copy every event into an :class:`EventBatch` that outlives the file."""
+
+        columns = {}
+        for name, typecode in EVENT_COLUMNS.items():
+            column = array(typecode)
+            column.frombytes(self.columns[name].tobytes())  # type: ignore[union-attr]
+            if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+                column.byteswap()
+            columns[name] = column
+        return EventBatch(**columns)
+
+    @property
+    def condition_ids(self) -> list[str]:
+        return list(self.metadata.get("condition_ids", []))
+
+    def select(
+        self,
+        event_type: Optional[str] = None,
+        condition_id: Optional[str] = None,
+        segment_index: Optional[int] = None,
+    ) -> dict[str, Column]:
+        """Return every column restricted to the matching events.
+
+        ``event_type`` is a name such as ``"oddball_onset"``; blocks are
+        identified by their run-plan ``segment_index``. Unknown names match
+        nothing.
+        """
+
+        conditions: list[tuple[str, int]] = []
+        if event_type is not None:
+            event_types = self.metadata["event_types"]
+            conditions.append(
+                ("event_codes", event_types.index(event_type) if event_type in event_types else _NO_MATCH)
+            )
+        if condition_id is not None:
+            ids = self.condition_ids
+            conditions.append(
+                ("condition_indices", ids.index(condition_id) if condition_id in ids else _NO_MATCH)
+            )
+        if segment_index is not None:
+            conditions.append(("segment_indices", segment_index))
+
+        if np is not None:
+            mask = np.ones(self.n_events, dtype=bool)
+            for name, value in conditions:
+                mask &= self.columns[name] == value
+            return {name: column[mask] for name, column in self.columns.items()}
+
+        indices = range(self.n_events)
+        for name, value in conditions:
+            column = self.columns[name]
+            indices = [index for index in indices if column[index] == value]
+        return {
+            name: array(column.format, (column[index] for index in indices))  # type: ignore[union-attr]
+            for name, column in self.columns.items()
+        }
+
+    def close(self) -> None:
+        """Release the mapping; later access to returned columns is invalid."""
+
+        if self._mmap.closed:
+            return
+        for column in self.columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self.columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:  # pragma: no cover - NumPy views still reference the map
+            pass
+
+
+def read_event_log(path: Path) -> EventLogFile:
+    """Open a binary event log for reading; use as a context manager."""
+
+    return EventLogFile(path)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from fpvs_studio.engine.event_buffer import EventBatch
+from fpvs_studio.engine.event_log_file import EventLogSpool
+
+FsyncPolicy = Literal["segment", "close", "never"]
+
+FSYNC_POLICIES: tuple[str, ...] = ("segment", "close", "never")
+
+_STOP = object()
+
+
+class EventLogWriter:
+    """Append-only CSV event log written on a background thread.
+
+    The presenter hands over :class:`EventBatch` objects (typically one per
+    segment boundary) through a bounded queue; formatting, writing and
+    syncing happen on the writer thread, so the file on disk always holds
+    every event up to the last submitted batch. ``fsync_policy`` selects
+    when data is forced to the storage device:
+
+    - ``"segment"``: after every batch, so a machine crash loses at most the
+      current segment.
+    - ``"close"``: once when the writer is closed; batches still reach the
+      OS after each write and survive the process being killed.
+    - ``"never"``: leave syncing to the OS.
+
+    With ``append=True`` an existing file is extended instead of replaced,
+    and the header is only written if the file is empty.
+
+    :meth:`submit` can also hand over work that must follow the batch, such
+    as writing a run checkpoint, so it happens on the writer thread once
+    the batch is on disk.
+
+    With ``binary_log`` set, every batch is also appended to that
+    :class:`EventLogSpool` on the writer thread, and :meth:`close` finishes
+    the binary file, so the presenter never holds the whole run's events.
+
+    Errors on the writer thread are re-raised from :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        header: str,
+        format_batch: Callable[[EventBatch], list[str]],
+        fsync_policy: FsyncPolicy = "segment",
+        max_queued_batches: int = 256,
+        append: bool = False,
+        binary_log: Optional[EventLogSpool] = None,
+    ) -> None:
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        self.path = path
+        self._format_batch = format_batch
+        self._fsync_policy = fsync_policy
+        self._binary_log = binary_log
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=max_queued_batches)
+        self._error: Optional[BaseException] = None
+        self._fp = path.open("a" if append else "w", encoding="utf-8", newline="")
+        if self._fp.tell() == 0:
+            self._fp.write(header + "\n")
+            self._fp.flush()
+        self._thread = threading.Thread(target=self._run, name="fpvs-event-log", daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: EventBatch, then: Optional[Callable[[], None]] = None) -> None:
+        """Queue a batch for writing, then ``then``; blocks only if the queue is full."""
+
+        if len(batch) or then is not None:
+            self._queue.put((batch, then))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if self._error is not None:
+                continue
+            batch, then = item  # type: ignore[misc]
+            try:
+                if len(batch):
+                    rows = self._format_batch(batch)
+                    self._fp.write("".join(f"{row}\n" for row in rows))
+                    self._fp.flush()
+                    if self._fsync_policy == "segment":
+                        os.fsync(self._fp.fileno())
+                    if self._binary_log is not None:
+                        self._binary_log.append(batch)
+                if then is not None:
+                    then()
+            except BaseException as exc:  # pragma: no cover - surfaced in close()
+                self._error = exc
+
+    def close(self) -> None:
+        """Write everything queued, sync according to the policy and close the file(s)."""
+
+        if self._fp.closed:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        try:
+            self._fp.flush()
+            if self._fsync_policy != "never":
+                os.fsync(self._fp.fileno())
+        finally:
+            self._fp.close()
+            if self._binary_log is not None:
+                if self._error is None:
+                    self._binary_log.finish()
+                else:
+                    self._binary_log.discard()
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+MissedFramePolicy = Literal["extend", "catch_up"]
+
+MISSED_FRAME_POLICIES: tuple[str, ...] = ("extend", "catch_up")
+
+
+class FramePacer:
+    """Converts buffer flip timestamps into schedule frame advances.
+
+    The presenter calls :meth:`on_flip` with the timestamp of every buffer
+    swap. A flip that arrives more than ``miss_threshold`` refresh periods
+    after the previous one means the display repeated the last frame for one
+    or more refreshes.
+
+    Policies:
+    - ``"extend"``: every flip advances exactly one schedule frame, so missed
+      refreshes stretch the segment but no frame is ever skipped.
+    - ``"catch_up"``: the schedule advances by the number of refresh periods
+      that elapsed, so segments keep their nominal wall-clock duration and
+      the frames that should have been shown in between are skipped.
+    """
+
+    def __init__(
+        self,
+        refresh_hz: int,
+        policy: MissedFramePolicy = "extend",
+        miss_threshold: float = 1.5,
+    ) -> None:
+        if refresh_hz <= 0:
+            raise ValueError("Refresh rate must be greater than zero.")
+        if policy not in MISSED_FRAME_POLICIES:
+            raise ValueError(f"Unknown missed frame policy: {policy}")
+        if miss_threshold <= 1.0:
+            raise ValueError("Miss threshold must be greater than one refresh period.")
+
+        self.frame_period_ns = round(1_000_000_000 / refresh_hz)
+        self.policy = policy
+        self._miss_threshold_ns = miss_threshold * self.frame_period_ns
+        self.last_flip_ns: Optional[int] = None
+        self.missed_refreshes = 0
+
+    def on_flip(self, flip_ns: int, count_misses: bool = True) -> int:
+        """Record a flip and return how many schedule frames to advance.
+
+        With ``count_misses=False`` a late flip still advances according to
+        the policy but is not added to :attr:`missed_refreshes`; the
+        presenter passes it for frames outside stimulus blocks, where the
+        loop may legitimately wait (instructions, attention prompt).
+        """
+
+        last_flip_ns = self.last_flip_ns
+        self.last_flip_ns = flip_ns
+        if last_flip_ns is None:
+            return 1
+
+        interval_ns = flip_ns - last_flip_ns
+        if interval_ns < self._miss_threshold_ns:
+            return 1
+
+        elapsed_refreshes = max(1, round(interval_ns / self.frame_period_ns))
+        if count_misses:
+            self.missed_refreshes += elapsed_refreshes - 1
+        if self.policy == "catch_up":
+            return elapsed_refreshes
+        return 1
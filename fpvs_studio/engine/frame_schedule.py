@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.models.experiment import ExperimentModel
+from fpvs_studio.models.timing import TimingDerived
+
+NO_TEXTURE = -1
+NO_TRIGGER = -1
+
+EVENT_NONE = 0
+EVENT_BASE_ONSET = 1
+EVENT_ODDBALL_ONSET = 2
+
+EVENT_TYPE_NAMES = {
+    EVENT_BASE_ONSET: "base_onset",
+    EVENT_ODDBALL_ONSET: "oddball_onset",
+}
+
+FIXATION_BASE = 0
+FIXATION_TARGET = 1
+
+
+@dataclass
+class BlockSchedule:
+    """Frame-indexed lookup tables for a single BLOCK segment.
+
+    Every table has one entry per block frame. Texture ids index into the
+    block's texture list, which holds the condition's base textures followed
+    by its oddball textures; ``NO_TEXTURE`` marks blank frames. Trigger codes
+    and event types are only set on cycle onset frames. ``fixation_states``
+    holds the fixation state after the frame's change (if any) is applied.
+    """
+
+    condition_id: str
+    n_frames: int
+    frame_offset: int
+    texture_ids: array
+    trigger_codes: array
+    event_types: array
+    cycle_indices: array
+    fixation_states: array
+    fixation_changes: array
+
+
+def block_frame_count(
+    segment: RunSegment,
+    experiment: ExperimentModel,
+    timing: TimingDerived,
+) -> int:
+    """Return the number of frames a BLOCK segment lasts."""
+
+    duration = segment.duration_seconds or experiment.block_duration_seconds
+    return int(duration * timing.frames_per_second)
+
+
+def total_block_frames(
+    run_plan: RunPlan,
+    experiment: ExperimentModel,
+    timing: TimingDerived,
+) -> int:
+    """Return the number of frames spent in BLOCK segments across a run plan."""
+
+    return sum(
+        block_frame_count(segment, experiment, timing)
+        for segment in run_plan.segments
+        if segment.segment_type == "BLOCK"
+    )
+
+
+def compile_block_schedule(
+    condition_id: str,
+    n_frames: int,
+    timing: TimingDerived,
+    trigger_code_base: int,
+    trigger_code_oddball: int,
+    n_base_textures: int,
+    n_oddball_textures: int,
+    fixation_change_frames: Sequence[int] = (),
+    initial_fixation_state: int = FIXATION_BASE,
+    frame_offset: int = 0,
+) -> BlockSchedule:
+    """Compile the per-frame tables for one FPVS block.
+
+    ``fixation_change_frames`` are block-local frame indices at which the
+    fixation cross toggles; indices outside the block are ignored.
+    """
+
+    if n_frames < 0:
+        raise ValueError("Block frame count cannot be negative.")
+    if n_base_textures < 1 or n_oddball_textures < 1:
+        raise ValueError(f"Condition {condition_id} needs at least one base and one oddball texture.")
+
+    texture_ids = array("i", [NO_TEXTURE]) * n_frames
+    trigger_codes = array("i", [NO_TRIGGER]) * n_frames
+    event_types = array("b", [EVENT_NONE]) * n_frames
+    cycle_indices = array("i", bytes(4 * n_frames))
+    fixation_states = array("b", bytes(n_frames))
+    fixation_changes = array("b", bytes(n_frames))
+
+    frames_per_cycle = timing.frames_per_base_cycle
+    image_on_frames = min(timing.image_on_frames, frames_per_cycle)
+    oddball_every = timing.oddball_every_n_base
+    base_texture_index = 0
+    oddball_texture_index = 0
+
+    for cycle_index, cycle_start in enumerate(range(0, n_frames, frames_per_cycle)):
+        is_oddball_cycle = oddball_every > 0 and cycle_index % oddball_every == oddball_every - 1
+        if is_oddball_cycle:
+            texture_id = n_base_textures + oddball_texture_index % n_oddball_textures
+            oddball_texture_index += 1
+            trigger_codes[cycle_start] = trigger_code_oddball
+            event_types[cycle_start] = EVENT_ODDBALL_ONSET
+        else:
+            texture_id = base_texture_index % n_base_textures
+            base_texture_index += 1
+            trigger_codes[cycle_start] = trigger_code_base
+            event_types[cycle_start] = EVENT_BASE_ONSET
+
+        cycle_end = min(cycle_start + frames_per_cycle, n_frames)
+        image_end = min(cycle_start + image_on_frames, n_frames)
+        for frame in range(cycle_start, image_end):
+            texture_ids[frame] = texture_id
+        for frame in range(cycle_start, cycle_end):
+            cycle_indices[frame] = cycle_index
+
+    for frame in sorted({index for index in fixation_change_frames if 0 <= index < n_frames}):
+        fixation_changes[frame] = 1
+
+    state = initial_fixation_state
+    for frame in range(n_frames):
+        if fixation_changes[frame]:
+            state = FIXATION_TARGET if state == FIXATION_BASE else FIXATION_BASE
+        fixation_states[frame] = state
+
+    return BlockSchedule(
+        condition_id=condition_id,
+        n_frames=n_frames,
+        frame_offset=frame_offset,
+        texture_ids=texture_ids,
+        trigger_codes=trigger_codes,
+        event_types=event_types,
+        cycle_indices=cycle_indices,
+        fixation_states=fixation_states,
+        fixation_changes=fixation_changes,
+    )
+
+
+def compile_run_schedules(
+    experiment: ExperimentModel,
+    run_plan: RunPlan,
+    timing: TimingDerived,
+    texture_counts: Mapping[str, tuple[int, int]],
+    change_frame_indices: Sequence[int] = (),
+) -> list[Optional[BlockSchedule]]:
+    """Compile a schedule for every BLOCK segment of a run plan.
+
+    The returned list is aligned with ``run_plan.segments``; non-block
+    segments map to ``None``. ``texture_counts`` maps each condition id to
+    its ``(n_base_textures, n_oddball_textures)`` pair and
+    ``change_frame_indices`` are run-wide block frame indices, so fixation
+    state carries over from one block to the next.
+    """
+
+    conditions_by_id = {condition.id: condition for condition in experiment.conditions}
+    change_frames = sorted(set(change_frame_indices))
+    schedules: list[Optional[BlockSchedule]] = []
+    frame_offset = 0
+    fixation_state = FIXATION_BASE
+    change_cursor = 0
+
+    for segment in run_plan.segments:
+        if segment.segment_type != "BLOCK" or not segment.condition_id:
+            schedules.append(None)
+            continue
+
+        condition_id = segment.condition_id
+        if condition_id not in conditions_by_id or condition_id not in texture_counts:
+            raise ValueError(f"Textures not loaded for condition {condition_id}")
+
+        condition = conditions_by_id[condition_id]
+        n_base_textures, n_oddball_textures = texture_counts[condition_id]
+        n_frames = block_frame_count(segment, experiment, timing)
+
+        block_changes: list[int] = []
+        while change_cursor < len(change_frames) and change_frames[change_cursor] < frame_offset + n_frames:
+            if change_frames[change_cursor] >= frame_offset:
+                block_changes.append(change_frames[change_cursor] - frame_offset)
+            change_cursor += 1
+
+        schedule = compile_block_schedule(
+            condition_id=condition_id,
+            n_frames=n_frames,
+            timing=timing,
+            trigger_code_base=condition.trigger_code_base,
+            trigger_code_oddball=condition.trigger_code_oddball,
+            n_base_textures=n_base_textures,
+            n_oddball_textures=n_oddball_textures,
+            fixation_change_frames=block_changes,
+            initial_fixation_state=fixation_state,
+            frame_offset=frame_offset,
+        )
+        schedules.append(schedule)
+        if n_frames:
+            fixation_state = schedule.fixation_states[-1]
+        frame_offset += n_frames
+
+    return schedules
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Mapping, Optional
+
+
+@dataclass
+class FrameIntervalStats:
+    """Flip interval statistics for a group of block frames."""
+
+    n_frames: int = 0
+    n_intervals: int = 0
+    dropped_frames: int = 0
+    interval_mean_ms: Optional[float] = None
+    interval_sd_ms: Optional[float] = None
+    max_lateness_ms: Optional[float] = None
+
+
+@dataclass
+class FrameTimingSummary:
+    """Run-level frame pacing summary with per-block and per-condition splits."""
+
+    frame_period_ms: float
+    run: FrameIntervalStats
+    by_segment: dict[int, FrameIntervalStats] = field(default_factory=dict)
+    by_condition: dict[str, FrameIntervalStats] = field(default_factory=dict)
+
+
+class _IntervalAccumulator:
+    def __init__(self) -> None:
+        self.n_frames = 0
+        self.n_intervals = 0
+        self.dropped_frames = 0
+        self.total_ns = 0
+        self.total_sq_ns = 0
+        self.max_interval_ns = 0
+
+    def add(self, interval_ns: Optional[int], dropped: int) -> None:
+        self.n_frames += 1
+        if interval_ns is None:
+            return
+        self.n_intervals += 1
+        self.dropped_frames += dropped
+        self.total_ns += interval_ns
+        self.total_sq_ns += interval_ns * interval_ns
+        self.max_interval_ns = max(self.max_interval_ns, interval_ns)
+
+    def finish(self, period_ns: int) -> FrameIntervalStats:
+        stats = FrameIntervalStats(
+            n_frames=self.n_frames,
+            n_intervals=self.n_intervals,
+            dropped_frames=self.dropped_frames,
+        )
+        if self.n_intervals:
+            mean_ns = self.total_ns / self.n_intervals
+            variance_ns = max(0.0, self.total_sq_ns / self.n_intervals - mean_ns * mean_ns)
+            stats.interval_mean_ms = mean_ns / 1_000_000
+            stats.interval_sd_ms = math.sqrt(variance_ns) / 1_000_000
+            stats.max_lateness_ms = max(0, self.max_interval_ns - period_ns) / 1_000_000
+        return stats
+
+
+class FrameTimingRecorder:
+    """Preallocated per-frame timing buffer for BLOCK frames.
+
+    All columns are allocated up front so :meth:`record` only writes
+    integers into existing slots. Frames beyond ``capacity`` are counted in
+    ``overflow`` but not stored. Times are ``time.perf_counter_ns`` values.
+    """
+
+    def __init__(self, capacity: int, refresh_hz: int, miss_threshold: float = 1.5) -> None:
+        self.capacity = capacity
+        self.frame_period_ns = round(1_000_000_000 / refresh_hz)
+        self._miss_threshold_ns = miss_threshold * self.frame_period_ns
+        self.count = 0
+        self.overflow = 0
+        self.segment_indices = array("i", bytes(4 * capacity))
+        self.block_frame_indices = array("i", bytes(4 * capacity))
+        self.tick_start_ns = array("q", bytes(8 * capacity))
+        self.draw_duration_ns = array("q", bytes(8 * capacity))
+        self.flip_ns = array("q", bytes(8 * capacity))
+
+    def record(
+        self,
+        segment_index: int,
+        block_frame_index: int,
+        tick_start_ns: int,
+        draw_duration_ns: int,
+        flip_ns: int,
+    ) -> None:
+        """Store the timing of one presented block frame."""
+
+        i = self.count
+        if i >= self.capacity:
+            self.overflow += 1
+            return
+        self.segment_indices[i] = segment_index
+        self.block_frame_indices[i] = block_frame_index
+        self.tick_start_ns[i] = tick_start_ns
+        self.draw_duration_ns[i] = draw_duration_ns
+        self.flip_ns[i] = flip_ns
+        self.count = i + 1
+
+    def summarize(self, segment_conditions: Mapping[int, str]) -> FrameTimingSummary:
+        """Compute interval statistics and dropped frames.
+
+        Intervals are only measured between consecutive flips of the same
+        block, so segment transitions never count as dropped frames.
+        """
+
+        period_ns = self.frame_period_ns
+        run = _IntervalAccumulator()
+        by_segment: dict[int, _IntervalAccumulator] = {}
+        by_condition: dict[str, _IntervalAccumulator] = {}
+
+        for i in range(self.count):
+            segment_index = self.segment_indices[i]
+            groups = [run, by_segment.setdefault(segment_index, _IntervalAccumulator())]
+            condition_id = segment_conditions.get(segment_index)
+            if condition_id is not None:
+                groups.append(by_condition.setdefault(condition_id, _IntervalAccumulator()))
+
+            interval_ns: Optional[int] = None
+            dropped = 0
+            if i > 0 and self.segment_indices[i - 1] == segment_index:
+                interval_ns = self.flip_ns[i] - self.flip_ns[i - 1]
+                if interval_ns >= self._miss_threshold_ns:
+                    dropped = max(1, round(interval_ns / period_ns)) - 1
+
+            for group in groups:
+                group.add(interval_ns, dropped)
+
+        return FrameTimingSummary(
+            frame_period_ms=period_ns / 1_000_000,
+            run=run.finish(period_ns),
+            by_segment={key: value.finish(period_ns) for key, value in by_segment.items()},
+            by_condition={key: value.finish(period_ns) for key, value in by_condition.items()},
+        )
+
+    def write_csv(self, path: Path, segment_conditions: Mapping[int, str]) -> None:
+        """Write one row per recorded block frame."""
+
+        rows = ["segment_index,condition_id,block_frame_index,tick_start_ns,draw_duration_ns,flip_ns"]
+        for i in range(self.count):
+            segment_index = self.segment_indices[i]
+            rows.append(
+                f"{segment_index},{segment_conditions.get(segment_index, '')},"
+                f"{self.block_frame_indices[i]},{self.tick_start_ns[i]},"
+                f"{self.draw_duration_ns[i]},{self.flip_ns[i]}"
+            )
+        path.write_text("\n".join(rows))
+
+
+def write_frame_timing_summary(
+    path: Path,
+    summary: FrameTimingSummary,
+    segment_conditions: Mapping[int, str],
+) -> None:
+    """Write run, per-block and per-condition frame pacing statistics."""
+
+    def fmt(value: Optional[float]) -> str:
+        return "" if value is None else f"{value:.4f}"
+
+    def row(scope: str, segment_index: str, condition_id: str, stats: FrameIntervalStats) -> str:
+        return ",".join(
+            [
+                scope,
+                segment_index,
+                condition_id,
+                str(stats.n_frames),
+                str(stats.dropped_frames),
+                fmt(stats.interval_mean_ms),
+                fmt(stats.interval_sd_ms),
+                fmt(stats.max_lateness_ms),
+            ]
+        )
+
+    lines = [
+        "scope,segment_index,condition_id,n_frames,dropped_frames,interval_mean_ms,interval_sd_ms,max_lateness_ms",
+        row("run", "", "", summary.run),
+    ]
+    for segment_index, stats in sorted(summary.by_segment.items()):
+        lines.append(row("block", str(segment_index), segment_conditions.get(segment_index, ""), stats))
+    for condition_id, stats in sorted(summary.by_condition.items()):
+        lines.append(row("condition", "", condition_id, stats))
+    path.write_text("\n".join(lines))
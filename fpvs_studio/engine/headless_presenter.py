@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.engine.event_buffer import (
+    EVENT_CSV_HEADER,
+    LOG_ABORTED,
+    EventBatch,
+    EventBuffer,
+    experiment_condition_ids,
+    format_event_rows,
+)
+from fpvs_studio.engine.checkpoint import (
+    RunCheckpoint,
+    RunCheckpointer,
+    checkpoint_path,
+    open_resumed_event_log,
+    read_checkpoint,
+    run_plan_from_checkpoint,
+)
+from fpvs_studio.engine.event_log_file import EVENT_LOG_SUFFIX, EventLogSpool, event_log_metadata
+from fpvs_studio.engine.event_log_writer import EventLogWriter
+from fpvs_studio.engine.frame_schedule import (
+    compile_run_schedules,
+    total_block_frames as count_total_block_frames,
+)
+from fpvs_studio.engine.presenter_base import Presenter, RunResult
+from fpvs_studio.engine.run_session import (
+    KEY_ANY,
+    KEY_ENTER,
+    KEY_YES,
+    RunSession,
+    event_capacity,
+    planned_change_frames,
+    score_attention,
+    write_run_summary,
+)
+from fpvs_studio.markers.base import FrameSyncedMarkerBackend, MarkerBackend
+from fpvs_studio.models.exceptions import TimingValidationError
+from fpvs_studio.models.experiment import ExperimentModel
+
+
+class VirtualClock:
+    """Nanosecond clock that only moves when the driver advances it."""
+
+    def __init__(self, start_ns: int, frames_per_second: int) -> None:
+        self.start_ns = start_ns
+        self.frames_per_second = frames_per_second
+        self.frame = 0
+
+    def advance(self, frames: int = 1) -> None:
+        self.frame += frames
+
+    def __call__(self) -> int:
+        return self.start_ns + self.frame * 1_000_000_000 // self.frames_per_second
+
+
+def attention_key_script(reported_change_count: Optional[int]) -> list[str]:
+    """Keys a participant presses to leave the instructions, answer and exit."""
+
+    keys = [KEY_ANY]
+    if reported_change_count is not None:
+        keys += list(str(reported_change_count)) + [KEY_ENTER, KEY_YES]
+    return keys + [KEY_ANY]
+
+
+class HeadlessPresenter(Presenter):
+    """
+    Runs the RealPresenter state machine without a window, as fast as the
+    CPU allows.
+
+    The same :class:`RunSession` drives segments, triggers and the attention
+    prompt, but frames are presented on a :class:`VirtualClock` that steps
+    one refresh period per frame, and key presses come from ``key_script``.
+    One scripted key is delivered per frame whenever the session waits for
+    input. By default the script leaves the instructions, answers the
+    attention prompt with the true change count (or ``attention_response``)
+    and exits. If the script runs out while input is still required, the
+    run is aborted. ``interrupt_after_frames`` stops the run after that many
+    frames, like a participant closing the window; the checkpoint then
+    points at the interrupted segment.
+
+    The ``_events.csv`` and ``_events.fpvsev`` logs match a windowed run of
+    the same plan apart from timestamps. Stimulus images are never loaded,
+    so one texture per condition is assumed; texture ids are not logged.
+    Frame timing files are not written. Like RealPresenter, the run is
+    checkpointed at every segment boundary and can be continued with
+    :meth:`resume_experiment`.
+    """
+
+    def __init__(
+        self,
+        base_output_dir: Path,
+        key_script: Optional[Sequence[str]] = None,
+        attention_response: Optional[int] = None,
+        interrupt_after_frames: Optional[int] = None,
+    ) -> None:
+        self._base_output_dir = base_output_dir
+        self._key_script = key_script
+        self._attention_response = attention_response
+        self._interrupt_after_frames = interrupt_after_frames
+
+    def run_experiment(
+        self,
+        experiment: ExperimentModel,
+        participant_id: str,
+        run_plan: RunPlan,
+        n_fixation_changes: int,
+        marker: MarkerBackend,
+    ) -> RunResult:
+        return self._present(experiment, participant_id, run_plan, n_fixation_changes, marker)
+
+    def resume_experiment(
+        self,
+        experiment: ExperimentModel,
+        checkpoint_file: Path,
+        marker: MarkerBackend,
+    ) -> RunResult:
+        """Continue a checkpointed run from its first unfinished segment."""
+
+        checkpoint = read_checkpoint(checkpoint_file)
+        return self._present(
+            experiment,
+            checkpoint.participant_id,
+            run_plan_from_checkpoint(checkpoint),
+            checkpoint.n_fixation_changes,
+            marker,
+            resume=checkpoint,
+        )
+
+    def _present(
+        self,
+        experiment: ExperimentModel,
+        participant_id: str,
+        run_plan: RunPlan,
+        n_fixation_changes: int,
+        marker: MarkerBackend,
+        resume: Optional[RunCheckpoint] = None,
+    ) -> RunResult:
+        self._base_output_dir.mkdir(parents=True, exist_ok=True)
+
+        if experiment.monitor_refresh_hz is None:
+            raise TimingValidationError(
+                "Monitor refresh rate must be set for HeadlessPresenter.",
+                base_rate_hz=experiment.base_rate_hz,
+                oddball_rate_hz=experiment.oddball_rate_hz,
+                monitor_refresh_hz=experiment.monitor_refresh_hz,
+            )
+
+        timing = experiment.derive_timing(experiment.monitor_refresh_hz)
+        frame_synced_marker = marker if isinstance(marker, FrameSyncedMarkerBackend) else None
+
+        if resume is not None:
+            prefix = resume.log_prefix
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            prefix = f"{experiment.experiment_id}_{participant_id}_{timestamp}"
+        event_log_path = self._base_output_dir / f"{prefix}_events.csv"
+        binary_event_log_path = self._base_output_dir / f"{prefix}_events{EVENT_LOG_SUFFIX}"
+        summary_path = self._base_output_dir / f"{prefix}_summary.csv"
+
+        total_block_frames = count_total_block_frames(run_plan, experiment, timing)
+        attention_required = experiment.attention_enabled and n_fixation_changes > 0
+        change_frame_indices = (
+            planned_change_frames(run_plan, total_block_frames, n_fixation_changes)
+            if attention_required
+            else []
+        )
+        block_schedules = compile_run_schedules(
+            experiment,
+            run_plan,
+            timing,
+            {condition.id: (1, 1) for condition in experiment.conditions},
+            change_frame_indices,
+        )
+        checkpointer = RunCheckpointer(
+            checkpoint_path(self._base_output_dir, prefix),
+            experiment.experiment_id,
+            participant_id,
+            prefix,
+            run_plan,
+            block_schedules,
+            n_fixation_changes,
+        )
+        if resume is not None:
+            checkpointer.verify(resume)
+
+        condition_ids = experiment_condition_ids(experiment)
+        events = EventBuffer(event_capacity(run_plan, block_schedules, len(condition_ids)))
+        clock = VirtualClock(events.anchor_ns, timing.frames_per_second)
+
+        def format_events(batch: EventBatch) -> list[str]:
+            return format_event_rows(
+                batch, events.anchor_wall, events.anchor_ns, run_plan.segments, condition_ids
+            )
+
+        metadata = event_log_metadata(
+            experiment.experiment_id,
+            participant_id,
+            run_plan.segments,
+            condition_ids,
+            events.anchor_wall.isoformat(timespec="microseconds"),
+            events.anchor_ns,
+            monitor_refresh_hz=experiment.monitor_refresh_hz,
+            base_rate_hz=experiment.base_rate_hz,
+            oddball_rate_hz=experiment.oddball_rate_hz,
+            **asdict(timing),
+        )
+        first_segment_index = resume.next_segment_index if resume is not None else 0
+        binary_log = (
+            open_resumed_event_log(binary_event_log_path, metadata, first_segment_index)
+            if resume is not None
+            else EventLogSpool(binary_event_log_path, metadata)
+        )
+        event_log = EventLogWriter(
+            event_log_path,
+            EVENT_CSV_HEADER,
+            format_events,
+            "close",
+            append=resume is not None,
+            binary_log=binary_log,
+        )
+
+        def flush_events(then: Optional[Callable[[], None]] = None) -> None:
+            event_log.submit(events.take(), then)
+
+        def segment_boundary() -> None:
+            # The checkpoint is written on the writer thread, after the segment's events.
+            flush_events(partial(checkpointer.write, session.next_segment_index))
+
+        session = RunSession(
+            run_plan,
+            block_schedules,
+            timing.frames_per_second,
+            marker,
+            events,
+            condition_ids,
+            attention_required,
+            clock=clock,
+            on_segment_boundary=segment_boundary,
+        )
+
+        if self._key_script is not None:
+            keys = deque(self._key_script)
+        else:
+            response = n_fixation_changes if self._attention_response is None else self._attention_response
+            keys = deque(attention_key_script(response if attention_required else None))
+
+        aborted = False
+        abort_reason: Optional[str] = None
+        try:
+            session.start(first_segment_index)
+            frames_left = self._interrupt_after_frames
+            while not session.exit_requested:
+                if frames_left is not None:
+                    if frames_left <= 0:
+                        break
+                    frames_left -= 1
+                if session.awaiting_input:
+                    if keys:
+                        session.press_key(keys.popleft())
+                    elif session.state == "complete":
+                        break
+                    else:
+                        raise RuntimeError(f"Key script ended in state {session.state}.")
+                session.advance_frame(1)
+                clock.advance()
+                if frame_synced_marker is not None:
+                    frame_synced_marker.on_frame(clock())
+        except Exception as exc:
+            aborted = True
+            abort_reason = str(exc)
+
+        if not aborted and not session.finished:
+            aborted = True
+            abort_reason = "Run interrupted before it completed."
+            session.log_event(LOG_ABORTED)
+            flush_events(partial(checkpointer.write, session.resume_segment_index))
+        elif aborted:
+            session.log_event(LOG_ABORTED)
+            flush_events()
+        else:
+            flush_events(partial(checkpointer.write, session.next_segment_index, complete=True))
+        event_log.close()
+
+        reported_change_count = session.reported_change_count
+        true_change_count, correct, absolute_error = score_attention(
+            experiment, n_fixation_changes, reported_change_count
+        )
+        write_run_summary(
+            summary_path,
+            participant_id,
+            experiment,
+            n_fixation_changes,
+            reported_change_count,
+            0,
+            "headless_virtual_clock=yes"
+            + (f";resumed_from_segment={first_segment_index}" if resume is not None else ""),
+        )
+
+        return RunResult(
+            participant_id=participant_id,
+            experiment_id=experiment.experiment_id,
+            aborted=aborted,
+            abort_reason=abort_reason,
+            attention_enabled=experiment.attention_enabled,
+            n_fixation_changes=n_fixation_changes,
+            true_change_count=true_change_count,
+            reported_change_count=reported_change_count,
+            confirmed=session.confirmed,
+            correct=correct,
+            absolute_error=absolute_error,
+            event_log_path=event_log_path,
+            run_summary_path=summary_path,
+            binary_event_log_path=binary_event_log_path,
+        )
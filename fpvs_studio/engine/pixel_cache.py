@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import ctypes
+import hashlib
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Sequence
+
+from fpvs_studio.config.asset_index import AssetFile, file_sha256
+from fpvs_studio.engine.stimulus_loading import (
+    DecodedImage,
+    ProgressCallback,
+    decode_image,
+    decode_images,
+)
+
+_HEADER = struct.Struct("<4sHHII")
+_MAGIC = b"FPVP"
+# Version 2: RGB sources get alpha 255 (version 1 entries copied red into alpha).
+_VERSION = 2
+_SUFFIX = ".fpvspix"
+_SOURCES_FILENAME = "sources.json"
+
+
+class DecodedPixelCache:
+    """Persistent, size-bounded cache of decoded RGBA stimulus buffers.
+
+    Entries are keyed by the SHA-256 of the source file's content plus a
+    decode parameter string (for example the pre-scale target), so renamed
+    or copied stimuli still hit and edited files never do. Each entry is a
+    small header followed by the raw bottom-up RGBA rows. Hits are
+    memory-mapped and handed to pyglet without a copy or re-decode. When the
+    cache grows beyond ``max_bytes`` the least recently used entries are
+    removed; use time is tracked through the entry file's mtime.
+
+    Source digests are remembered in ``sources.json`` with each file's size
+    and mtime, as in the asset index (:class:`AssetFile`), so a warm run
+    only stats its sources instead of hashing them again.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 8 * 1024**3) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._sources: Optional[dict[str, AssetFile]] = None
+        self._sources_changed = False
+
+    def _source_index(self) -> dict[str, AssetFile]:
+        if self._sources is None:
+            try:
+                data = json.loads((self.cache_dir / _SOURCES_FILENAME).read_text("utf-8"))
+                self._sources = {name: AssetFile(**entry) for name, entry in data.items()}
+            except (OSError, ValueError, TypeError):
+                self._sources = {}
+        return self._sources
+
+    def _save_source_index(self) -> None:
+        if not self._sources_changed or self._sources is None:
+            return
+        path = self.cache_dir / _SOURCES_FILENAME
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as fp:
+            json.dump({name: asdict(entry) for name, entry in self._sources.items()}, fp)
+        os.replace(tmp_path, path)
+        self._sources_changed = False
+
+    def source_digest(self, path: Path) -> str:
+        """Return the SHA-256 of a source file, hashing it only if its size or mtime changed."""
+
+        sources = self._source_index()
+        name = str(path.absolute())
+        stat = path.stat()
+        entry = sources.get(name)
+        if entry is None or (entry.size, entry.mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            entry = sources[name] = AssetFile(stat.st_size, stat.st_mtime_ns, file_sha256(path))
+            self._sources_changed = True
+        return entry.sha256
+
+    def entry_key(self, path: Path, decode_params: str, digest: Optional[str] = None) -> str:
+        """Return the cache key for a source file decoded with ``decode_params``.
+
+        ``digest`` is the file's known SHA-256 (e.g. from an asset index);
+        without it :meth:`source_digest` supplies one.
+        """
+
+        digest = digest or self.source_digest(path)
+        return hashlib.sha256(f"{digest}|{decode_params}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_SUFFIX}"
+
+    def get(self, key: str, source_path: Path) -> Optional[DecodedImage]:
+        """Return a memory-mapped entry, or None if it is missing or invalid."""
+
+        entry_path = self._entry_path(key)
+        try:
+            with entry_path.open("rb") as fp:
+                mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            return None
+        magic, version, _, width, height = _HEADER.unpack_from(mapped, 0)
+        n_bytes = width * height * 4
+        if magic != _MAGIC or version != _VERSION or len(mapped) != _HEADER.size + n_bytes:
+            mapped.close()
+            return None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        # The ctypes view keeps the mapping alive until the pixels are released.
+        data = (ctypes.c_ubyte * n_bytes).from_buffer(mapped, _HEADER.size)
+        return DecodedImage(path=source_path, width=width, height=height, data=data)
+
+    def put(self, key: str, image: DecodedImage) -> None:
+        """Store a decoded image; call :meth:`evict` afterwards to enforce the budget."""
+
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as fp:
+            fp.write(_HEADER.pack(_MAGIC, _VERSION, 0, image.width, image.height))
+            fp.write(image.data)
+        os.replace(tmp_path, entry_path)
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = []
+        total = 0
+        for entry_path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                # Entries mapped by a running session cannot be removed on Windows.
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cache entry and the source digests (other files are kept)."""
+
+        for entry_path in [*self.cache_dir.glob(f"*{_SUFFIX}"), self.cache_dir / _SOURCES_FILENAME]:
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+        self._sources = None
+        self._sources_changed = False
+
+    def load_images(
+        self,
+        paths: Sequence[Path],
+        decode_params: str = "rgba",
+        decoder: Callable[[Path], DecodedImage] = decode_image,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        content_hashes: Optional[Mapping[Path, str]] = None,
+    ) -> list[DecodedImage]:
+        """Load images from the cache, decoding and storing only the misses.
+
+        ``decode_params`` must describe everything ``decoder`` does beyond a
+        plain RGBA decode, so different decoders never share entries.
+        Paths found in ``content_hashes`` are not even stat'ed to build their
+        keys; others go through :meth:`source_digest`. Results are returned
+        in input order.
+        """
+
+        total = len(paths)
+        known = content_hashes or {}
+        self._source_index()  # load once before the hashing threads share it
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            keys = list(
+                pool.map(lambda path: self.entry_key(path, decode_params, known.get(path)), paths)
+            )
+        self._save_source_index()
+
+        results: list[Optional[DecodedImage]] = [self.get(key, path) for key, path in zip(keys, paths)]
+        missing = [index for index, image in enumerate(results) if image is None]
+        n_hits = total - len(missing)
+        if progress and n_hits:
+            progress(n_hits, total)
+
+        decoded = decode_images(
+            [paths[index] for index in missing],
+            max_workers=max_workers,
+            progress=(lambda done, _: progress(n_hits + done, total)) if progress else None,
+            decoder=decoder,
+        )
+        for index, image in zip(missing, decoded):
+            self.put(keys[index], image)
+            results[index] = image
+        if missing:
+            self.evict()
+        return results  # type: ignore[return-value]
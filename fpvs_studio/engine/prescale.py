@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, Optional
+
+from fpvs_studio.engine.stimulus_loading import DecodedImage, decode_image
+
+try:  # Optional import: CPU resampling requires Pillow
+    from PIL import Image
+except ImportError:  # pragma: no cover - fallback when Pillow is missing
+    Image = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import pyglet
+
+AspectPolicy = Literal["stretch", "fit", "fill"]
+
+ASPECT_POLICIES: tuple[str, ...] = ("stretch", "fit", "fill")
+
+
+@dataclass(frozen=True)
+class FitGeometry:
+    """Source crop box and destination rectangle for drawing one stimulus.
+
+    All values are in pixels with a bottom-left origin, matching pyglet.
+    """
+
+    crop_x: int
+    crop_y: int
+    crop_width: int
+    crop_height: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def compute_fit_geometry(
+    src_width: int,
+    src_height: int,
+    dst_width: int,
+    dst_height: int,
+    policy: AspectPolicy = "stretch",
+) -> FitGeometry:
+    """Map a source image onto a destination area under an aspect-fit policy.
+
+    - ``"stretch"``: fill the destination, ignoring the aspect ratio.
+    - ``"fit"``: keep the aspect ratio and letterbox inside the destination.
+    - ``"fill"``: keep the aspect ratio and crop the centered source region
+      that covers the destination.
+    """
+
+    if src_width <= 0 or src_height <= 0 or dst_width <= 0 or dst_height <= 0:
+        raise ValueError("Image and destination sizes must be positive.")
+
+    if policy == "stretch":
+        return FitGeometry(0, 0, src_width, src_height, 0, 0, dst_width, dst_height)
+
+    if policy == "fit":
+        scale = min(dst_width / src_width, dst_height / src_height)
+        width = min(dst_width, max(1, round(src_width * scale)))
+        height = min(dst_height, max(1, round(src_height * scale)))
+        return FitGeometry(
+            0,
+            0,
+            src_width,
+            src_height,
+            (dst_width - width) // 2,
+            (dst_height - height) // 2,
+            width,
+            height,
+        )
+
+    if policy == "fill":
+        scale = max(dst_width / src_width, dst_height / src_height)
+        crop_width = min(src_width, max(1, round(dst_width / scale)))
+        crop_height = min(src_height, max(1, round(dst_height / scale)))
+        return FitGeometry(
+            (src_width - crop_width) // 2,
+            (src_height - crop_height) // 2,
+            crop_width,
+            crop_height,
+            0,
+            0,
+            dst_width,
+            dst_height,
+        )
+
+    raise ValueError(f"Unknown aspect policy: {policy}")
+
+
+def fit_texture(
+    texture: "pyglet.image.AbstractImage",
+    dst_width: int,
+    dst_height: int,
+    policy: AspectPolicy = "stretch",
+) -> tuple["pyglet.image.AbstractImage", FitGeometry]:
+    """Return the texture (cropped to a region if needed) and where to draw it.
+
+    For images pre-scaled with :func:`prescale_image` this is a 1:1 placement.
+    """
+
+    geometry = compute_fit_geometry(texture.width, texture.height, dst_width, dst_height, policy)
+    if geometry.crop_width != texture.width or geometry.crop_height != texture.height:
+        texture = texture.get_region(
+            geometry.crop_x, geometry.crop_y, geometry.crop_width, geometry.crop_height
+        )
+    return texture, geometry
+
+
+def prescale_cache_key(path: Path, dst_width: int, dst_height: int, policy: AspectPolicy) -> str:
+    """Key a resized image by source file identity, target resolution and policy."""
+
+    stat = path.stat()
+    identity = f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{dst_width}x{dst_height}|{policy}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+def prescale_available() -> bool:
+    """Return True when Pillow is installed and CPU resampling can be used."""
+
+    return Image is not None
+
+
+def prescale_image(
+    path: Path,
+    dst_width: int,
+    dst_height: int,
+    policy: AspectPolicy = "stretch",
+    cache_dir: Optional[Path] = None,
+) -> DecodedImage:
+    """Decode ``path`` already resampled to its on-screen size.
+
+    The result is the exact size of the destination rectangle from
+    :func:`compute_fit_geometry`, so it can be drawn 1:1. When ``cache_dir``
+    is given, resized images are stored there as PNG files and reused on
+    later runs. Falls back to :func:`decode_image` when Pillow is missing.
+    """
+
+    if Image is None:
+        return decode_image(path)
+
+    cache_path: Optional[Path] = None
+    if cache_dir is not None:
+        cache_path = cache_dir / f"{prescale_cache_key(path, dst_width, dst_height, policy)}.png"
+        if cache_path.exists():
+            with Image.open(cache_path) as cached:
+                return _to_decoded(path, cached.convert("RGBA"))
+
+    with Image.open(path) as source:
+        source_rgba = source.convert("RGBA")
+    geometry = compute_fit_geometry(source_rgba.width, source_rgba.height, dst_width, dst_height, policy)
+    # Pillow boxes use a top-left origin; the centered crop is symmetric.
+    box = (
+        geometry.crop_x,
+        source_rgba.height - geometry.crop_y - geometry.crop_height,
+        geometry.crop_x + geometry.crop_width,
+        source_rgba.height - geometry.crop_y,
+    )
+    resized = source_rgba.resize((geometry.width, geometry.height), Image.LANCZOS, box=box)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp")
+        resized.save(tmp_path, format="PNG", compress_level=1)
+        os.replace(tmp_path, cache_path)
+
+    return _to_decoded(path, resized)
+
+
+def _to_decoded(path: Path, image: "Image.Image") -> DecodedImage:
+    flipped = image.transpose(Image.FLIP_TOP_BOTTOM)
+    return DecodedImage(path=path, width=image.width, height=image.height, data=flipped.tobytes())
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Optional, Protocol
 
 from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.markers.async_marker import MarkerLatencyStats
 from fpvs_studio.markers.base import MarkerBackend
 from fpvs_studio.models.experiment import ExperimentModel
 
@@ -29,6 +30,18 @@ class RunResult:
 
     event_log_path: Optional[Path] = None
     run_summary_path: Optional[Path] = None
+    binary_event_log_path: Optional[Path] = None
+
+    frame_timing_path: Optional[Path] = None
+    frame_timing_summary_path: Optional[Path] = None
+    frame_interval_mean_ms: Optional[float] = None
+    frame_interval_sd_ms: Optional[float] = None
+    max_frame_lateness_ms: Optional[float] = None
+    dropped_frames: Optional[int] = None
+
+    marker_latency: Optional[MarkerLatencyStats] = None
+    marker_latency_path: Optional[Path] = None
+    marker_pulses_path: Optional[Path] = None
 
 
 class Presenter(Protocol):
@@ -1,21 +1,104 @@
 from __future__ import annotations
 
+import time
+from dataclasses import asdict
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Callable, Generator, Optional
 
 import pyglet
 from pyglet import shapes
 from pyglet.window import key
 
-from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.config.serialization import refresh_saved_asset_index
+from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.engine.event_buffer import (
+    EVENT_CSV_HEADER,
+    LOG_ABORTED,
+    LOG_PREFETCH_COMPLETE,
+    LOG_PREFETCH_MISS,
+    EventBatch,
+    EventBuffer,
+    experiment_condition_ids,
+    format_event_rows,
+)
+from fpvs_studio.engine.checkpoint import (
+    RunCheckpoint,
+    RunCheckpointer,
+    checkpoint_path,
+    open_resumed_event_log,
+    read_checkpoint,
+    run_plan_from_checkpoint,
+)
+from fpvs_studio.engine.event_log_file import EVENT_LOG_SUFFIX, EventLogSpool, event_log_metadata
+from fpvs_studio.engine.event_log_writer import EventLogWriter, FsyncPolicy
+from fpvs_studio.engine.frame_schedule import (
+    FIXATION_TARGET,
+    NO_TEXTURE,
+    BlockSchedule,
+    compile_run_schedules,
+    total_block_frames as count_total_block_frames,
+)
+from fpvs_studio.engine.frame_pacing import FramePacer, MissedFramePolicy
+from fpvs_studio.engine.frame_timing import FrameTimingRecorder, write_frame_timing_summary
+from fpvs_studio.engine.pixel_cache import DecodedPixelCache
+from fpvs_studio.engine.prescale import (
+    AspectPolicy,
+    FitGeometry,
+    fit_texture,
+    prescale_available,
+    prescale_image,
+)
 from fpvs_studio.engine.presenter_base import Presenter, RunResult
-from fpvs_studio.markers.base import MarkerBackend
+from fpvs_studio.engine.run_session import (
+    KEY_ANY,
+    KEY_BACKSPACE,
+    KEY_ENTER,
+    KEY_NO,
+    KEY_YES,
+    RunSession,
+    event_capacity,
+    planned_change_frames,
+    score_attention,
+    write_run_summary,
+)
+from fpvs_studio.engine.stimulus_loading import (
+    DecodedImage,
+    ProgressCallback,
+    collect_condition_stimuli,
+    indexed_condition_stimuli,
+    decode_condition_stimuli,
+    decode_image,
+)
+from fpvs_studio.engine.texture_atlas import (
+    TexturePacking,
+    iter_condition_textures,
+    upload_condition_textures,
+)
+from fpvs_studio.engine.texture_streaming import ConditionTextureStreamer, next_block_condition
+from fpvs_studio.markers.base import FrameSyncedMarkerBackend, MarkerBackend
 from fpvs_studio.models.experiment import ExperimentModel
 from fpvs_studio.models.exceptions import TimingValidationError
 from fpvs_studio.models.timing import TimingDerived
 
 
+def session_key_name(symbol: int) -> str:
+    """Map a pyglet key symbol to a :class:`RunSession` key name."""
+
+    if symbol in {key.ENTER, key.RETURN}:
+        return KEY_ENTER
+    if symbol == key.BACKSPACE:
+        return KEY_BACKSPACE
+    if key._0 <= symbol <= key._9:
+        return str(symbol - key._0)
+    if symbol == key.Y:
+        return KEY_YES
+    if symbol == key.N:
+        return KEY_NO
+    return KEY_ANY
+
+
 class RealPresenter(Presenter):
     """
     Real presenter that opens a full-screen pyglet window, displays the
@@ -27,11 +110,112 @@ class RealPresenter(Presenter):
     - Emits trigger codes for base and oddball onsets and logs events.
     - Draws a fixation cross with scheduled color changes (no triggers).
     - Collects an end-of-run attention response when enabled.
+
+    Segments are advanced once per vsync-locked buffer flip rather than by
+    timer callbacks. ``missed_frame_policy`` selects how missed refreshes are
+    handled (see :class:`FramePacer`); only refreshes missed while a BLOCK
+    is on screen count towards ``missed_refreshes`` in ``_summary.csv``.
+
+    Stimuli are decoded on a process pool of ``load_workers`` processes
+    (default: one per CPU) before the window opens; ``load_progress`` is
+    called with ``(n_done, n_total)`` while decoding. Textures are uploaded
+    on the main thread once the window exists. With
+    ``texture_packing="atlas"`` each condition's textures are packed into
+    shared atlases and drawn through a single sprite, so switching stimuli
+    only changes texture coordinates.
+
+    ``aspect_policy`` controls how stimuli are mapped onto the screen (see
+    :func:`~fpvs_studio.engine.prescale.compute_fit_geometry`). With
+    ``prescale=True`` stimuli are resampled once to their on-screen size
+    while decoding, so each frame draws them 1:1; resized images are cached
+    in ``prescale_cache_dir`` when it is set. Pre-scaling needs Pillow, and
+    the constructor raises ``ValueError`` if it is requested without it.
+
+    With ``pixel_cache_dir`` set, decoded pixels are kept in a
+    content-addressed :class:`DecodedPixelCache` bounded by
+    ``pixel_cache_max_bytes``, and later runs memory-map them instead of
+    decoding again.
+
+    With ``asset_index_path`` set (normally ``asset_index_path(manifest)``
+    from :mod:`fpvs_studio.config.serialization`), stimulus lists come from
+    the saved asset index after an incremental stat check, cache keys reuse
+    its content hashes, and its index hash is written to ``_summary.csv``.
+
+    With ``texture_streaming=True`` only the first block's condition is
+    loaded before the run starts. Each block start prefetches the next
+    block's condition on a background thread (``prefetch_workers`` decode
+    processes); finished prefetches are uploaded ``uploads_per_frame``
+    images per flip in whatever segment is running (instructions, the
+    previous block or a rest), and uploaded conditions beyond
+    ``texture_budget_bytes`` are evicted in least-recently-used order.
+    ``prefetch_complete`` events record when a condition finished decoding;
+    ``prefetch_miss`` events mark blocks whose condition was not fully
+    uploaded when they started, so their first frame waited for it.
+
+    Events are appended to ``_events.csv`` by a background
+    :class:`EventLogWriter` at every segment boundary, so a partial log
+    survives a crash; ``event_fsync_policy`` controls when it is synced.
+    The writer also spools each batch into the binary columnar log (see
+    :class:`~fpvs_studio.engine.event_log_file.EventLogSpool`), which is
+    assembled when the run ends, so the run's events are never all held in
+    memory; the event buffer only has to hold one segment's events.
+
+    At every segment boundary the run's position is also written to
+    ``_checkpoint.json`` (see :class:`RunCheckpointer`) by the writer
+    thread, once that segment's events are written. After an abort,
+    :meth:`resume_experiment` shows the instructions again and continues the
+    same plan from the first unfinished segment, appending to the same
+    logs after a ``resumed`` event.
+
+    Frame-synced marker backends (see :class:`FrameSyncedMarkerBackend`)
+    receive ``on_frame`` with the flip time after every buffer flip.
+
+    Segment progression, triggers, event logging and the attention prompt
+    live in :class:`RunSession`; this class only drives it from the window's
+    flips and key presses and draws its state.
     """
 
-    def __init__(self, base_output_dir: Path, monitor_index: int = 0) -> None:
+    def __init__(
+        self,
+        base_output_dir: Path,
+        monitor_index: int = 0,
+        missed_frame_policy: MissedFramePolicy = "extend",
+        load_workers: Optional[int] = None,
+        load_progress: Optional[ProgressCallback] = None,
+        texture_packing: TexturePacking = "none",
+        atlas_size: int = 4096,
+        aspect_policy: AspectPolicy = "stretch",
+        prescale: bool = False,
+        prescale_cache_dir: Optional[Path] = None,
+        pixel_cache_dir: Optional[Path] = None,
+        pixel_cache_max_bytes: int = 8 * 1024**3,
+        texture_streaming: bool = False,
+        texture_budget_bytes: int = 2 * 1024**3,
+        prefetch_workers: Optional[int] = 2,
+        uploads_per_frame: int = 2,
+        event_fsync_policy: FsyncPolicy = "segment",
+        asset_index_path: Optional[Path] = None,
+    ) -> None:
+        if prescale and not prescale_available():
+            raise ValueError("prescale=True requires Pillow; install it or pass prescale=False.")
         self._base_output_dir = base_output_dir
         self._monitor_index = monitor_index
+        self._missed_frame_policy = missed_frame_policy
+        self._load_workers = load_workers
+        self._load_progress = load_progress
+        self._texture_packing = texture_packing
+        self._atlas_size = atlas_size
+        self._aspect_policy = aspect_policy
+        self._prescale = prescale
+        self._prescale_cache_dir = prescale_cache_dir
+        self._pixel_cache_dir = pixel_cache_dir
+        self._pixel_cache_max_bytes = pixel_cache_max_bytes
+        self._texture_streaming = texture_streaming
+        self._texture_budget_bytes = texture_budget_bytes
+        self._prefetch_workers = prefetch_workers
+        self._uploads_per_frame = uploads_per_frame
+        self._event_fsync_policy = event_fsync_policy
+        self._asset_index_path = asset_index_path
 
     def run_experiment(
         self,
@@ -40,6 +224,35 @@ class RealPresenter(Presenter):
         run_plan: RunPlan,
         n_fixation_changes: int,
         marker: MarkerBackend,
+    ) -> RunResult:
+        return self._present(experiment, participant_id, run_plan, n_fixation_changes, marker)
+
+    def resume_experiment(
+        self,
+        experiment: ExperimentModel,
+        checkpoint_file: Path,
+        marker: MarkerBackend,
+    ) -> RunResult:
+        """Continue a checkpointed run from its first unfinished segment."""
+
+        checkpoint = read_checkpoint(checkpoint_file)
+        return self._present(
+            experiment,
+            checkpoint.participant_id,
+            run_plan_from_checkpoint(checkpoint),
+            checkpoint.n_fixation_changes,
+            marker,
+            resume=checkpoint,
+        )
+
+    def _present(
+        self,
+        experiment: ExperimentModel,
+        participant_id: str,
+        run_plan: RunPlan,
+        n_fixation_changes: int,
+        marker: MarkerBackend,
+        resume: Optional[RunCheckpoint] = None,
     ) -> RunResult:
         self._base_output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -52,29 +265,30 @@ class RealPresenter(Presenter):
             )
 
         timing: TimingDerived = experiment.derive_timing(experiment.monitor_refresh_hz)
+        frame_synced_marker = marker if isinstance(marker, FrameSyncedMarkerBackend) else None
+        pacer = FramePacer(timing.frames_per_second, self._missed_frame_policy)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        prefix = f"{experiment.experiment_id}_{participant_id}_{timestamp}"
+        if resume is not None:
+            prefix = resume.log_prefix
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            prefix = f"{experiment.experiment_id}_{participant_id}_{timestamp}"
+        first_segment_index = resume.next_segment_index if resume is not None else 0
         event_log_path = self._base_output_dir / f"{prefix}_events.csv"
+        binary_event_log_path = self._base_output_dir / f"{prefix}_events{EVENT_LOG_SUFFIX}"
         summary_path = self._base_output_dir / f"{prefix}_summary.csv"
+        frame_timing_path = self._base_output_dir / f"{prefix}_frame_timing.csv"
+        frame_timing_summary_path = self._base_output_dir / f"{prefix}_frame_timing_summary.csv"
 
-        total_block_frames = 0
-        for segment in run_plan.segments:
-            if segment.segment_type == "BLOCK":
-                duration = segment.duration_seconds or experiment.block_duration_seconds
-                total_block_frames += int(duration * timing.frames_per_second)
+        total_block_frames = count_total_block_frames(run_plan, experiment, timing)
+        frame_timing = FrameTimingRecorder(total_block_frames, timing.frames_per_second)
 
         attention_required = experiment.attention_enabled and n_fixation_changes > 0
-        if attention_required and n_fixation_changes > total_block_frames:
-            raise ValueError("n_fixation_changes exceeds total block frames.")
-
-        if attention_required:
-            step = total_block_frames / (n_fixation_changes + 1)
-            change_frame_indices: Sequence[int] = [
-                int(round(step * (i + 1))) for i in range(n_fixation_changes)
-            ]
-        else:
-            change_frame_indices = []
+        change_frame_indices = (
+            planned_change_frames(run_plan, total_block_frames, n_fixation_changes)
+            if attention_required
+            else []
+        )
 
         def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
             hex_value = hex_color.lstrip("#")
@@ -84,88 +298,187 @@ class RealPresenter(Presenter):
 
         base_color_rgb = hex_to_rgb(experiment.fixation_base_color)
         target_color_rgb = hex_to_rgb(experiment.fixation_target_color)
-        fixation_is_target = False
-        current_fixation_color = base_color_rgb
-        block_frame_counter = 0
-        next_change_index = 0
-        reported_change_count: Optional[int] = None
-        confirmed = False
-        attention_input_digits = ""
-
-        base_textures_by_condition: dict[str, list[pyglet.image.AbstractImage]] = {}
-        oddball_textures_by_condition: dict[str, list[pyglet.image.AbstractImage]] = {}
-        allowed_extensions = {".png", ".jpg", ".jpeg", ".bmp"}
-        conditions_by_id = {condition.id: condition for condition in experiment.conditions}
-        for condition in experiment.conditions:
-            base_dir = Path(condition.base_image_dir)
-            if not base_dir.exists():
-                raise FileNotFoundError(f"Base image directory not found: {base_dir}")
-
-            images = [
-                path
-                for path in base_dir.iterdir()
-                if path.suffix.lower() in allowed_extensions and path.is_file()
-            ]
-            if not images:
-                raise ValueError(f"No base images found for condition {condition.id} in {base_dir}")
+        current_fixation_color = (
+            target_color_rgb
+            if resume is not None and resume.fixation_state == FIXATION_TARGET
+            else base_color_rgb
+        )
 
-            textures = [pyglet.image.load(str(path)) for path in sorted(images)]
-            base_textures_by_condition[condition.id] = textures
+        platform = pyglet.window.get_platform()
+        display = platform.get_default_display()
+        screens = display.get_screens()
+        screen_index = min(self._monitor_index, len(screens) - 1)
+        screen = screens[screen_index]
 
-            oddball_dir = Path(condition.oddball_image_dir)
-            if not oddball_dir.exists():
-                raise FileNotFoundError(f"Oddball image directory not found: {oddball_dir}")
+        decoder: Callable[[Path], DecodedImage] = decode_image
+        decode_params = "rgba"
+        if self._prescale:
+            decoder = partial(
+                prescale_image,
+                dst_width=screen.width,
+                dst_height=screen.height,
+                policy=self._aspect_policy,
+                cache_dir=self._prescale_cache_dir,
+            )
+            decode_params = f"rgba|{screen.width}x{screen.height}|{self._aspect_policy}"
+        pixel_cache = (
+            DecodedPixelCache(self._pixel_cache_dir, self._pixel_cache_max_bytes)
+            if self._pixel_cache_dir is not None
+            else None
+        )
 
-            oddball_images = [
-                path
-                for path in oddball_dir.iterdir()
-                if path.suffix.lower() in allowed_extensions and path.is_file()
-            ]
-            if not oddball_images:
-                raise ValueError(
-                    f"No oddball images found for condition {condition.id} in {oddball_dir}"
-                )
+        content_hashes: Optional[dict[Path, str]] = None
+        asset_index_hash = ""
+        if self._asset_index_path is not None:
+            asset_index = refresh_saved_asset_index(self._asset_index_path, experiment.conditions)
+            header_errors = asset_index.header_errors()
+            if header_errors:
+                raise ValueError(f"Unreadable stimulus images: {'; '.join(header_errors)}")
+            stimuli = indexed_condition_stimuli(experiment.conditions, asset_index)
+            content_hashes = asset_index.content_hashes()
+            asset_index_hash = asset_index.index_hash()
+        else:
+            stimuli = collect_condition_stimuli(experiment.conditions)
+        stimuli_by_condition = {condition.condition_id: condition for condition in stimuli}
+        decoded_by_condition = (
+            {}
+            if self._texture_streaming
+            else decode_condition_stimuli(
+                stimuli,
+                max_workers=self._load_workers,
+                progress=self._load_progress,
+                decoder=decoder,
+                pixel_cache=pixel_cache,
+                decode_params=decode_params,
+                content_hashes=content_hashes,
+            )
+        )
 
-            oddball_textures_by_condition[condition.id] = [
-                pyglet.image.load(str(path)) for path in sorted(oddball_images)
-            ]
+        block_schedules = compile_run_schedules(
+            experiment,
+            run_plan,
+            timing,
+            {
+                condition.condition_id: (len(condition.base_paths), len(condition.oddball_paths))
+                for condition in stimuli
+            },
+            change_frame_indices,
+        )
+        checkpointer = RunCheckpointer(
+            checkpoint_path(self._base_output_dir, prefix),
+            experiment.experiment_id,
+            participant_id,
+            prefix,
+            run_plan,
+            block_schedules,
+            n_fixation_changes,
+        )
+        if resume is not None:
+            checkpointer.verify(resume)
 
-        event_rows: list[str] = []
-
-        def log_event(
-            event_type: str,
-            segment: Optional[RunSegment] = None,
-            base_cycle_index: Optional[int] = None,
-            trigger_code: Optional[int] = None,
-            block_frame_index: Optional[int] = None,
-            fixation_state: Optional[str] = None,
-        ) -> None:
-            segment_type = segment.segment_type if segment else ""
-            condition_id = segment.condition_id if segment else ""
-            event_rows.append(
-                ",".join(
-                    [
-                        datetime.now().isoformat(timespec="milliseconds"),
-                        event_type,
-                        segment_type,
-                        condition_id or "",
-                        "" if base_cycle_index is None else str(base_cycle_index),
-                        "" if trigger_code is None else str(trigger_code),
-                        "" if block_frame_index is None else str(block_frame_index),
-                        fixation_state or "",
-                    ]
-                )
+        condition_ids = experiment_condition_ids(experiment)
+        condition_indices = {condition_id: index for index, condition_id in enumerate(condition_ids)}
+        events = EventBuffer(event_capacity(run_plan, block_schedules, len(condition_ids)))
+
+        def format_events(batch: EventBatch) -> list[str]:
+            return format_event_rows(
+                batch, events.anchor_wall, events.anchor_ns, run_plan.segments, condition_ids
             )
 
+        event_log: Optional[EventLogWriter] = None
+
+        def flush_events(then: Optional[Callable[[], None]] = None) -> None:
+            if event_log is not None:
+                event_log.submit(events.take(), then)
+
+        def segment_boundary() -> None:
+            # The checkpoint is written on the writer thread, after the segment's events.
+            flush_events(partial(checkpointer.write, session.next_segment_index))
+
         aborted = False
         abort_reason: Optional[str] = None
 
-        platform = pyglet.window.get_platform()
-        display = platform.get_default_display()
-        screens = display.get_screens()
-        screen_index = min(self._monitor_index, len(screens) - 1)
-        screen = screens[screen_index]
-        window = pyglet.window.Window(fullscreen=True, screen=screen)
+        window = pyglet.window.Window(fullscreen=True, screen=screen, vsync=True)
+
+        def place_textures(
+            textures: list[pyglet.image.AbstractImage],
+        ) -> tuple[list[pyglet.image.AbstractImage], list[FitGeometry]]:
+            placed = [
+                fit_texture(texture, window.width, window.height, self._aspect_policy)
+                for texture in textures
+            ]
+            return [texture for texture, _ in placed], [geometry for _, geometry in placed]
+
+        def upload_condition(
+            base_images: list[DecodedImage],
+            oddball_images: list[DecodedImage],
+        ) -> tuple[list[pyglet.image.AbstractImage], list[FitGeometry]]:
+            return place_textures(
+                upload_condition_textures(
+                    base_images,
+                    oddball_images,
+                    packing=self._texture_packing,
+                    atlas_size=self._atlas_size,
+                )
+            )
+
+        def upload_condition_steps(
+            base_images: list[DecodedImage],
+            oddball_images: list[DecodedImage],
+        ) -> Generator[None, None, tuple[list[pyglet.image.AbstractImage], list[FitGeometry]]]:
+            textures: list[pyglet.image.AbstractImage] = []
+            for texture in iter_condition_textures(
+                base_images,
+                oddball_images,
+                packing=self._texture_packing,
+                atlas_size=self._atlas_size,
+            ):
+                textures.append(texture)
+                yield
+            return place_textures(textures)
+
+        def decode_condition(condition_id: str) -> tuple[list[DecodedImage], list[DecodedImage]]:
+            return decode_condition_stimuli(
+                [stimuli_by_condition[condition_id]],
+                max_workers=self._prefetch_workers,
+                decoder=decoder,
+                pixel_cache=pixel_cache,
+                decode_params=decode_params,
+                content_hashes=content_hashes,
+            )[condition_id]
+
+        block_textures_by_condition: dict[str, list[pyglet.image.AbstractImage]] = {}
+        block_geometries_by_condition: dict[str, list[FitGeometry]] = {}
+        for condition_id, (base_images, oddball_images) in decoded_by_condition.items():
+            (
+                block_textures_by_condition[condition_id],
+                block_geometries_by_condition[condition_id],
+            ) = upload_condition(base_images, oddball_images)
+        decoded_by_condition.clear()
+
+        streamer: Optional[ConditionTextureStreamer] = None
+        first_textures: list[pyglet.image.AbstractImage] = next(
+            iter(block_textures_by_condition.values()), []
+        )
+        if self._texture_streaming:
+            streamer = ConditionTextureStreamer(
+                decode_condition, upload_condition_steps, self._texture_budget_bytes
+            )
+            first_condition = next_block_condition(run_plan, first_segment_index - 1)
+            if first_condition is not None:
+                (first_textures, _), _ = streamer.acquire(first_condition)
+                first_index = next(
+                    index
+                    for index, segment in enumerate(run_plan.segments)
+                    if index >= first_segment_index
+                    and segment.segment_type == "BLOCK"
+                    and segment.condition_id == first_condition
+                )
+                streamer.prefetch(next_block_condition(run_plan, first_index))
+
+        stimulus_sprite: Optional[pyglet.sprite.Sprite] = None
+        if self._texture_packing == "atlas" and first_textures:
+            stimulus_sprite = pyglet.sprite.Sprite(first_textures[0])
 
         instruction_label = pyglet.text.Label(
             experiment.instruction_text,
@@ -250,167 +563,86 @@ class RealPresenter(Presenter):
             ),
         ]
 
-        def update_fixation_color(rgb_color: tuple[int, int, int]) -> None:
+        def update_fixation_color(fixation_state: int) -> None:
+            rgb_color = target_color_rgb if fixation_state == FIXATION_TARGET else base_color_rgb
             for line in fixation_lines:
                 line.color = rgb_color
 
-        def refresh_attention_labels() -> None:
-            if running_state == "attention_confirm" and reported_change_count is not None:
-                attention_input_label.text = str(reported_change_count)
-                attention_confirm_label.text = (
-                    f"You entered {reported_change_count}. Press Y to confirm or N to edit."
-                )
-            else:
-                attention_input_label.text = attention_input_digits or " "
-                attention_confirm_label.text = "Press Enter to submit. Use Backspace to edit."
-
-        current_segment_index = 0
         current_texture: Optional[pyglet.image.AbstractImage] = None
-        block_frame_count = 0
-        target_block_frames = 0
-        block_base_textures: list[pyglet.image.AbstractImage] = []
-        block_oddball_textures: list[pyglet.image.AbstractImage] = []
-        base_cycle_frame = 0
-        base_cycle_index = 0
-        base_texture_index = 0
-        oddball_texture_index = 0
-        running_state = "instruction"
-        current_condition: Optional[str] = None
-        current_cycle_texture: Optional[pyglet.image.AbstractImage] = None
-
-        def start_next_segment() -> None:
-            nonlocal current_segment_index, block_frame_count, target_block_frames, block_base_textures, block_oddball_textures, running_state, base_cycle_frame, base_cycle_index, base_texture_index, oddball_texture_index, current_condition
-            if current_segment_index >= len(run_plan.segments):
-                finish_run()
-                return
-
-            segment = run_plan.segments[current_segment_index]
-            current_segment_index += 1
-
-            if segment.segment_type == "BLOCK" and segment.condition_id:
-                condition_id = segment.condition_id
-                if condition_id not in base_textures_by_condition or condition_id not in oddball_textures_by_condition:
-                    raise ValueError(f"Textures not loaded for condition {condition_id}")
-
-                block_base_textures = base_textures_by_condition[condition_id]
-                block_oddball_textures = oddball_textures_by_condition[condition_id]
-                block_frame_count = 0
-                target_seconds = segment.duration_seconds or experiment.block_duration_seconds
-                target_block_frames = int(target_seconds * timing.frames_per_second)
-                base_cycle_frame = 0
-                base_cycle_index = 0
-                base_texture_index = 0
-                oddball_texture_index = 0
-                current_condition = condition_id
-                running_state = "block"
-                marker.send(0)
-                log_event("block_start", segment)
-                pyglet.clock.schedule_interval(block_tick, 1 / timing.frames_per_second)
-            elif segment.segment_type == "REST" and segment.duration_seconds is not None:
-                running_state = "rest"
-                log_event("rest_start", segment)
-                pyglet.clock.schedule_once(lambda dt: end_rest(segment), segment.duration_seconds)
+        current_geometry: Optional[FitGeometry] = None
+        block_textures: list[pyglet.image.AbstractImage] = []
+        block_geometries: list[FitGeometry] = []
+
+        def start_block(segment_index: int, schedule: BlockSchedule) -> None:
+            nonlocal block_textures, block_geometries
+            if streamer is not None:
+                (block_textures, block_geometries), cold = streamer.acquire(schedule.condition_id)
+                if cold:
+                    session.log_event(LOG_PREFETCH_MISS, segment_index)
+                streamer.prefetch(next_block_condition(run_plan, segment_index))
             else:
-                log_event("segment_skipped", segment)
-                start_next_segment()
+                block_textures = block_textures_by_condition[schedule.condition_id]
+                block_geometries = block_geometries_by_condition[schedule.condition_id]
 
-        def block_tick(dt: float) -> None:
-            nonlocal block_frame_count, base_cycle_frame, base_cycle_index, current_cycle_texture, base_texture_index, oddball_texture_index, current_texture, fixation_is_target, current_fixation_color, next_change_index, block_frame_counter
-            if not block_base_textures or not current_condition:
+        def show_texture(texture_id: int) -> None:
+            nonlocal current_texture, current_geometry
+            if texture_id == NO_TEXTURE:
+                current_texture = None
+                current_geometry = None
                 return
-
-            segment = run_plan.segments[current_segment_index - 1]
-
-            if attention_required and next_change_index < len(change_frame_indices):
-                if block_frame_counter == change_frame_indices[next_change_index]:
-                    fixation_is_target = not fixation_is_target
-                    current_fixation_color = target_color_rgb if fixation_is_target else base_color_rgb
-                    update_fixation_color(current_fixation_color)
-                    log_event(
-                        "fixation_change",
-                        segment=segment,
-                        base_cycle_index=base_cycle_index,
-                        block_frame_index=block_frame_counter,
-                        fixation_state="target" if fixation_is_target else "base",
-                    )
-                    next_change_index += 1
-
-            if base_cycle_frame == 0:
-                is_oddball_cycle = (
-                    timing.oddball_every_n_base > 0
-                    and base_cycle_index % timing.oddball_every_n_base == timing.oddball_every_n_base - 1
-                )
-                condition = conditions_by_id[current_condition]
-                if is_oddball_cycle:
-                    current_cycle_texture = block_oddball_textures[
-                        oddball_texture_index % len(block_oddball_textures)
-                    ]
-                    oddball_texture_index += 1
-                    trigger_code = condition.trigger_code_oddball
-                    event_type = "oddball_onset"
-                else:
-                    current_cycle_texture = block_base_textures[
-                        base_texture_index % len(block_base_textures)
-                    ]
-                    base_texture_index += 1
-                    trigger_code = condition.trigger_code_base
-                    event_type = "base_onset"
-
-                marker.send(trigger_code)
-                log_event(
-                    event_type,
-                    segment=segment,
-                    base_cycle_index=base_cycle_index,
-                    trigger_code=trigger_code,
+            texture = current_texture = block_textures[texture_id]
+            geometry = current_geometry = block_geometries[texture_id]
+            if stimulus_sprite is not None:
+                stimulus_sprite.image = texture
+                stimulus_sprite.update(
+                    x=geometry.x,
+                    y=geometry.y,
+                    scale_x=geometry.width / texture.width,
+                    scale_y=geometry.height / texture.height,
                 )
 
-            if base_cycle_frame < timing.image_on_frames:
-                current_texture = current_cycle_texture
-            elif base_cycle_frame < timing.image_on_frames + timing.blank_frames:
-                current_texture = None
+        def refresh_attention_labels() -> None:
+            reported_change_count = session.reported_change_count
+            if session.state == "attention_confirm" and reported_change_count is not None:
+                attention_input_label.text = str(reported_change_count)
+                attention_confirm_label.text = (
+                    f"You entered {reported_change_count}. Press Y to confirm or N to edit."
+                )
             else:
-                current_texture = None
+                attention_input_label.text = session.attention_input_digits or " "
+                attention_confirm_label.text = "Press Enter to submit. Use Backspace to edit."
 
-            base_cycle_frame += 1
-            if base_cycle_frame >= timing.frames_per_base_cycle:
-                base_cycle_frame = 0
-                base_cycle_index += 1
-
-            block_frame_count += 1
-            block_frame_counter += 1
-            if block_frame_count >= target_block_frames:
-                end_block()
-
-        def end_block() -> None:
-            nonlocal running_state
-            pyglet.clock.unschedule(block_tick)
-            running_state = "transition"
-            segment = run_plan.segments[current_segment_index - 1]
-            log_event("block_end", segment)
-            marker.send(0)
-            start_next_segment()
-
-        def end_rest(segment: RunSegment) -> None:
-            log_event("rest_end", segment)
-            start_next_segment()
-
-        def finish_run() -> None:
-            nonlocal running_state
-            log_event("run_complete")
-            if attention_required:
-                running_state = "attention_input"
-                refresh_attention_labels()
-            else:
-                running_state = "complete"
+        session = RunSession(
+            run_plan,
+            block_schedules,
+            timing.frames_per_second,
+            marker,
+            events,
+            condition_ids,
+            attention_required,
+            on_block_start=start_block,
+            on_texture=show_texture,
+            on_fixation=update_fixation_color,
+            on_attention_input=refresh_attention_labels,
+            on_segment_boundary=segment_boundary,
+        )
 
         @window.event
         def on_draw() -> None:
             window.clear()
+            running_state = session.state
             if running_state == "instruction":
                 instruction_label.draw()
             elif running_state == "block":
-                if current_texture:
-                    current_texture.blit(0, 0, width=window.width, height=window.height)
+                if current_texture and stimulus_sprite is not None:
+                    stimulus_sprite.draw()
+                elif current_texture and current_geometry is not None:
+                    current_texture.blit(
+                        current_geometry.x,
+                        current_geometry.y,
+                        width=current_geometry.width,
+                        height=current_geometry.height,
+                    )
                 for line in fixation_lines:
                     line.draw()
             elif running_state == "rest":
@@ -424,67 +656,115 @@ class RealPresenter(Presenter):
 
         @window.event
         def on_key_press(symbol, modifiers):  # type: ignore[override]
-            nonlocal attention_input_digits, reported_change_count, confirmed, running_state
-            if running_state == "instruction":
-                running_state_transition_from_instruction()
-            elif running_state == "attention_input":
-                if symbol in {key.ENTER, key.RETURN}:
-                    if attention_input_digits:
-                        reported_change_count = int(attention_input_digits)
-                        running_state = "attention_confirm"
-                        refresh_attention_labels()
-                elif symbol == key.BACKSPACE:
-                    attention_input_digits = attention_input_digits[:-1]
-                    refresh_attention_labels()
-                elif key._0 <= symbol <= key._9:
-                    attention_input_digits = attention_input_digits + str(symbol - key._0)
-                    refresh_attention_labels()
-            elif running_state == "attention_confirm":
-                if symbol == key.Y and reported_change_count is not None:
-                    confirmed = True
-                    running_state = "complete"
-                elif symbol == key.N:
-                    reported_change_count = None
-                    attention_input_digits = ""
-                    running_state = "attention_input"
-                    refresh_attention_labels()
-            elif running_state == "complete":
-                pyglet.app.exit()
-
-        def running_state_transition_from_instruction() -> None:
-            nonlocal running_state
-            log_event("instruction_end")
-            running_state = "transition"
-            start_next_segment()
-
+            session.press_key(session_key_name(symbol))
+            if session.exit_requested:
+                window.has_exit = True
+
+        metadata = event_log_metadata(
+            experiment.experiment_id,
+            participant_id,
+            run_plan.segments,
+            condition_ids,
+            events.anchor_wall.isoformat(timespec="microseconds"),
+            events.anchor_ns,
+            monitor_refresh_hz=experiment.monitor_refresh_hz,
+            base_rate_hz=experiment.base_rate_hz,
+            oddball_rate_hz=experiment.oddball_rate_hz,
+            **asdict(timing),
+        )
+        binary_log = (
+            open_resumed_event_log(binary_event_log_path, metadata, first_segment_index)
+            if resume is not None
+            else EventLogSpool(binary_event_log_path, metadata)
+        )
+        event_log = EventLogWriter(
+            event_log_path,
+            EVENT_CSV_HEADER,
+            format_events,
+            self._event_fsync_policy,
+            append=resume is not None,
+            binary_log=binary_log,
+        )
         try:
-            log_event("instruction_start")
-            pyglet.app.run()
+            session.start(first_segment_index)
+            frames_to_advance = 1
+            while not window.has_exit:
+                tick_start_ns = time.perf_counter_ns()
+                window.dispatch_events()
+                if window.has_exit:
+                    break
+                session.advance_frame(frames_to_advance)
+                draw_start_ns = time.perf_counter_ns()
+                window.switch_to()
+                window.dispatch_event("on_draw")
+                draw_end_ns = time.perf_counter_ns()
+                window.flip()
+                flip_ns = time.perf_counter_ns()
+                frames_to_advance = pacer.on_flip(
+                    flip_ns, count_misses=session.state == "block"
+                )
+                if frame_synced_marker is not None:
+                    frame_synced_marker.on_frame(flip_ns)
+                if session.schedule is not None:
+                    frame_timing.record(
+                        session.segment_index,
+                        session.block_frame_index,
+                        tick_start_ns,
+                        draw_end_ns - draw_start_ns,
+                        flip_ns,
+                    )
+                if streamer is not None:
+                    for prefetched in streamer.poll():
+                        session.log_event(
+                            LOG_PREFETCH_COMPLETE,
+                            condition_index=condition_indices[prefetched.condition_id],
+                        )
+                    streamer.upload_step(self._uploads_per_frame)
         except Exception as exc:  # pragma: no cover - runtime safeguard
             aborted = True
             abort_reason = str(exc)
         finally:
-            if not window.has_exit:
-                window.close()
-
-        if aborted:
-            log_event("aborted")
-
-        header = "timestamp,event_type,segment_type,condition_id,base_cycle_index,trigger_code,block_frame_index,fixation_state\n"
-        event_log_path.write_text(header + "\n".join(event_rows))
+            if streamer is not None:
+                streamer.close()
+            window.close()
 
-        true_change_count = n_fixation_changes if experiment.attention_enabled else 0
-        correct = None
-        absolute_error = None
-        if experiment.attention_enabled and reported_change_count is not None:
-            correct = reported_change_count == n_fixation_changes
-            absolute_error = abs(reported_change_count - n_fixation_changes)
-
-        summary_lines = [
-            "participant_id,experiment_id,attention_enabled,n_fixation_changes,true_change_count,reported_change_count,correct,absolute_error,notes",
-            f"{participant_id},{experiment.experiment_id},{experiment.attention_enabled},{n_fixation_changes},{true_change_count},{'' if reported_change_count is None else reported_change_count},{'' if correct is None else correct},{'' if absolute_error is None else absolute_error},Phase7_real_presenter_fpvs_base_oddball=yes",
-        ]
-        summary_path.write_text("\n".join(summary_lines))
+        if not aborted and not session.finished:
+            # Escape or the close button mid-run: the interrupted segment runs again on resume.
+            aborted = True
+            abort_reason = "Window closed before the run completed."
+            session.log_event(LOG_ABORTED)
+            flush_events(partial(checkpointer.write, session.resume_segment_index))
+        elif aborted:
+            session.log_event(LOG_ABORTED)
+            flush_events()
+        else:
+            flush_events(partial(checkpointer.write, session.next_segment_index, complete=True))
+        event_log.close()
+
+        segment_conditions = {
+            index: schedule.condition_id
+            for index, schedule in enumerate(block_schedules)
+            if schedule is not None
+        }
+        frame_timing_summary = frame_timing.summarize(segment_conditions)
+        frame_timing.write_csv(frame_timing_path, segment_conditions)
+        write_frame_timing_summary(frame_timing_summary_path, frame_timing_summary, segment_conditions)
+
+        reported_change_count = session.reported_change_count
+        true_change_count, correct, absolute_error = score_attention(
+            experiment, n_fixation_changes, reported_change_count
+        )
+        write_run_summary(
+            summary_path,
+            participant_id,
+            experiment,
+            n_fixation_changes,
+            reported_change_count,
+            pacer.missed_refreshes,
+            "Phase7_real_presenter_fpvs_base_oddball=yes"
+            + (f";resumed_from_segment={first_segment_index}" if resume is not None else ""),
+            asset_index_hash,
+        )
 
         return RunResult(
             participant_id=participant_id,
@@ -495,9 +775,16 @@ class RealPresenter(Presenter):
             n_fixation_changes=n_fixation_changes,
             true_change_count=true_change_count,
             reported_change_count=reported_change_count,
-            confirmed=confirmed,
+            confirmed=session.confirmed,
             correct=correct,
             absolute_error=absolute_error,
             event_log_path=event_log_path,
             run_summary_path=summary_path,
+            binary_event_log_path=binary_event_log_path,
+            frame_timing_path=frame_timing_path,
+            frame_timing_summary_path=frame_timing_summary_path,
+            frame_interval_mean_ms=frame_timing_summary.run.interval_mean_ms,
+            frame_interval_sd_ms=frame_timing_summary.run.interval_sd_ms,
+            max_frame_lateness_ms=frame_timing_summary.run.max_lateness_ms,
+            dropped_frames=frame_timing_summary.run.dropped_frames,
         )
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable, Literal, Optional, Sequence
+
+from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.engine.event_buffer import (
+    LOG_BLOCK_END,
+    LOG_BLOCK_START,
+    LOG_FIXATION_CHANGE,
+    LOG_INSTRUCTION_END,
+    LOG_INSTRUCTION_START,
+    LOG_REST_END,
+    LOG_REST_START,
+    LOG_RESUMED,
+    LOG_RUN_COMPLETE,
+    LOG_SEGMENT_SKIPPED,
+    NO_VALUE,
+    ONSET_LOG_CODES,
+    EventBuffer,
+)
+from fpvs_studio.engine.frame_schedule import NO_TEXTURE, BlockSchedule
+from fpvs_studio.markers.base import MarkerBackend
+from fpvs_studio.models.experiment import ExperimentModel
+
+SessionState = Literal[
+    "instruction",
+    "transition",
+    "block",
+    "rest",
+    "attention_input",
+    "attention_confirm",
+    "complete",
+]
+
+# Abstract key names understood by RunSession.press_key. Digits are passed as
+# "0".."9"; any other name counts as "any key".
+KEY_ENTER = "enter"
+KEY_BACKSPACE = "backspace"
+KEY_YES = "y"
+KEY_NO = "n"
+KEY_ANY = "space"
+
+INPUT_STATES = frozenset({"instruction", "attention_input", "attention_confirm", "complete"})
+
+SUMMARY_CSV_HEADER = (
+    "participant_id,experiment_id,attention_enabled,n_fixation_changes,true_change_count,"
+    "reported_change_count,correct,absolute_error,missed_refreshes,notes,asset_index_hash"
+)
+
+
+def fixation_change_frames(total_block_frames: int, n_changes: int) -> list[int]:
+    """Spread ``n_changes`` fixation changes evenly over the run's block frames."""
+
+    if n_changes > total_block_frames:
+        raise ValueError("n_fixation_changes exceeds total block frames.")
+    step = total_block_frames / (n_changes + 1)
+    return [int(round(step * (i + 1))) for i in range(n_changes)]
+
+
+def planned_change_frames(
+    run_plan: RunPlan,
+    total_block_frames: int,
+    n_changes: int,
+) -> list[int]:
+    """Return the run plan's sampled change frames, or evenly spaced ones if none were drawn."""
+
+    if run_plan.fixation_change_frames is not None:
+        if len(run_plan.fixation_change_frames) != n_changes:
+            raise ValueError("Run plan fixation changes do not match n_fixation_changes.")
+        return list(run_plan.fixation_change_frames)
+    return fixation_change_frames(total_block_frames, n_changes)
+
+
+def event_capacity(
+    run_plan: RunPlan,
+    block_schedules: Sequence[Optional[BlockSchedule]],
+    n_conditions: int,
+) -> int:
+    """Return an upper bound on the events recorded between two segment boundaries.
+
+    Presenters flush their EventBuffer at every boundary, so it only needs
+    to hold the busiest block plus the segment and prefetch events around it.
+    """
+
+    block_events = max(
+        (
+            schedule.n_frames - schedule.event_types.count(0) + sum(schedule.fixation_changes)
+            for schedule in block_schedules
+            if schedule is not None
+        ),
+        default=0,
+    )
+    return 4 * len(run_plan.segments) + 2 * n_conditions + 8 + block_events
+
+
+def score_attention(
+    experiment: ExperimentModel,
+    n_fixation_changes: int,
+    reported_change_count: Optional[int],
+) -> tuple[int, Optional[bool], Optional[int]]:
+    """Return ``(true_change_count, correct, absolute_error)`` for a response."""
+
+    true_change_count = n_fixation_changes if experiment.attention_enabled else 0
+    if not experiment.attention_enabled or reported_change_count is None:
+        return true_change_count, None, None
+    return (
+        true_change_count,
+        reported_change_count == n_fixation_changes,
+        abs(reported_change_count - n_fixation_changes),
+    )
+
+
+def write_run_summary(
+    path: Path,
+    participant_id: str,
+    experiment: ExperimentModel,
+    n_fixation_changes: int,
+    reported_change_count: Optional[int],
+    missed_refreshes: int,
+    notes: str,
+    asset_index_hash: str = "",
+) -> None:
+    """Write the one-row ``_summary.csv`` shared by the frame-driven presenters.
+
+    ``asset_index_hash`` identifies the stimuli shown (see
+    :meth:`AssetIndex.index_hash`); it is empty when no index was used.
+    """
+
+    true_change_count, correct, absolute_error = score_attention(
+        experiment, n_fixation_changes, reported_change_count
+    )
+    row = [
+        participant_id,
+        experiment.experiment_id,
+        str(experiment.attention_enabled),
+        str(n_fixation_changes),
+        str(true_change_count),
+        "" if reported_change_count is None else str(reported_change_count),
+        "" if correct is None else str(correct),
+        "" if absolute_error is None else str(absolute_error),
+        str(missed_refreshes),
+        notes,
+        asset_index_hash,
+    ]
+    path.write_text("\n".join([SUMMARY_CSV_HEADER, ",".join(row)]))
+
+
+class RunSession:
+    """Frame-driven presentation state machine without any windowing code.
+
+    A driver calls :meth:`start`, then once per presented frame delivers
+    pending key presses through :meth:`press_key` and advances the session
+    with :meth:`advance_frame`, until :attr:`exit_requested` is set. Events
+    are recorded into ``events`` with timestamps from ``clock`` and triggers
+    are sent to ``marker``; everything visual is reported through the
+    optional callbacks:
+
+    - ``on_block_start(segment_index, schedule)`` before a block's first frame;
+    - ``on_texture(texture_id)`` when the stimulus changes (``NO_TEXTURE``
+      for a blank screen);
+    - ``on_fixation(fixation_state)`` when the fixation cross changes;
+    - ``on_attention_input()`` when the typed attention response changes;
+    - ``on_segment_boundary()`` before each segment starts and at run end.
+
+    A resumed run passes the first unfinished segment to :meth:`start`; the
+    instructions are shown again and presentation continues from there.
+    """
+
+    def __init__(
+        self,
+        run_plan: RunPlan,
+        block_schedules: Sequence[Optional[BlockSchedule]],
+        frames_per_second: int,
+        marker: MarkerBackend,
+        events: EventBuffer,
+        condition_ids: Sequence[str],
+        attention_required: bool,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        on_block_start: Optional[Callable[[int, BlockSchedule], None]] = None,
+        on_texture: Optional[Callable[[int], None]] = None,
+        on_fixation: Optional[Callable[[int], None]] = None,
+        on_attention_input: Optional[Callable[[], None]] = None,
+        on_segment_boundary: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._run_plan = run_plan
+        self._block_schedules = block_schedules
+        self._frames_per_second = frames_per_second
+        self._marker = marker
+        self._events = events
+        self._attention_required = attention_required
+        self._clock = clock
+        self._on_block_start = on_block_start
+        self._on_texture = on_texture
+        self._on_fixation = on_fixation
+        self._on_attention_input = on_attention_input
+        self._on_segment_boundary = on_segment_boundary
+
+        condition_indices = {condition_id: index for index, condition_id in enumerate(condition_ids)}
+        self._segment_condition_indices = [
+            condition_indices.get(segment.condition_id or "", NO_VALUE) for segment in run_plan.segments
+        ]
+
+        self.state: SessionState = "instruction"
+        self.exit_requested = False
+        self.schedule: Optional[BlockSchedule] = None
+        self.block_frame_index = -1
+        self.texture_id = NO_TEXTURE
+        self.attention_input_digits = ""
+        self.reported_change_count: Optional[int] = None
+        self.confirmed = False
+        self._next_segment_index = 0
+        self._rest_frame_index = -1
+        self._rest_total_frames = 0
+
+    @property
+    def segment_index(self) -> int:
+        """Index of the segment currently presented (``-1`` before the first)."""
+
+        return self._next_segment_index - 1
+
+    @property
+    def next_segment_index(self) -> int:
+        """Index of the first segment that has not started yet."""
+
+        return self._next_segment_index
+
+    @property
+    def resume_segment_index(self) -> int:
+        """First segment to present again if the run stops now.
+
+        A block or rest that is on screen is repeated from its start.
+        """
+
+        if self.state in {"block", "rest"}:
+            return self.segment_index
+        return self._next_segment_index
+
+    @property
+    def finished(self) -> bool:
+        """Whether every segment ran and the participant reached the end screen."""
+
+        return self.state == "complete" or self.exit_requested
+
+    @property
+    def awaiting_input(self) -> bool:
+        return self.state in INPUT_STATES
+
+    def log_event(
+        self,
+        event_code: int,
+        segment_index: int = NO_VALUE,
+        base_cycle_index: int = NO_VALUE,
+        trigger_code: int = NO_VALUE,
+        block_frame_index: int = NO_VALUE,
+        fixation_state: int = NO_VALUE,
+        condition_index: int = NO_VALUE,
+    ) -> None:
+        if condition_index == NO_VALUE and segment_index != NO_VALUE:
+            condition_index = self._segment_condition_indices[segment_index]
+        self._events.record(
+            event_code,
+            self._clock(),
+            segment_index,
+            condition_index,
+            base_cycle_index,
+            trigger_code,
+            block_frame_index,
+            fixation_state,
+        )
+
+    def start(self, first_segment_index: int = 0) -> None:
+        if not 0 <= first_segment_index <= len(self._run_plan.segments):
+            raise ValueError(f"Cannot start at segment {first_segment_index}.")
+        if first_segment_index:
+            self._next_segment_index = first_segment_index
+            in_plan = first_segment_index < len(self._run_plan.segments)
+            self.log_event(LOG_RESUMED, first_segment_index if in_plan else NO_VALUE)
+        self.log_event(LOG_INSTRUCTION_START)
+
+    def press_key(self, key_name: str) -> None:
+        """Handle one key press; see the ``KEY_*`` names."""
+
+        if self.state == "instruction":
+            self.log_event(LOG_INSTRUCTION_END)
+            self.state = "transition"
+            self._start_next_segment()
+        elif self.state == "attention_input":
+            if key_name == KEY_ENTER:
+                if self.attention_input_digits:
+                    self.reported_change_count = int(self.attention_input_digits)
+                    self.state = "attention_confirm"
+                    self._attention_input_changed()
+            elif key_name == KEY_BACKSPACE:
+                self.attention_input_digits = self.attention_input_digits[:-1]
+                self._attention_input_changed()
+            elif len(key_name) == 1 and key_name.isdigit():
+                self.attention_input_digits += key_name
+                self._attention_input_changed()
+        elif self.state == "attention_confirm":
+            if key_name == KEY_YES and self.reported_change_count is not None:
+                self.confirmed = True
+                self.state = "complete"
+            elif key_name == KEY_NO:
+                self.reported_change_count = None
+                self.attention_input_digits = ""
+                self.state = "attention_input"
+                self._attention_input_changed()
+        elif self.state == "complete":
+            self.exit_requested = True
+
+    def advance_frame(self, frames: int) -> None:
+        """Advance the active segment to the frame shown at the next flip."""
+
+        if self.state == "block":
+            self._advance_block(frames)
+        elif self.state == "rest":
+            self._advance_rest(frames)
+
+    def _attention_input_changed(self) -> None:
+        if self._on_attention_input is not None:
+            self._on_attention_input()
+
+    def _show_texture(self, texture_id: int) -> None:
+        if texture_id == self.texture_id:
+            return
+        self.texture_id = texture_id
+        if self._on_texture is not None:
+            self._on_texture(texture_id)
+
+    def _start_next_segment(self) -> None:
+        if self._on_segment_boundary is not None:
+            self._on_segment_boundary()
+        if self._next_segment_index >= len(self._run_plan.segments):
+            self._finish_run()
+            return
+
+        segment_index = self._next_segment_index
+        segment = self._run_plan.segments[segment_index]
+        schedule = self._block_schedules[segment_index]
+        self._next_segment_index += 1
+
+        if schedule is not None:
+            self.schedule = schedule
+            if self._on_block_start is not None:
+                self._on_block_start(segment_index, schedule)
+            self.block_frame_index = -1
+            self._show_texture(NO_TEXTURE)
+            self.state = "block"
+            self._marker.send(0)
+            self.log_event(LOG_BLOCK_START, segment_index)
+        elif segment.segment_type == "REST" and segment.duration_seconds is not None:
+            self._rest_frame_index = -1
+            self._rest_total_frames = int(segment.duration_seconds * self._frames_per_second)
+            self.state = "rest"
+            self.log_event(LOG_REST_START, segment_index)
+        else:
+            self.log_event(LOG_SEGMENT_SKIPPED, segment_index)
+            self._start_next_segment()
+
+    def _advance_block(self, frames: int) -> None:
+        schedule = self.schedule
+        if schedule is None:
+            return
+
+        # The first frame of a segment is always presented; later flips may
+        # skip frames under the catch-up policy, whose events still fire.
+        target_frame = 0 if self.block_frame_index < 0 else self.block_frame_index + frames
+        for frame in range(self.block_frame_index + 1, min(target_frame + 1, schedule.n_frames)):
+            self._run_block_frame(schedule, frame)
+
+        if target_frame >= schedule.n_frames:
+            self._end_block()
+            self.advance_frame(1)
+            return
+
+        self._show_texture(schedule.texture_ids[target_frame])
+        self.block_frame_index = target_frame
+
+    def _run_block_frame(self, schedule: BlockSchedule, frame: int) -> None:
+        if schedule.fixation_changes[frame]:
+            fixation_state = schedule.fixation_states[frame]
+            if self._on_fixation is not None:
+                self._on_fixation(fixation_state)
+            self.log_event(
+                LOG_FIXATION_CHANGE,
+                self.segment_index,
+                base_cycle_index=schedule.cycle_indices[frame],
+                block_frame_index=schedule.frame_offset + frame,
+                fixation_state=fixation_state,
+            )
+
+        event_type = schedule.event_types[frame]
+        if event_type:
+            trigger_code = schedule.trigger_codes[frame]
+            self._marker.send(trigger_code)
+            self.log_event(
+                ONSET_LOG_CODES[event_type],
+                self.segment_index,
+                base_cycle_index=schedule.cycle_indices[frame],
+                trigger_code=trigger_code,
+            )
+
+    def _advance_rest(self, frames: int) -> None:
+        self._rest_frame_index = 0 if self._rest_frame_index < 0 else self._rest_frame_index + frames
+        if self._rest_frame_index >= self._rest_total_frames:
+            self.log_event(LOG_REST_END, self.segment_index)
+            self._start_next_segment()
+            self.advance_frame(1)
+
+    def _end_block(self) -> None:
+        self.state = "transition"
+        self.schedule = None
+        self._show_texture(NO_TEXTURE)
+        self.log_event(LOG_BLOCK_END, self.segment_index)
+        self._marker.send(0)
+        self._start_next_segment()
+
+    def _finish_run(self) -> None:
+        self.log_event(LOG_RUN_COMPLETE)
+        if self._on_segment_boundary is not None:
+            self._on_segment_boundary()
+        if self._attention_required:
+            self.state = "attention_input"
+            self._attention_input_changed()
+        else:
+            self.state = "complete"
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, Optional, Sequence, Union
+
+from fpvs_studio.config.asset_index import IMAGE_EXTENSIONS, AssetIndex
+from fpvs_studio.models.condition import ConditionModel
+
+if TYPE_CHECKING:
+    import ctypes
+    from types import ModuleType
+
+    import pyglet
+
+    from fpvs_studio.engine.pixel_cache import DecodedPixelCache
+
+ALLOWED_EXTENSIONS = IMAGE_EXTENSIONS
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class DecodedImage:
+    """CPU-side RGBA pixels for one stimulus, ready for texture upload.
+
+    Rows are stored bottom-up with a pitch of ``width * 4`` bytes, which is
+    the layout pyglet expects for ``ImageData``. ``data`` is either bytes or
+    a ctypes view over a memory-mapped cache entry.
+    """
+
+    path: Path
+    width: int
+    height: int
+    data: Union[bytes, "ctypes.Array[ctypes.c_ubyte]"]
+
+
+@dataclass
+class ConditionStimuli:
+    """Sorted stimulus file lists for one condition."""
+
+    condition_id: str
+    base_paths: list[Path]
+    oddball_paths: list[Path]
+
+
+def list_stimulus_files(directory: Path) -> list[Path]:
+    """Return the image files in ``directory`` in deterministic sorted order."""
+
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.suffix.lower() in ALLOWED_EXTENSIONS and path.is_file()
+    )
+
+
+def collect_condition_stimuli(conditions: Iterable[ConditionModel]) -> list[ConditionStimuli]:
+    """Scan the base and oddball directories of every condition.
+
+    Raises:
+        FileNotFoundError: if a stimulus directory does not exist.
+        ValueError: if a stimulus directory contains no images.
+    """
+
+    stimuli: list[ConditionStimuli] = []
+    for condition in conditions:
+        base_dir = Path(condition.base_image_dir)
+        if not base_dir.exists():
+            raise FileNotFoundError(f"Base image directory not found: {base_dir}")
+        base_paths = list_stimulus_files(base_dir)
+        if not base_paths:
+            raise ValueError(f"No base images found for condition {condition.id} in {base_dir}")
+
+        oddball_dir = Path(condition.oddball_image_dir)
+        if not oddball_dir.exists():
+            raise FileNotFoundError(f"Oddball image directory not found: {oddball_dir}")
+        oddball_paths = list_stimulus_files(oddball_dir)
+        if not oddball_paths:
+            raise ValueError(
+                f"No oddball images found for condition {condition.id} in {oddball_dir}"
+            )
+
+        stimuli.append(ConditionStimuli(condition.id, base_paths, oddball_paths))
+    return stimuli
+
+
+def indexed_condition_stimuli(
+    conditions: Iterable[ConditionModel],
+    asset_index: AssetIndex,
+) -> list[ConditionStimuli]:
+    """Return the file lists recorded in an asset index, without touching the disk."""
+
+    return [
+        ConditionStimuli(condition.id, *asset_index.condition_paths(condition.id))
+        for condition in conditions
+    ]
+
+
+def import_pyglet_headless() -> "ModuleType":
+    """Import pyglet for image decoding without opening its hidden shadow window.
+
+    pyglet creates a shadow GL window when ``pyglet.window`` is first
+    imported (image codecs import it), which fails on machines without a
+    display (``NoSuchDisplayException``) and costs a window per pool worker.
+    If the window module is not loaded yet in this process, it is loaded
+    without one; a presenter that already imported it keeps its context.
+    """
+
+    import pyglet
+
+    if "pyglet.window" not in sys.modules:
+        pyglet.options["shadow_window"] = False
+    return pyglet
+
+
+def expand_to_rgba(data: bytes, pixel_format: str, n_pixels: int) -> Optional[bytes]:
+    """Interleave packed ``RGB``/``BGR``/``L`` (optionally with ``A``) pixels as RGBA.
+
+    Missing alpha becomes 255 and ``L`` fills all three color channels.
+    Strided slice copies take milliseconds per image, where pyglet's own
+    ``get_data("RGBA")`` conversion takes most of a second and fills a
+    missing alpha channel from red. Returns None for other formats.
+    """
+
+    offsets = {channel: index for index, channel in enumerate(pixel_format)}
+    step = len(pixel_format)
+    if (
+        len(offsets) != step
+        or not set(offsets) <= set("RGBAL")
+        or not (set("RGB") <= set(offsets) or "L" in offsets)
+    ):
+        return None
+    if pixel_format == "RGBA":
+        return bytes(data)
+    rgba = bytearray(n_pixels * 4)
+    for index, channel in enumerate("RGBA"):
+        if channel in offsets:
+            rgba[index::4] = data[offsets[channel] :: step]
+        elif channel == "A":
+            rgba[index::4] = b"\xff" * n_pixels
+        else:
+            rgba[index::4] = data[offsets["L"] :: step]
+    return bytes(rgba)
+
+
+def rgba_pixels(image: "pyglet.image.ImageData") -> bytes:
+    """Return a decoded pyglet image's pixels as RGBA rows (see :func:`expand_to_rgba`)."""
+
+    pixel_format = image.format
+    data = expand_to_rgba(
+        image.get_data(pixel_format, image.width * len(pixel_format)),
+        pixel_format,
+        image.width * image.height,
+    )
+    if data is None:
+        data = image.get_data("RGBA", image.width * 4)
+    return data
+
+
+def decode_image(path: Path) -> DecodedImage:
+    """Decode one image file to RGBA pixels without touching OpenGL."""
+
+    pyglet = import_pyglet_headless()
+
+    image = pyglet.image.load(str(path)).get_image_data()
+    return DecodedImage(path=path, width=image.width, height=image.height, data=rgba_pixels(image))
+
+
+def decode_images(
+    paths: Sequence[Path],
+    max_workers: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    decoder: Callable[[Path], DecodedImage] = decode_image,
+) -> list[DecodedImage]:
+    """Decode images on a process pool, returning them in input order.
+
+    ``max_workers`` defaults to the number of CPUs; ``max_workers=1`` decodes
+    serially in the calling process, which is also the default on a
+    single-CPU machine, where a pool only adds the cost of shipping pixels
+    between processes. ``progress`` is called on the calling thread with
+    ``(n_done, n_total)`` after each image. ``decoder`` must be a picklable
+    module-level function.
+    """
+
+    total = len(paths)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1 or total <= 1:
+        decoded: list[DecodedImage] = []
+        for path in paths:
+            decoded.append(decoder(path))
+            if progress:
+                progress(len(decoded), total)
+        return decoded
+
+    results: list[Optional[DecodedImage]] = [None] * total
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(decoder, path): index for index, path in enumerate(paths)}
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(n_done, total)
+    return results  # type: ignore[return-value]
+
+
+def decode_condition_stimuli(
+    stimuli: Sequence[ConditionStimuli],
+    max_workers: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    decoder: Callable[[Path], DecodedImage] = decode_image,
+    pixel_cache: Optional["DecodedPixelCache"] = None,
+    decode_params: str = "rgba",
+    content_hashes: Optional[Mapping[Path, str]] = None,
+) -> dict[str, tuple[list[DecodedImage], list[DecodedImage]]]:
+    """Decode every condition's stimuli in a single pool.
+
+    Returns a mapping of condition id to ``(base_images, oddball_images)``,
+    each in the same sorted order as the scanned file lists. ``decoder`` is
+    forwarded to :func:`decode_images`. When ``pixel_cache`` is given, cached
+    pixels are memory-mapped and only the misses are decoded; see
+    :meth:`DecodedPixelCache.load_images` for ``decode_params`` and
+    ``content_hashes``.
+    """
+
+    paths: list[Path] = []
+    for condition in stimuli:
+        paths.extend(condition.base_paths)
+        paths.extend(condition.oddball_paths)
+
+    if pixel_cache is not None:
+        decoded = pixel_cache.load_images(
+            paths,
+            decode_params=decode_params,
+            decoder=decoder,
+            max_workers=max_workers,
+            progress=progress,
+            content_hashes=content_hashes,
+        )
+    else:
+        decoded = decode_images(paths, max_workers=max_workers, progress=progress, decoder=decoder)
+
+    by_condition: dict[str, tuple[list[DecodedImage], list[DecodedImage]]] = {}
+    cursor = 0
+    for condition in stimuli:
+        n_base = len(condition.base_paths)
+        n_oddball = len(condition.oddball_paths)
+        base_images = decoded[cursor : cursor + n_base]
+        oddball_images = decoded[cursor + n_base : cursor + n_base + n_oddball]
+        by_condition[condition.condition_id] = (base_images, oddball_images)
+        cursor += n_base + n_oddball
+    return by_condition
+
+
+def upload_textures(images: Iterable[DecodedImage]) -> list["pyglet.image.Texture"]:
+    """Create GL textures for decoded images; must run on the GL thread."""
+
+    import pyglet
+
+    return [
+        pyglet.image.ImageData(image.width, image.height, "RGBA", image.data).get_texture()
+        for image in images
+    ]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Literal, Optional, Sequence, Union
+
+from fpvs_studio.engine.stimulus_loading import DecodedImage, upload_textures
+
+if TYPE_CHECKING:
+    import ctypes
+
+    import pyglet
+
+TexturePacking = Literal["none", "atlas"]
+
+TEXTURE_PACKING_MODES: tuple[str, ...] = ("none", "atlas")
+
+
+@dataclass(frozen=True)
+class AtlasSlot:
+    """Where one image sits in an atlas: atlas number and the image's own rectangle.
+
+    ``x`` and ``y`` are the bottom-left pixel of the image itself; the
+    border around it lies outside this rectangle.
+    """
+
+    atlas: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def plan_atlas_layout(
+    sizes: Sequence[tuple[int, int]],
+    atlas_size: int,
+    border: int = 1,
+) -> list[Optional[AtlasSlot]]:
+    """Assign each ``(width, height)`` a slot, by index, on square shelf-packed atlases.
+
+    Images are placed in order, left to right on shelves as tall as their
+    tallest image; a full row opens a new shelf and a full atlas a new
+    atlas. Each slot reserves ``border`` pixels on every side. Images that
+    do not fit an empty atlas get ``None`` and are uploaded on their own.
+    """
+
+    if border < 0:
+        raise ValueError("Atlas border cannot be negative.")
+    slots: list[Optional[AtlasSlot]] = []
+    atlas = x = shelf_y = shelf_height = 0
+    for width, height in sizes:
+        cell_width = width + 2 * border
+        cell_height = height + 2 * border
+        if cell_width > atlas_size or cell_height > atlas_size:
+            slots.append(None)
+            continue
+        if x + cell_width > atlas_size:
+            x, shelf_y, shelf_height = 0, shelf_y + shelf_height, 0
+        if shelf_y + cell_height > atlas_size:
+            atlas, x, shelf_y, shelf_height = atlas + 1, 0, 0, 0
+        slots.append(AtlasSlot(atlas, x + border, shelf_y + border, width, height))
+        x += cell_width
+        shelf_height = max(shelf_height, cell_height)
+    return slots
+
+
+def extrude_border(
+    data: Union[bytes, "ctypes.Array[ctypes.c_ubyte]"],
+    width: int,
+    height: int,
+    border: int,
+) -> bytes:
+    """Return RGBA pixels padded by ``border`` copies of their edge pixels.
+
+    Filled this way, the gutter around an atlas region has the region's own
+    edge colors, so linear filtering at the edge never samples a neighbor.
+    """
+
+    pixels = bytes(data)
+    row_bytes = width * 4
+    rows = []
+    for start in range(0, row_bytes * height, row_bytes):
+        row = pixels[start : start + row_bytes]
+        rows.append(row[:4] * border + row + row[-4:] * border)
+    return b"".join([rows[0]] * border + rows + [rows[-1]] * border)
+
+
+def iter_pack_textures(
+    images: Sequence[DecodedImage],
+    atlas_size: int = 4096,
+    border: int = 1,
+) -> Iterator["pyglet.image.AbstractImage"]:
+    """Upload images into shared texture atlases one at a time, yielding each region.
+
+    Images are laid out by :func:`plan_atlas_layout`, so the regions share
+    a small number of GL textures and switching between them only changes
+    texture coordinates. Each region is surrounded by ``border`` pixels of
+    its own extruded edge (see :func:`extrude_border`), so scaled or
+    linearly filtered stimuli do not bleed into each other. Images larger
+    than the atlas (clamped to the GL maximum texture size) fall back to
+    their own texture. Must run on the GL thread.
+    """
+
+    import pyglet
+
+    atlas_size = min(atlas_size, pyglet.image.get_max_texture_size())
+    slots = plan_atlas_layout([(image.width, image.height) for image in images], atlas_size, border)
+    atlases: dict[int, pyglet.image.Texture] = {}
+    for image, slot in zip(images, slots):
+        if slot is None:
+            yield from upload_textures([image])
+            continue
+        texture = atlases.get(slot.atlas)
+        if texture is None:
+            texture = atlases[slot.atlas] = pyglet.image.Texture.create(atlas_size, atlas_size)
+        padded = pyglet.image.ImageData(
+            image.width + 2 * border,
+            image.height + 2 * border,
+            "RGBA",
+            extrude_border(image.data, image.width, image.height, border),
+        )
+        texture.blit_into(padded, slot.x - border, slot.y - border, 0)
+        yield texture.get_region(slot.x, slot.y, slot.width, slot.height)
+
+
+def pack_textures(
+    images: Sequence[DecodedImage],
+    atlas_size: int = 4096,
+    border: int = 1,
+) -> list["pyglet.image.AbstractImage"]:
+    """Upload images into shared texture atlases; see :func:`iter_pack_textures`."""
+
+    return list(iter_pack_textures(images, atlas_size, border))
+
+
+def iter_condition_textures(
+    base_images: Sequence[DecodedImage],
+    oddball_images: Sequence[DecodedImage],
+    packing: TexturePacking = "none",
+    atlas_size: int = 4096,
+) -> Iterator["pyglet.image.AbstractImage"]:
+    """Upload a condition's block textures one image per step (base, then oddballs).
+
+    Lets a caller spread a condition's upload over several frames; see
+    :func:`upload_condition_textures` for the packing modes.
+    """
+
+    if packing == "atlas":
+        return iter_pack_textures([*base_images, *oddball_images], atlas_size)
+    if packing == "none":
+        images = [*base_images, *oddball_images]
+        return (texture for image in images for texture in upload_textures([image]))
+    raise ValueError(f"Unknown texture packing mode: {packing}")
+
+
+def upload_condition_textures(
+    base_images: Sequence[DecodedImage],
+    oddball_images: Sequence[DecodedImage],
+    packing: TexturePacking = "none",
+    atlas_size: int = 4096,
+) -> list["pyglet.image.AbstractImage"]:
+    """Upload a condition's block texture list (base textures, then oddballs).
+
+    With ``packing="atlas"`` the condition's base and oddball images share
+    one set of atlases; with ``"none"`` each image gets its own texture.
+    """
+
+    return list(iter_condition_textures(base_images, oddball_images, packing, atlas_size))
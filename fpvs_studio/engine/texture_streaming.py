@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Generator, Generic, Iterable, Optional, TypeVar
+
+from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.engine.stimulus_loading import DecodedImage
+
+UploadedT = TypeVar("UploadedT")
+
+DecodeFn = Callable[[str], tuple[list[DecodedImage], list[DecodedImage]]]
+
+# Uploads one image per step and returns the uploaded condition when exhausted.
+UploadFn = Callable[[list[DecodedImage], list[DecodedImage]], Generator[None, None, UploadedT]]
+
+
+@dataclass
+class PrefetchResult:
+    """A background decode that finished, with its completion time."""
+
+    condition_id: str
+    completed_ns: int
+
+
+@dataclass
+class _Resident(Generic[UploadedT]):
+    uploaded: UploadedT
+    n_bytes: int
+
+
+@dataclass
+class _Upload(Generic[UploadedT]):
+    condition_id: str
+    steps: Generator[None, None, UploadedT]
+    n_bytes: int
+
+
+def texture_bytes(images: Iterable[DecodedImage]) -> int:
+    """Estimate the GPU memory used by RGBA textures for ``images``."""
+
+    return sum(image.width * image.height * 4 for image in images)
+
+
+def next_block_condition(run_plan: RunPlan, after_segment_index: int) -> Optional[str]:
+    """Return the condition of the first BLOCK after ``after_segment_index``."""
+
+    for segment in run_plan.segments[after_segment_index + 1 :]:
+        if segment.segment_type == "BLOCK" and segment.condition_id:
+            return segment.condition_id
+    return None
+
+
+class ConditionTextureStreamer(Generic[UploadedT]):
+    """Keeps only the conditions a run needs next resident on the GPU.
+
+    Decoding runs on a background thread (``decode`` may itself use a
+    process pool); ``upload`` runs on the caller's thread, which must own the
+    GL context, one image per step so :meth:`upload_step` can spread a
+    condition over several frames. Uploaded conditions are kept in
+    least-recently-used order and evicted once their estimated texture
+    memory exceeds ``budget_bytes``; the most recently uploaded condition is
+    never evicted.
+    """
+
+    def __init__(
+        self,
+        decode: DecodeFn,
+        upload: UploadFn[UploadedT],
+        budget_bytes: int,
+    ) -> None:
+        self._decode = decode
+        self._upload = upload
+        self.budget_bytes = budget_bytes
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fpvs-prefetch")
+        self._pending: dict[str, Future[tuple[list[DecodedImage], list[DecodedImage], int]]] = {}
+        self._reported: set[str] = set()
+        self._uploading: Optional[_Upload[UploadedT]] = None
+        self._resident: OrderedDict[str, _Resident[UploadedT]] = OrderedDict()
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(entry.n_bytes for entry in self._resident.values())
+
+    def is_resident(self, condition_id: str) -> bool:
+        return condition_id in self._resident
+
+    def _decode_timed(self, condition_id: str) -> tuple[list[DecodedImage], list[DecodedImage], int]:
+        base_images, oddball_images = self._decode(condition_id)
+        return base_images, oddball_images, time.perf_counter_ns()
+
+    def prefetch(self, condition_id: Optional[str]) -> None:
+        """Start decoding a condition in the background if it is not loaded."""
+
+        if (
+            condition_id is None
+            or condition_id in self._resident
+            or condition_id in self._pending
+            or (self._uploading is not None and self._uploading.condition_id == condition_id)
+        ):
+            return
+        self._pending[condition_id] = self._executor.submit(self._decode_timed, condition_id)
+
+    def poll(self) -> list[PrefetchResult]:
+        """Return prefetches that completed since the last call.
+
+        Cheap enough to call once per frame: it only checks pending futures.
+        """
+
+        completed: list[PrefetchResult] = []
+        for condition_id, future in self._pending.items():
+            if condition_id not in self._reported and future.done():
+                self._reported.add(condition_id)
+                completed_ns = future.result()[2] if future.exception() is None else time.perf_counter_ns()
+                completed.append(PrefetchResult(condition_id, completed_ns))
+        return completed
+
+    def _begin_upload(
+        self, condition_id: str, base_images: list[DecodedImage], oddball_images: list[DecodedImage]
+    ) -> _Upload[UploadedT]:
+        return _Upload(
+            condition_id,
+            self._upload(base_images, oddball_images),
+            texture_bytes([*base_images, *oddball_images]),
+        )
+
+    def _begin_next_upload(self) -> Optional[_Upload[UploadedT]]:
+        for condition_id, future in list(self._pending.items()):
+            if future.done():
+                del self._pending[condition_id]
+                self._reported.discard(condition_id)
+                base_images, oddball_images, _ = future.result()
+                self._uploading = self._begin_upload(condition_id, base_images, oddball_images)
+                return self._uploading
+        return None
+
+    def _store(self, upload: _Upload[UploadedT], uploaded: UploadedT) -> UploadedT:
+        if self._uploading is upload:
+            self._uploading = None
+        self._resident[upload.condition_id] = _Resident(uploaded, upload.n_bytes)
+        self.evict(keep={upload.condition_id})
+        return uploaded
+
+    def _finish_upload(self, upload: _Upload[UploadedT]) -> UploadedT:
+        while True:
+            try:
+                next(upload.steps)
+            except StopIteration as stop:
+                return self._store(upload, stop.value)
+
+    def upload_step(self, max_images: int) -> list[str]:
+        """Upload up to ``max_images`` images of finished prefetches.
+
+        Call once per frame from the GL thread; returns the conditions that
+        became resident.
+        """
+
+        uploaded: list[str] = []
+        remaining = max_images
+        while remaining > 0:
+            upload = self._uploading or self._begin_next_upload()
+            if upload is None:
+                break
+            try:
+                next(upload.steps)
+                remaining -= 1
+            except StopIteration as stop:
+                self._store(upload, stop.value)
+                uploaded.append(upload.condition_id)
+        return uploaded
+
+    def upload_ready(self) -> list[str]:
+        """Upload every finished prefetch at once; call from the GL thread."""
+
+        return self.upload_step(sys.maxsize)
+
+    def acquire(self, condition_id: str) -> tuple[UploadedT, bool]:
+        """Return the uploaded textures for a condition and whether it was cold.
+
+        A condition is cold when it was not fully uploaded by the time it
+        was needed, so the caller had to wait for the rest of its decode or
+        upload.
+        """
+
+        if condition_id in self._resident:
+            self._resident.move_to_end(condition_id)
+            return self._resident[condition_id].uploaded, False
+
+        upload = self._uploading
+        if upload is None or upload.condition_id != condition_id:
+            future = self._pending.pop(condition_id, None)
+            self._reported.discard(condition_id)
+            if future is None:
+                base_images, oddball_images, _ = self._decode_timed(condition_id)
+            else:
+                base_images, oddball_images, _ = future.result()
+            upload = self._begin_upload(condition_id, base_images, oddball_images)
+        return self._finish_upload(upload), True
+
+    def evict(self, keep: Iterable[str] = ()) -> list[str]:
+        """Drop least recently used conditions until within the budget."""
+
+        keep_set = set(keep)
+        evicted: list[str] = []
+        total = self.resident_bytes
+        for condition_id in list(self._resident):
+            if total <= self.budget_bytes:
+                break
+            if condition_id in keep_set:
+                continue
+            total -= self._resident.pop(condition_id).n_bytes
+            evicted.append(condition_id)
+        return evicted
+
+    def close(self) -> None:
+        """Stop the background thread and release every resident condition."""
+
+        for future in self._pending.values():
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        if self._uploading is not None:
+            self._uploading.steps.close()
+            self._uploading = None
+        self._pending.clear()
+        self._resident.clear()
@@ -1,6 +1,17 @@
 """Marker backends for communicating experiment events."""
 
-from .base import MarkerBackend
+from .async_marker import AsyncMarkerBackend, MarkerLatencyStats
+from .base import FrameSyncedMarkerBackend, MarkerBackend
+from .network_marker import NetworkMarkerBackend
 from .null_marker import NullMarkerBackend
+from .pulse_marker import PulseMarkerBackend
 
-__all__ = ["MarkerBackend", "NullMarkerBackend"]
+__all__ = [
+    "AsyncMarkerBackend",
+    "FrameSyncedMarkerBackend",
+    "MarkerBackend",
+    "MarkerLatencyStats",
+    "NetworkMarkerBackend",
+    "NullMarkerBackend",
+    "PulseMarkerBackend",
+]
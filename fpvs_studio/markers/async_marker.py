@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from .base import FrameSyncedMarkerBackend, MarkerBackend
+
+_STOP = object()
+_FRAME = object()
+
+
+@dataclass
+class MarkerLatencyStats:
+    """Distribution of request-to-send latency for dispatched markers."""
+
+    n_sends: int = 0
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+
+
+def _percentile(sorted_values: list[int], fraction: float) -> int:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class AsyncMarkerBackend(MarkerBackend):
+    """Wraps a marker backend so sends never block the calling thread.
+
+    :meth:`send` appends ``(code, request_ns)`` to a deque, whose appends and
+    pops are atomic without a lock, and wakes a dedicated dispatcher thread
+    that performs the wrapped backend's ``send``. For every dispatched code
+    the request and actual send times (``clock`` values, default
+    ``time.perf_counter_ns``) are recorded, and :meth:`latency_stats`
+    summarizes the difference. :meth:`close` dispatches everything still
+    queued before closing the wrapped backend.
+
+    :meth:`on_frame` is forwarded to frame-synced backends (such as
+    :class:`~fpvs_studio.markers.pulse_marker.PulseMarkerBackend`) through
+    the same queue, so they run on the dispatcher thread and clock.
+    """
+
+    def __init__(
+        self,
+        backend: MarkerBackend,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        self.backend = backend
+        self._clock = clock
+        self._queue: deque[object] = deque()
+        self._wakeup = threading.Event()
+        self.codes = array("i")
+        self.request_ns = array("q")
+        self.sent_ns = array("q")
+        self.error: Optional[BaseException] = None
+        self._closed = False
+        self._forwards_frames = isinstance(backend, FrameSyncedMarkerBackend)
+        self._thread = threading.Thread(target=self._dispatch, name="fpvs-marker-dispatch", daemon=True)
+        self._thread.start()
+
+    def send(self, code: int, request_ns: Optional[int] = None) -> None:
+        """Queue a code; ``request_ns`` defaults to the current clock value."""
+
+        if self._closed:
+            raise RuntimeError("AsyncMarkerBackend is closed.")
+        self._queue.append((code, self._clock() if request_ns is None else request_ns))
+        self._wakeup.set()
+
+    def on_frame(self, now_ns: Optional[int] = None) -> None:
+        """Queue a frame boundary for a frame-synced wrapped backend."""
+
+        if self._forwards_frames and not self._closed:
+            self._queue.append(_FRAME)
+            self._wakeup.set()
+
+    def _dispatch(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                item = self._queue.popleft()
+                if item is _STOP:
+                    return
+                if item is _FRAME:
+                    try:
+                        self.backend.on_frame()  # type: ignore[attr-defined]
+                    except Exception as exc:  # pragma: no cover - surfaced through .error
+                        if self.error is None:
+                            self.error = exc
+                    continue
+                code, request_ns = item  # type: ignore[misc]
+                try:
+                    self.backend.send(code)
+                except Exception as exc:  # pragma: no cover - surfaced through .error
+                    if self.error is None:
+                        self.error = exc
+                    continue
+                sent_ns = self._clock()
+                self.codes.append(code)
+                self.request_ns.append(request_ns)
+                self.sent_ns.append(sent_ns)
+
+    def close(self) -> None:
+        """Flush the queue, stop the dispatcher and close the wrapped backend."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.append(_STOP)
+        self._wakeup.set()
+        self._thread.join()
+        self.backend.close()
+
+    def latency_stats(self) -> MarkerLatencyStats:
+        """Summarize request-to-send latency; call after :meth:`close` for a full run."""
+
+        latencies = sorted(sent - requested for sent, requested in zip(self.sent_ns, self.request_ns))
+        if not latencies:
+            return MarkerLatencyStats()
+        return MarkerLatencyStats(
+            n_sends=len(latencies),
+            mean_ms=sum(latencies) / len(latencies) / 1_000_000,
+            p50_ms=_percentile(latencies, 0.50) / 1_000_000,
+            p95_ms=_percentile(latencies, 0.95) / 1_000_000,
+            p99_ms=_percentile(latencies, 0.99) / 1_000_000,
+            max_ms=latencies[-1] / 1_000_000,
+        )
+
+    def write_csv(self, path: Path) -> None:
+        """Write one row per dispatched code with its request and send times."""
+
+        lines = ["code,request_ns,sent_ns,latency_ns"]
+        for code, requested, sent in zip(self.codes, self.request_ns, self.sent_ns):
+            lines.append(f"{code},{requested},{sent},{sent - requested}")
+        path.write_text("\n".join(lines))
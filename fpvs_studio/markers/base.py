@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Optional, Protocol, runtime_checkable
 
 
 class MarkerBackend(Protocol):
@@ -11,3 +11,11 @@ class MarkerBackend(Protocol):
 
     def close(self) -> None:
         """Clean up resources associated with the backend."""
+
+
+@runtime_checkable
+class FrameSyncedMarkerBackend(MarkerBackend, Protocol):
+    """Marker backend that needs a callback at every presented frame."""
+
+    def on_frame(self, now_ns: Optional[int] = None) -> None:
+        """Handle a frame boundary; ``now_ns`` is the flip time if known."""
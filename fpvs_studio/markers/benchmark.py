@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from fpvs_studio.controllers.scheduling import RunPlan
+from fpvs_studio.engine.frame_schedule import compile_run_schedules
+from fpvs_studio.models.experiment import ExperimentModel
+from fpvs_studio.models.timing import TimingDerived
+
+from .base import FrameSyncedMarkerBackend, MarkerBackend
+from .loopback import LoopbackServer, LoopbackSocketBackend, PtyMarkerBackend, pty_available
+from .network_marker import NetworkMarkerBackend
+from .null_marker import NullMarkerBackend
+
+# (run frame index, trigger code)
+MarkerSend = tuple[int, int]
+
+
+@dataclass
+class MarkerBenchmarkResult:
+    """Per-call latency, jitter and throughput for one backend.
+
+    ``frame_*`` fields time the ``on_frame`` calls made to frame-synced
+    backends, which is where coalescing backends do their I/O.
+    """
+
+    backend_name: str
+    n_sends: int
+    elapsed_s: float
+    throughput_per_s: float
+    latency_mean_us: Optional[float] = None
+    latency_sd_us: Optional[float] = None
+    latency_p50_us: Optional[float] = None
+    latency_p95_us: Optional[float] = None
+    latency_p99_us: Optional[float] = None
+    latency_max_us: Optional[float] = None
+    n_frames: int = 0
+    frame_latency_p99_us: Optional[float] = None
+    frame_latency_max_us: Optional[float] = None
+
+
+def run_send_pattern(
+    experiment: ExperimentModel,
+    run_plan: RunPlan,
+    timing: TimingDerived,
+) -> list[MarkerSend]:
+    """Return the marker sends a RealPresenter run would make, by run frame.
+
+    Frame indices count every presented frame of the run plan, REST frames
+    included: ``0`` at each block start and end plus the base and oddball
+    onset triggers from the compiled block schedules.
+    """
+
+    texture_counts = {condition.id: (1, 1) for condition in experiment.conditions}
+    schedules = compile_run_schedules(experiment, run_plan, timing, texture_counts)
+    sends: list[MarkerSend] = []
+    frame = 0
+    for segment, schedule in zip(run_plan.segments, schedules):
+        if schedule is None:
+            if segment.segment_type == "REST" and segment.duration_seconds is not None:
+                frame += int(segment.duration_seconds * timing.frames_per_second)
+            continue
+        sends.append((frame, 0))
+        for block_frame in range(schedule.n_frames):
+            if schedule.event_types[block_frame]:
+                sends.append((frame + block_frame, schedule.trigger_codes[block_frame]))
+        frame += schedule.n_frames
+        sends.append((frame, 0))
+    return sends
+
+
+def _percentile(sorted_values: Sequence[int], fraction: float) -> int:
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def benchmark_backend(
+    backend: MarkerBackend,
+    sends: Sequence[MarkerSend],
+    refresh_hz: int,
+    speed: Optional[float] = 1.0,
+    backend_name: str = "",
+) -> MarkerBenchmarkResult:
+    """Drive ``backend`` with ``sends`` and time every ``send`` call.
+
+    With ``speed=1.0`` sends are paced at the real frame rate, ``2.0`` runs
+    twice as fast, and ``None`` sends back to back. Frame-synced backends
+    also get ``on_frame`` at every simulated flip, from the first send's
+    frame to one past the last, as a presenter would call it; those calls
+    are timed separately. The backend is not closed.
+    """
+
+    frame_period_ns = 1_000_000_000 / refresh_hz
+    frame_synced = isinstance(backend, FrameSyncedMarkerBackend)
+    latencies: list[int] = []
+    frame_latencies: list[int] = []
+    frame_index = sends[0][0] if sends else 0
+    start_ns = time.perf_counter_ns()
+
+    def wait_for_frame(frame: int) -> None:
+        if speed:
+            remaining_ns = start_ns + frame * frame_period_ns / speed - time.perf_counter_ns()
+            if remaining_ns > 0:
+                time.sleep(remaining_ns / 1_000_000_000)
+
+    def present_frames(until_frame: int) -> None:
+        nonlocal frame_index
+        while frame_index < until_frame:
+            frame_index += 1
+            wait_for_frame(frame_index)
+            call_ns = time.perf_counter_ns()
+            backend.on_frame(call_ns)  # type: ignore[attr-defined]
+            frame_latencies.append(time.perf_counter_ns() - call_ns)
+
+    for frame, code in sends:
+        if frame_synced:
+            present_frames(frame)
+        wait_for_frame(frame)
+        call_ns = time.perf_counter_ns()
+        backend.send(code)
+        latencies.append(time.perf_counter_ns() - call_ns)
+    if frame_synced and sends:
+        present_frames(frame_index + 1)
+    elapsed_s = (time.perf_counter_ns() - start_ns) / 1_000_000_000
+
+    result = MarkerBenchmarkResult(
+        backend_name=backend_name or type(backend).__name__,
+        n_sends=len(latencies),
+        elapsed_s=elapsed_s,
+        throughput_per_s=len(latencies) / elapsed_s if elapsed_s > 0 else 0.0,
+    )
+    if latencies:
+        latencies.sort()
+        mean_ns = sum(latencies) / len(latencies)
+        variance_ns = sum((value - mean_ns) ** 2 for value in latencies) / len(latencies)
+        result.latency_mean_us = mean_ns / 1000
+        result.latency_sd_us = math.sqrt(variance_ns) / 1000
+        result.latency_p50_us = _percentile(latencies, 0.50) / 1000
+        result.latency_p95_us = _percentile(latencies, 0.95) / 1000
+        result.latency_p99_us = _percentile(latencies, 0.99) / 1000
+        result.latency_max_us = latencies[-1] / 1000
+    if frame_latencies:
+        frame_latencies.sort()
+        result.n_frames = len(frame_latencies)
+        result.frame_latency_p99_us = _percentile(frame_latencies, 0.99) / 1000
+        result.frame_latency_max_us = frame_latencies[-1] / 1000
+    return result
+
+
+def _null_backend(stack: ExitStack) -> MarkerBackend:
+    return NullMarkerBackend()
+
+
+def _tcp_backend(stack: ExitStack) -> MarkerBackend:
+    server = stack.enter_context(LoopbackServer("tcp"))
+    backend = LoopbackSocketBackend(server.address, "tcp")
+    stack.callback(backend.close)
+    return backend
+
+
+def _udp_backend(stack: ExitStack) -> MarkerBackend:
+    server = stack.enter_context(LoopbackServer("udp"))
+    backend = LoopbackSocketBackend(server.address, "udp")
+    stack.callback(backend.close)
+    return backend
+
+
+def _network_tcp_backend(stack: ExitStack) -> MarkerBackend:
+    server = stack.enter_context(LoopbackServer("tcp"))
+    backend = NetworkMarkerBackend(*server.address, transport="tcp")
+    stack.callback(backend.close)
+    return backend
+
+
+def _network_tcp_coalesce_backend(stack: ExitStack) -> MarkerBackend:
+    server = stack.enter_context(LoopbackServer("tcp"))
+    backend = NetworkMarkerBackend(*server.address, transport="tcp", coalesce=True)
+    stack.callback(backend.close)
+    return backend
+
+
+def _network_udp_backend(stack: ExitStack) -> MarkerBackend:
+    server = stack.enter_context(LoopbackServer("udp"))
+    backend = NetworkMarkerBackend(*server.address, transport="udp")
+    stack.callback(backend.close)
+    return backend
+
+
+def _pty_backend(stack: ExitStack) -> MarkerBackend:
+    backend = PtyMarkerBackend()
+    stack.callback(backend.close)
+    return backend
+
+
+# Backend name -> factory registering its cleanup on the ExitStack. New
+# backends under fpvs_studio.markers can be added here to be benchmarked.
+STAND_IN_BACKENDS: dict[str, Callable[[ExitStack], MarkerBackend]] = {
+    "null": _null_backend,
+    "tcp": _tcp_backend,
+    "udp": _udp_backend,
+    "network-tcp": _network_tcp_backend,
+    "network-tcp-coalesce": _network_tcp_coalesce_backend,
+    "network-udp": _network_udp_backend,
+}
+if pty_available():
+    STAND_IN_BACKENDS["pty"] = _pty_backend
+
+
+def benchmark_stand_ins(
+    sends: Sequence[MarkerSend],
+    refresh_hz: int,
+    speed: Optional[float] = None,
+    backend_names: Optional[Sequence[str]] = None,
+) -> list[MarkerBenchmarkResult]:
+    """Benchmark each named stand-in backend (default: all) with ``sends``."""
+
+    results: list[MarkerBenchmarkResult] = []
+    for name in backend_names or list(STAND_IN_BACKENDS):
+        if name not in STAND_IN_BACKENDS:
+            raise ValueError(f"Unknown marker backend: {name}")
+        with ExitStack() as stack:
+            backend = STAND_IN_BACKENDS[name](stack)
+            results.append(benchmark_backend(backend, sends, refresh_hz, speed, backend_name=name))
+    return results
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 2:
+        print(
+            "Usage: python -m fpvs_studio.markers.benchmark <experiment.json> "
+            "[speed (0 = unpaced)] [backend,backend,...]"
+        )
+        return 1
+
+    from fpvs_studio.config.serialization import load_experiment
+    from fpvs_studio.controllers.scheduling import build_run_plan
+
+    experiment = load_experiment(Path(argv[1]))
+    speed = float(argv[2]) if len(argv) > 2 else 0.0
+    backend_names = argv[3].split(",") if len(argv) > 3 else None
+    if experiment.monitor_refresh_hz is None:
+        print("Error: experiment.monitor_refresh_hz must be set.")
+        return 2
+
+    timing = experiment.derive_timing(experiment.monitor_refresh_hz)
+    run_plan = build_run_plan(experiment, random.Random(12345))
+    sends = run_send_pattern(experiment, run_plan, timing)
+
+    print(f"Sends per run: {len(sends)} at {timing.frames_per_second} Hz (speed={speed or 'unpaced'})")
+    print(
+        "backend               n_sends  throughput/s  mean_us  sd_us  p50_us  p95_us  p99_us  max_us"
+        "  frames  frame_p99_us  frame_max_us"
+    )
+    for result in benchmark_stand_ins(sends, timing.frames_per_second, speed or None, backend_names):
+        print(
+            f"{result.backend_name:<21} {result.n_sends:>7} {result.throughput_per_s:>13.0f} "
+            f"{result.latency_mean_us or 0:>8.1f} {result.latency_sd_us or 0:>6.1f} "
+            f"{result.latency_p50_us or 0:>7.1f} {result.latency_p95_us or 0:>7.1f} "
+            f"{result.latency_p99_us or 0:>7.1f} {result.latency_max_us or 0:>7.1f} "
+            f"{result.n_frames:>7} {result.frame_latency_p99_us or 0:>13.1f} "
+            f"{result.frame_latency_max_us or 0:>13.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
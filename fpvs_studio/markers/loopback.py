@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Literal, Optional
+
+from .base import MarkerBackend
+
+LoopbackTransport = Literal["tcp", "udp"]
+
+_CODE = struct.Struct("<H")
+
+
+class LoopbackServer:
+    """Local stand-in for acquisition software that accepts triggers over a socket.
+
+    Binds to an ephemeral port on 127.0.0.1 and records every payload it
+    receives with its arrival time (``time.perf_counter_ns``). TCP
+    connections are served one at a time; UDP datagrams are recorded one per
+    payload. With ``echo=True`` payloads are sent back to the sender, which
+    allows round-trip measurements.
+    """
+
+    def __init__(self, transport: LoopbackTransport = "tcp", echo: bool = False) -> None:
+        if transport not in ("tcp", "udp"):
+            raise ValueError(f"Unknown transport: {transport}")
+        self.transport = transport
+        self.echo = echo
+        self.payloads: list[bytes] = []
+        self.arrival_ns: list[int] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._client: Optional[socket.socket] = None
+        kind = socket.SOCK_STREAM if transport == "tcp" else socket.SOCK_DGRAM
+        self._socket = socket.socket(socket.AF_INET, kind)
+        self._socket.bind(("127.0.0.1", 0))
+        if transport == "tcp":
+            self._socket.listen(1)
+        self.address: tuple[str, int] = self._socket.getsockname()
+        self._thread = threading.Thread(target=self._serve, name="fpvs-loopback-server", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "LoopbackServer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def received(self) -> bytes:
+        with self._lock:
+            return b"".join(self.payloads)
+
+    def _record(self, payload: bytes) -> None:
+        with self._lock:
+            self.payloads.append(payload)
+            self.arrival_ns.append(time.perf_counter_ns())
+
+    def _serve(self) -> None:
+        try:
+            if self.transport == "udp":
+                while True:
+                    payload, sender = self._socket.recvfrom(65536)
+                    if self._stopping or sender is None:
+                        return
+                    self._record(payload)
+                    if self.echo:
+                        self._socket.sendto(payload, sender)
+            while True:
+                client, _ = self._socket.accept()
+                self._client = client
+                self.connections += 1
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with client:
+                    try:
+                        while payload := client.recv(65536):
+                            self._record(payload)
+                            if self.echo:
+                                client.sendall(payload)
+                    except ConnectionResetError:
+                        pass  # the sender dropped this connection; wait for the next one
+        except OSError:
+            if not self._stopping:  # pragma: no cover - unexpected socket failure
+                raise
+
+    def drop_client(self) -> None:
+        """Close the current TCP connection, as if the receiver restarted."""
+
+        client = self._client
+        if client is not None:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def wait_for(self, n_bytes: int, timeout_s: float = 5.0) -> bool:
+        """Wait until at least ``n_bytes`` have been received."""
+
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            if len(self.received) >= n_bytes:
+                return True
+            time.sleep(0.001)
+        return False
+
+    def close(self) -> None:
+        self._stopping = True
+        self.drop_client()
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._thread.join(timeout=1.0)
+
+
+class LoopbackSocketBackend(MarkerBackend):
+    """Minimal marker backend writing 2-byte codes to a :class:`LoopbackServer`."""
+
+    def __init__(self, address: tuple[str, int], transport: LoopbackTransport = "tcp") -> None:
+        self.transport = transport
+        kind = socket.SOCK_STREAM if transport == "tcp" else socket.SOCK_DGRAM
+        self._socket = socket.socket(socket.AF_INET, kind)
+        if transport == "tcp":
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.connect(address)
+
+    def send(self, code: int) -> None:
+        self._socket.send(_CODE.pack(code))
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+def pty_available() -> bool:
+    """Return True when pseudo-terminals are available (POSIX only)."""
+
+    return hasattr(os, "openpty")
+
+
+class PtyMarkerBackend(MarkerBackend):
+    """Serial-port stand-in that writes one byte per code to a pseudo-terminal.
+
+    A drain thread reads the other end so writes never block on a full
+    buffer. POSIX only; see :func:`pty_available`.
+    """
+
+    def __init__(self) -> None:
+        if not pty_available():
+            raise RuntimeError("Pseudo-terminals are not available on this platform.")
+        import tty
+
+        self._controller_fd, self._device_fd = os.openpty()
+        tty.setraw(self._device_fd)
+        self.n_bytes_read = 0
+        self._thread = threading.Thread(target=self._drain, name="fpvs-pty-drain", daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        try:
+            while chunk := os.read(self._controller_fd, 4096):
+                self.n_bytes_read += len(chunk)
+        except OSError:
+            return
+
+    def send(self, code: int) -> None:
+        os.write(self._device_fd, bytes((code & 0xFF,)))
+
+    def close(self) -> None:
+        os.close(self._device_fd)
+        self._thread.join(timeout=1.0)
+        os.close(self._controller_fd)
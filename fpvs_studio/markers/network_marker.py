@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import errno
+import select
+import socket
+import struct
+import time
+from typing import Literal, Optional
+
+from .base import MarkerBackend
+
+NetworkTransport = Literal["tcp", "udp"]
+
+WIRE_VERSION = 1
+MAX_CODES_PER_MESSAGE = 255
+
+# version, number of codes, sequence number (wraps at 65536)
+_MESSAGE_HEADER = struct.Struct("<BBH")
+_CODE = struct.Struct("<H")
+
+
+def encode_marker_message(sequence: int, codes: list[int]) -> bytes:
+    """Pack up to 255 codes into one wire message."""
+
+    if not 0 < len(codes) <= MAX_CODES_PER_MESSAGE:
+        raise ValueError("A marker message holds between 1 and 255 codes.")
+    return _MESSAGE_HEADER.pack(WIRE_VERSION, len(codes), sequence & 0xFFFF) + struct.pack(
+        f"<{len(codes)}H", *codes
+    )
+
+
+def decode_marker_messages(data: bytes) -> list[tuple[int, list[int]]]:
+    """Split a byte stream into ``(sequence, codes)`` messages.
+
+    Raises ValueError on an unknown version or a truncated message.
+    """
+
+    messages: list[tuple[int, list[int]]] = []
+    offset = 0
+    while offset < len(data):
+        if offset + _MESSAGE_HEADER.size > len(data):
+            raise ValueError("Truncated marker message header.")
+        version, n_codes, sequence = _MESSAGE_HEADER.unpack_from(data, offset)
+        if version != WIRE_VERSION:
+            raise ValueError(f"Unsupported marker wire version: {version}")
+        offset += _MESSAGE_HEADER.size
+        end = offset + n_codes * _CODE.size
+        if end > len(data):
+            raise ValueError("Truncated marker message body.")
+        messages.append((sequence, list(struct.unpack_from(f"<{n_codes}H", data, offset))))
+        offset = end
+    return messages
+
+
+class NetworkMarkerBackend(MarkerBackend):
+    """Sends trigger codes to acquisition software over one persistent socket.
+
+    Each message is a 4-byte header (wire version, code count, sequence
+    number) followed by little-endian 16-bit codes; see
+    :func:`decode_marker_messages`. The connection is opened once; the
+    constructor makes up to ``connect_attempts`` attempts, waiting as for a
+    reconnect between them, and raises the last OSError if all fail. Sends
+    give up after ``send_timeout_s``, so a stalled receiver never blocks
+    the caller for a whole frame. If a send fails or times out, the socket
+    is dropped and reconnected, with the wait doubling from
+    ``backoff_initial_s`` up to ``backoff_max_s``. Reconnecting never
+    blocks: the connect is started without waiting and polled from later
+    sends and :meth:`on_frame`, and given up after ``connect_timeout_s``.
+    Codes sent while disconnected or lost with the failed message are
+    counted in ``dropped_codes``.
+
+    With ``coalesce=True`` codes are buffered and sent as a single message
+    from :meth:`on_frame`, so all sends made within one frame share a packet.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        transport: NetworkTransport = "tcp",
+        coalesce: bool = False,
+        connect_timeout_s: float = 0.5,
+        send_timeout_s: float = 0.005,
+        backoff_initial_s: float = 0.05,
+        backoff_max_s: float = 2.0,
+        connect_attempts: int = 3,
+    ) -> None:
+        if transport not in ("tcp", "udp"):
+            raise ValueError(f"Unknown transport: {transport}")
+        if connect_attempts < 1:
+            raise ValueError("connect_attempts must be at least 1.")
+        self.address = (host, port)
+        self.transport = transport
+        self.coalesce = coalesce
+        self._connect_timeout_s = connect_timeout_s
+        self._send_timeout_s = send_timeout_s
+        self._backoff_initial_s = backoff_initial_s
+        self._backoff_max_s = backoff_max_s
+        self._backoff_s = backoff_initial_s
+        self._next_attempt = 0.0
+        self._sequence = 0
+        self._pending: list[int] = []
+        self._socket: Optional[socket.socket] = None
+        self._connecting: Optional[socket.socket] = None
+        self._connect_deadline = 0.0
+        self._closed = False
+        self.reconnects = 0
+        self.dropped_codes = 0
+        for attempt in range(connect_attempts):
+            try:
+                self._socket = self._connect()
+                break
+            except OSError:
+                if attempt == connect_attempts - 1:
+                    raise
+                time.sleep(self._backoff_s)
+                self._backoff_s = min(self._backoff_s * 2, self._backoff_max_s)
+        self._backoff_s = backoff_initial_s
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    def _new_socket(self) -> socket.socket:
+        kind = socket.SOCK_STREAM if self.transport == "tcp" else socket.SOCK_DGRAM
+        return socket.socket(socket.AF_INET, kind)
+
+    def _configure(self, sock: socket.socket) -> None:
+        if self.transport == "tcp":
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self._send_timeout_s)
+
+    def _connect(self) -> socket.socket:
+        """Connect blocking for up to ``connect_timeout_s``; only used before the run."""
+
+        sock = self._new_socket()
+        try:
+            sock.settimeout(self._connect_timeout_s)
+            sock.connect(self.address)
+            self._configure(sock)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _start_connect(self) -> None:
+        sock = self._new_socket()
+        try:
+            sock.setblocking(False)
+            error = sock.connect_ex(self.address)
+        except OSError:
+            error = errno.ECONNREFUSED
+        if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+            sock.close()
+            self._disconnect()
+            return
+        self._connecting = sock
+        self._connect_deadline = time.monotonic() + self._connect_timeout_s
+
+    def _poll_connect(self) -> bool:
+        sock = self._connecting
+        assert sock is not None
+        _, writable, failed = select.select([], [sock], [sock], 0)
+        if writable or failed:
+            error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        elif time.monotonic() < self._connect_deadline:
+            return False
+        else:
+            error = errno.ETIMEDOUT
+        self._connecting = None
+        if not error:
+            try:
+                self._configure(sock)
+            except OSError as exc:
+                error = exc.errno or errno.ECONNABORTED
+        if error:
+            sock.close()
+            self._disconnect()
+            return False
+        self._socket = sock
+        self.reconnects += 1
+        self._backoff_s = self._backoff_initial_s
+        return True
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        self._next_attempt = time.monotonic() + self._backoff_s
+        self._backoff_s = min(self._backoff_s * 2, self._backoff_max_s)
+
+    def _ensure_connected(self) -> bool:
+        if self._socket is not None:
+            return True
+        if self._connecting is None:
+            if time.monotonic() < self._next_attempt:
+                return False
+            self._start_connect()
+            if self._connecting is None:
+                return False
+        return self._poll_connect()
+
+    def _transmit(self, codes: list[int]) -> None:
+        if not self._ensure_connected():
+            self.dropped_codes += len(codes)
+            return
+        message = encode_marker_message(self._sequence, codes)
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        try:
+            self._socket.sendall(message)  # type: ignore[union-attr]
+        except OSError:
+            self.dropped_codes += len(codes)
+            self._disconnect()
+
+    def send(self, code: int) -> None:
+        if self._closed:
+            raise RuntimeError("NetworkMarkerBackend is closed.")
+        if not self.coalesce:
+            self._transmit([code])
+            return
+        self._pending.append(code)
+        if len(self._pending) == MAX_CODES_PER_MESSAGE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Send any coalesced codes now."""
+
+        if self._pending:
+            codes, self._pending = self._pending, []
+            self._transmit(codes)
+
+    def on_frame(self, now_ns: Optional[int] = None) -> None:
+        """Send the codes coalesced during the frame that was just presented.
+
+        While disconnected, this also advances a pending reconnect.
+        """
+
+        if self._socket is None and not self._closed:
+            self._ensure_connected()
+        self.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            if self._connecting is not None:
+                self._connecting.close()
+                self._connecting = None
+            if self._socket is not None:
+                if self.transport == "tcp":
+                    try:
+                        self._socket.shutdown(socket.SHUT_WR)
+                    except OSError:
+                        pass
+                self._socket.close()
+                self._socket = None
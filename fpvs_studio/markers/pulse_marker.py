@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Optional
+
+from .base import FrameSyncedMarkerBackend, MarkerBackend
+
+NO_RESET = -1
+
+
+class PulseMarkerBackend(MarkerBackend):
+    """Turns every non-zero code into a pulse of at least ``pulse_width_ns``.
+
+    A non-zero :meth:`send` is passed through and the line is returned to 0
+    from :meth:`on_frame` at the first frame boundary at or after the pulse
+    width has elapsed, so no call ever sleeps. If a new code arrives while a
+    pulse is still high, 0 is sent first so consecutive identical codes
+    always produce distinct edges. Every pulse is recorded with its onset
+    and reset times (``clock`` values, default ``time.perf_counter_ns``).
+
+    When wrapped in an :class:`~fpvs_studio.markers.async_marker.AsyncMarkerBackend`,
+    sends and resets both run on the dispatcher thread. If ``backend`` is
+    itself frame-synced (for example a coalescing
+    :class:`~fpvs_studio.markers.network_marker.NetworkMarkerBackend`), its
+    :meth:`on_frame` is called after any reset, so the reset goes out with
+    the same frame.
+    """
+
+    def __init__(
+        self,
+        backend: MarkerBackend,
+        pulse_width_ns: int,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        if pulse_width_ns <= 0:
+            raise ValueError("Pulse width must be positive.")
+        self.backend = backend
+        self.pulse_width_ns = pulse_width_ns
+        self._clock = clock
+        self._forwards_frames = isinstance(backend, FrameSyncedMarkerBackend)
+        self._reset_due_ns: Optional[int] = None
+        self.codes = array("i")
+        self.onset_ns = array("q")
+        self.reset_ns = array("q")
+
+    @property
+    def line_high(self) -> bool:
+        return self._reset_due_ns is not None
+
+    def _reset(self) -> None:
+        self.backend.send(0)
+        self.reset_ns[-1] = self._clock()
+        self._reset_due_ns = None
+
+    def send(self, code: int) -> None:
+        if code == 0:
+            if self.line_high:
+                self._reset()
+            else:
+                self.backend.send(0)
+            return
+
+        if self.line_high:
+            self._reset()
+        self.backend.send(code)
+        onset_ns = self._clock()
+        self.codes.append(code)
+        self.onset_ns.append(onset_ns)
+        self.reset_ns.append(NO_RESET)
+        self._reset_due_ns = onset_ns + self.pulse_width_ns
+
+    def on_frame(self, now_ns: Optional[int] = None) -> None:
+        """Return the line to 0 if the current pulse has lasted long enough."""
+
+        if self._reset_due_ns is not None:
+            if (self._clock() if now_ns is None else now_ns) >= self._reset_due_ns:
+                self._reset()
+        if self._forwards_frames:
+            self.backend.on_frame(now_ns)  # type: ignore[attr-defined]
+
+    def close(self) -> None:
+        if self.line_high:
+            self._reset()
+        self.backend.close()
+
+    def write_csv(self, path: Path) -> None:
+        """Write one row per pulse with its onset, reset and measured width."""
+
+        lines = ["code,onset_ns,reset_ns,width_ns"]
+        for code, onset, reset in zip(self.codes, self.onset_ns, self.reset_ns):
+            width = "" if reset == NO_RESET else str(reset - onset)
+            lines.append(f"{code},{onset},{'' if reset == NO_RESET else reset},{width}")
+        path.write_text("\n".join(lines))
@@ -4,11 +4,14 @@ from .condition import ConditionModel
 from .exceptions import TimingValidationError
 from .experiment import ExperimentModel
 from .timing import TimingDerived, compute_timing
+from .timing_solver import compatible_refresh_rates, suggest_timing
 
 __all__ = [
     "ConditionModel",
     "ExperimentModel",
     "TimingDerived",
     "TimingValidationError",
+    "compatible_refresh_rates",
     "compute_timing",
+    "suggest_timing",
 ]
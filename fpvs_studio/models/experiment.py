@@ -34,6 +34,10 @@ class ExperimentModel:
 
     fixation_base_color: str = "#0000FF"
     fixation_target_color: str = "#FF0000"
+    # All zero/None (the default) keeps the evenly spaced changes of older experiments.
+    fixation_min_gap_ms: float = 0.0
+    fixation_edge_margin_ms: float = 0.0
+    fixation_max_changes_per_block: Optional[int] = None
     instruction_text: str = ""
     attention_question_text: str = ""
     monitor_refresh_hz: Optional[int] = None
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .experiment import ExperimentModel
+
+# Refresh rates found on common lab and consumer displays.
+COMMON_REFRESH_RATES: tuple[int, ...] = (60, 75, 85, 100, 120, 144, 165, 240)
+
+# Same tolerance compute_timing uses for "is an integer".
+_TOLERANCE = 1e-6
+
+
+@dataclass(frozen=True)
+class FrameSplit:
+    """One way to divide a base cycle into image-on and blank frames."""
+
+    image_on_frames: int
+    blank_frames: int
+    image_on_ms: float
+    blank_ms: float
+
+
+@dataclass
+class RefreshRateOption:
+    """A refresh rate at which a base/oddball pair can be presented exactly."""
+
+    monitor_refresh_hz: int
+    frames_per_base_cycle: int
+    oddball_every_n_base: int
+    frame_duration_ms: float
+    splits: list[FrameSplit] = field(default_factory=list)
+
+
+@dataclass
+class TimingSuggestion:
+    """The nearest parameters that pass :func:`compute_timing` at one refresh rate.
+
+    ``changed`` lists the experiment fields whose values differ from the
+    input, in the order they were adjusted.
+    """
+
+    monitor_refresh_hz: int
+    base_rate_hz: float
+    oddball_rate_hz: float
+    image_on_ms: float
+    blank_ms: float
+    changed: list[str] = field(default_factory=list)
+
+
+def _integer_ratio(numerator: float, denominator: float) -> Optional[int]:
+    if numerator <= 0 or denominator <= 0:
+        return None
+    ratio = numerator / denominator
+    nearest = int(round(ratio))
+    if nearest < 1 or not math.isclose(ratio, nearest, rel_tol=0.0, abs_tol=_TOLERANCE):
+        return None
+    return nearest
+
+
+def frame_splits(frames_per_base_cycle: int, monitor_refresh_hz: int) -> list[FrameSplit]:
+    """Return every split of a base cycle into ``1..n`` image frames and the rest blank."""
+
+    frame_ms = 1000.0 / monitor_refresh_hz
+    return [
+        FrameSplit(
+            image_on_frames=on,
+            blank_frames=frames_per_base_cycle - on,
+            image_on_ms=on * frame_ms,
+            blank_ms=(frames_per_base_cycle - on) * frame_ms,
+        )
+        for on in range(1, frames_per_base_cycle + 1)
+    ]
+
+
+def compatible_refresh_rates(
+    base_rate_hz: float,
+    oddball_rate_hz: float,
+    refresh_rates: Iterable[int] = COMMON_REFRESH_RATES,
+    include_splits: bool = True,
+) -> list[RefreshRateOption]:
+    """Return the refresh rates at which both rates map to whole frame counts."""
+
+    oddball_every_n_base = _integer_ratio(base_rate_hz, oddball_rate_hz)
+    if oddball_every_n_base is None:
+        return []
+    options: list[RefreshRateOption] = []
+    for refresh_hz in refresh_rates:
+        frames_per_base_cycle = _integer_ratio(refresh_hz, base_rate_hz)
+        if frames_per_base_cycle is None:
+            continue
+        options.append(
+            RefreshRateOption(
+                monitor_refresh_hz=refresh_hz,
+                frames_per_base_cycle=frames_per_base_cycle,
+                oddball_every_n_base=oddball_every_n_base,
+                frame_duration_ms=1000.0 / refresh_hz,
+                splits=frame_splits(frames_per_base_cycle, refresh_hz) if include_splits else [],
+            )
+        )
+    return options
+
+
+def timing_grid(
+    base_rates_hz: Sequence[float],
+    oddball_rates_hz: Sequence[float],
+    refresh_rates: Sequence[int] = COMMON_REFRESH_RATES,
+) -> dict[tuple[float, float], list[int]]:
+    """Map every (base, oddball) pair of a grid to its compatible refresh rates.
+
+    Divisibility is checked once per refresh/base and base/oddball pair, so
+    the cost grows with the sum of the axes' products rather than calling
+    :func:`compute_timing` for every cell of the full grid.
+    """
+
+    rates_by_base = {
+        base: [refresh for refresh in refresh_rates if _integer_ratio(refresh, base) is not None]
+        for base in base_rates_hz
+    }
+    return {
+        (base, oddball): rates_by_base[base] if _integer_ratio(base, oddball) is not None else []
+        for base in base_rates_hz
+        for oddball in oddball_rates_hz
+    }
+
+
+def _snap_ms(ms: float, frame_ms: float, minimum: int) -> int:
+    if ms <= 0:
+        return 0
+    return max(minimum, int(round(ms / frame_ms)))
+
+
+def suggest_timing(experiment: "ExperimentModel", monitor_refresh_hz: int) -> TimingSuggestion:
+    """Return the nearest valid timing parameters for ``monitor_refresh_hz``.
+
+    The base rate snaps to the nearest ``refresh / n``, the oddball rate to
+    the nearest ``base / m`` and the image/blank durations to whole frames
+    that fit in one base cycle. Values that are already valid are kept.
+    """
+
+    if monitor_refresh_hz <= 0:
+        raise ValueError("Monitor refresh rate must be greater than zero.")
+
+    changed: list[str] = []
+    base_rate = experiment.base_rate_hz
+    frames_per_base_cycle = _integer_ratio(monitor_refresh_hz, base_rate)
+    if frames_per_base_cycle is None:
+        frames_per_base_cycle = (
+            max(1, int(round(monitor_refresh_hz / base_rate))) if base_rate > 0 else 1
+        )
+        base_rate = monitor_refresh_hz / frames_per_base_cycle
+        changed.append("base_rate_hz")
+
+    oddball_rate = experiment.oddball_rate_hz
+    if changed or _integer_ratio(base_rate, oddball_rate) is None:
+        oddball_every = max(1, int(round(base_rate / oddball_rate))) if oddball_rate > 0 else 1
+        snapped = base_rate / oddball_every
+        if not math.isclose(snapped, oddball_rate, rel_tol=0.0, abs_tol=_TOLERANCE):
+            oddball_rate = snapped
+            changed.append("oddball_rate_hz")
+
+    frame_ms = 1000.0 / monitor_refresh_hz
+    image_on_frames = min(_snap_ms(experiment.image_on_ms, frame_ms, 1), frames_per_base_cycle)
+    blank_frames = min(
+        _snap_ms(experiment.blank_ms, frame_ms, 1), frames_per_base_cycle - image_on_frames
+    )
+    image_on_ms = image_on_frames * frame_ms
+    blank_ms = blank_frames * frame_ms
+    if not math.isclose(image_on_ms, experiment.image_on_ms, rel_tol=0.0, abs_tol=_TOLERANCE):
+        changed.append("image_on_ms")
+    else:
+        image_on_ms = experiment.image_on_ms
+    if not math.isclose(blank_ms, experiment.blank_ms, rel_tol=0.0, abs_tol=_TOLERANCE):
+        changed.append("blank_ms")
+    else:
+        blank_ms = experiment.blank_ms
+
+    return TimingSuggestion(
+        monitor_refresh_hz=monitor_refresh_hz,
+        base_rate_hz=base_rate,
+        oddball_rate_hz=oddball_rate,
+        image_on_ms=image_on_ms,
+        blank_ms=blank_ms,
+        changed=changed,
+    )
@@ -1,25 +1,49 @@
 from __future__ import annotations
 
+import copy
+from typing import Optional
+
 from PySide6.QtWidgets import (
     QCheckBox,
     QDoubleSpinBox,
     QFormLayout,
     QGroupBox,
+    QLabel,
     QLineEdit,
     QPlainTextEdit,
+    QPushButton,
     QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
-from fpvs_studio.models import ExperimentModel
+from fpvs_studio.controllers.validation import ValidationReport
+from fpvs_studio.models import ExperimentModel, TimingValidationError
+from fpvs_studio.models.timing import compute_timing
+from fpvs_studio.models.timing_solver import (
+    TimingSuggestion,
+    compatible_refresh_rates,
+    suggest_timing,
+)
+from fpvs_studio.views.live_validation import LiveValidator
 
 
 class ExperimentEditor(QWidget):
-    """Widget for editing FPVS experiment settings."""
+    """Widget for editing FPVS experiment settings.
+
+    Edits to timing, scheduling and attention fields are validated in the
+    background by a :class:`LiveValidator`, and the outcome is shown below
+    the form.
+    """
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
+        self._experiment: Optional[ExperimentModel] = None
+        self._timing_suggestion: Optional[TimingSuggestion] = None
+        # Exact timing values behind the 3-decimal spin boxes, by model field.
+        self._exact_timing: dict[str, float] = {}
+        self._validator = LiveValidator(self._validation_snapshot, parent=self)
+        self._validator.validated.connect(self._show_validation)
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -54,6 +78,19 @@ class ExperimentEditor(QWidget):
         self.block_duration_spin = QSpinBox()
         self.block_duration_spin.setRange(0, 36000)
 
+        # 0 means "not set"; the model stores None.
+        self.monitor_refresh_spin = QSpinBox()
+        self.monitor_refresh_spin.setRange(0, 1000)
+        self.monitor_refresh_spin.setSpecialValueText("Not set")
+
+        self.compatible_rates_label = QLabel()
+        self.compatible_rates_label.setWordWrap(True)
+        self.timing_hint_label = QLabel()
+        self.timing_hint_label.setWordWrap(True)
+        self.apply_timing_button = QPushButton("Apply suggested timing")
+        self.apply_timing_button.setVisible(False)
+        self.apply_timing_button.clicked.connect(self._apply_timing_suggestion)
+
         timing_group = QGroupBox("Timing")
         timing_layout = QFormLayout()
         timing_layout.addRow("Base rate (Hz)", self.base_rate_spin)
@@ -61,9 +98,22 @@ class ExperimentEditor(QWidget):
         timing_layout.addRow("Image on (ms)", self.image_on_spin)
         timing_layout.addRow("Blank (ms)", self.blank_spin)
         timing_layout.addRow("Block duration (s)", self.block_duration_spin)
+        timing_layout.addRow("Monitor refresh (Hz)", self.monitor_refresh_spin)
+        timing_layout.addRow("Compatible refresh rates", self.compatible_rates_label)
+        timing_layout.addRow(self.timing_hint_label)
+        timing_layout.addRow(self.apply_timing_button)
         timing_group.setLayout(timing_layout)
         layout.addWidget(timing_group)
 
+        for spin in (
+            self.base_rate_spin,
+            self.oddball_rate_spin,
+            self.image_on_spin,
+            self.blank_spin,
+            self.monitor_refresh_spin,
+        ):
+            spin.valueChanged.connect(self._update_timing_hints)
+
         # Scheduling
         self.num_cycles_spin = QSpinBox()
         self.num_cycles_spin.setRange(0, 10000)
@@ -89,12 +139,25 @@ class ExperimentEditor(QWidget):
         self.fixation_min_spin.setRange(0, 10000)
         self.fixation_max_spin = QSpinBox()
         self.fixation_max_spin.setRange(0, 10000)
+        self.fixation_gap_spin = QDoubleSpinBox()
+        self.fixation_gap_spin.setRange(0.0, 600000.0)
+        self.fixation_gap_spin.setDecimals(1)
+        self.fixation_margin_spin = QDoubleSpinBox()
+        self.fixation_margin_spin.setRange(0.0, 600000.0)
+        self.fixation_margin_spin.setDecimals(1)
+        # 0 means "no per-block limit"; the model stores None.
+        self.fixation_per_block_spin = QSpinBox()
+        self.fixation_per_block_spin.setRange(0, 10000)
+        self.fixation_per_block_spin.setSpecialValueText("No limit")
 
         attention_group = QGroupBox("Attention")
         attention_layout = QFormLayout()
         attention_layout.addRow(self.attention_enabled_check)
         attention_layout.addRow("Fixation min changes", self.fixation_min_spin)
         attention_layout.addRow("Fixation max changes", self.fixation_max_spin)
+        attention_layout.addRow("Min gap between changes (ms)", self.fixation_gap_spin)
+        attention_layout.addRow("Min distance from block edges (ms)", self.fixation_margin_spin)
+        attention_layout.addRow("Max changes per block", self.fixation_per_block_spin)
         attention_group.setLayout(attention_layout)
         layout.addWidget(attention_group)
 
@@ -109,18 +172,143 @@ class ExperimentEditor(QWidget):
         texts_group.setLayout(texts_layout)
         layout.addWidget(texts_group)
 
+        self.validation_label = QLabel()
+        self.validation_label.setWordWrap(True)
+        layout.addWidget(self.validation_label)
+
         layout.addStretch()
+        self._update_timing_hints()
+
+        for spin in (
+            self.base_rate_spin,
+            self.oddball_rate_spin,
+            self.image_on_spin,
+            self.blank_spin,
+            self.block_duration_spin,
+            self.monitor_refresh_spin,
+            self.num_cycles_spin,
+            self.rest_default_spin,
+            self.fixation_min_spin,
+            self.fixation_max_spin,
+            self.fixation_gap_spin,
+            self.fixation_margin_spin,
+            self.fixation_per_block_spin,
+        ):
+            spin.valueChanged.connect(self._validator.schedule)
+        for check in (self.rest_check, self.attention_enabled_check):
+            check.toggled.connect(self._validator.schedule)
+
+    def _validation_snapshot(self) -> Optional[ExperimentModel]:
+        if self._experiment is None:
+            return None
+        experiment = copy.copy(self._experiment)
+        self.apply_to_model(experiment)
+        return experiment
+
+    def _show_validation(self, report: ValidationReport) -> None:
+        minutes, seconds = divmod(report.total_duration_seconds, 60)
+        lines = [
+            f"{report.n_blocks} blocks, {report.n_segments} segments, "
+            f"{minutes}:{seconds:02d} total"
+        ]
+        lines += [f"Error: {error}" for error in report.errors]
+        lines += [f"Warning: {warning}" for warning in report.warnings]
+        self.validation_label.setText("\n".join(lines))
+
+    def _timing_spins(self) -> dict[str, QDoubleSpinBox]:
+        return {
+            "base_rate_hz": self.base_rate_spin,
+            "oddball_rate_hz": self.oddball_rate_spin,
+            "image_on_ms": self.image_on_spin,
+            "blank_ms": self.blank_spin,
+        }
+
+    def _timing_value(self, field_name: str) -> float:
+        """Return a timing field, keeping its exact value while the spin box still shows it.
+
+        The spin boxes hold 3 decimals, so values such as 1000/60 ms would
+        otherwise be rounded off whole frames when written back.
+        """
+
+        spin = self._timing_spins()[field_name]
+        exact = self._exact_timing.get(field_name)
+        if exact is not None and round(exact, spin.decimals()) == spin.value():
+            return exact
+        return spin.value()
+
+    def _set_timing_values(self, values: dict[str, float]) -> None:
+        self._exact_timing = dict(values)
+        for field_name, spin in self._timing_spins().items():
+            spin.setValue(values[field_name])
+
+    def _apply_timing_suggestion(self) -> None:
+        suggestion = self._timing_suggestion
+        if suggestion is None:
+            return
+        self._set_timing_values(
+            {field_name: getattr(suggestion, field_name) for field_name in self._timing_spins()}
+        )
+        # The rounded display may not change, in which case no valueChanged fires.
+        self._update_timing_hints()
+        self._validator.schedule()
+
+    def _update_timing_hints(self) -> None:
+        """Show the refresh rates that fit the current rates and a fix for invalid timing."""
+
+        base_rate = self._timing_value("base_rate_hz")
+        oddball_rate = self._timing_value("oddball_rate_hz")
+        options = compatible_refresh_rates(base_rate, oddball_rate, include_splits=False)
+        self.compatible_rates_label.setText(
+            ", ".join(f"{option.monitor_refresh_hz} Hz" for option in options) or "None"
+        )
+
+        self._timing_suggestion = None
+        refresh_hz = self.monitor_refresh_spin.value()
+        if refresh_hz == 0:
+            self.timing_hint_label.setText("")
+            self.apply_timing_button.setVisible(False)
+            return
+        experiment = ExperimentModel(
+            experiment_id="",
+            name="",
+            base_rate_hz=base_rate,
+            oddball_rate_hz=oddball_rate,
+            image_on_ms=self._timing_value("image_on_ms"),
+            blank_ms=self._timing_value("blank_ms"),
+            block_duration_seconds=0,
+            num_cycles=0,
+            randomize_within_cycle=False,
+            rest_enabled=False,
+            rest_default_seconds=0,
+            attention_enabled=False,
+            fixation_min_changes=0,
+            fixation_max_changes=0,
+        )
+        try:
+            compute_timing(experiment, refresh_hz)
+        except TimingValidationError as exc:
+            suggestion = suggest_timing(experiment, refresh_hz)
+            self._timing_suggestion = suggestion
+            self.timing_hint_label.setText(
+                f"{exc} Nearest valid at {refresh_hz} Hz: "
+                f"base {suggestion.base_rate_hz:.3f} Hz, oddball {suggestion.oddball_rate_hz:.3f} Hz, "
+                f"image on {suggestion.image_on_ms:.3f} ms, blank {suggestion.blank_ms:.3f} ms."
+            )
+        else:
+            self.timing_hint_label.setText("")
+        self.apply_timing_button.setVisible(self._timing_suggestion is not None)
 
     def set_experiment(self, experiment: ExperimentModel) -> None:
         """Populate the editor with values from the experiment model."""
 
+        self._experiment = experiment
         self.experiment_id_edit.setText(experiment.experiment_id)
         self.name_edit.setText(experiment.name)
-        self.base_rate_spin.setValue(experiment.base_rate_hz)
-        self.oddball_rate_spin.setValue(experiment.oddball_rate_hz)
-        self.image_on_spin.setValue(experiment.image_on_ms)
-        self.blank_spin.setValue(experiment.blank_ms)
+        self._set_timing_values(
+            {field_name: getattr(experiment, field_name) for field_name in self._timing_spins()}
+        )
         self.block_duration_spin.setValue(experiment.block_duration_seconds)
+        self.monitor_refresh_spin.setValue(experiment.monitor_refresh_hz or 0)
         self.num_cycles_spin.setValue(experiment.num_cycles)
         self.randomize_check.setChecked(experiment.randomize_within_cycle)
         self.rest_check.setChecked(experiment.rest_enabled)
@@ -128,19 +316,24 @@ class ExperimentEditor(QWidget):
         self.attention_enabled_check.setChecked(experiment.attention_enabled)
         self.fixation_min_spin.setValue(experiment.fixation_min_changes)
         self.fixation_max_spin.setValue(experiment.fixation_max_changes)
+        self.fixation_gap_spin.setValue(experiment.fixation_min_gap_ms)
+        self.fixation_margin_spin.setValue(experiment.fixation_edge_margin_ms)
+        self.fixation_per_block_spin.setValue(experiment.fixation_max_changes_per_block or 0)
         self.instruction_text_edit.setPlainText(experiment.instruction_text)
         self.attention_question_edit.setPlainText(experiment.attention_question_text)
+        self._validator.schedule()
 
     def apply_to_model(self, experiment: ExperimentModel) -> None:
         """Write editor values back into the provided experiment model."""
 
         experiment.experiment_id = self.experiment_id_edit.text()
         experiment.name = self.name_edit.text()
-        experiment.base_rate_hz = self.base_rate_spin.value()
-        experiment.oddball_rate_hz = self.oddball_rate_spin.value()
-        experiment.image_on_ms = self.image_on_spin.value()
-        experiment.blank_ms = self.blank_spin.value()
+        experiment.base_rate_hz = self._timing_value("base_rate_hz")
+        experiment.oddball_rate_hz = self._timing_value("oddball_rate_hz")
+        experiment.image_on_ms = self._timing_value("image_on_ms")
+        experiment.blank_ms = self._timing_value("blank_ms")
         experiment.block_duration_seconds = self.block_duration_spin.value()
+        experiment.monitor_refresh_hz = self.monitor_refresh_spin.value() or None
         experiment.num_cycles = self.num_cycles_spin.value()
         experiment.randomize_within_cycle = self.randomize_check.isChecked()
         experiment.rest_enabled = self.rest_check.isChecked()
@@ -148,5 +341,8 @@ class ExperimentEditor(QWidget):
         experiment.attention_enabled = self.attention_enabled_check.isChecked()
         experiment.fixation_min_changes = self.fixation_min_spin.value()
         experiment.fixation_max_changes = self.fixation_max_spin.value()
+        experiment.fixation_min_gap_ms = self.fixation_gap_spin.value()
+        experiment.fixation_edge_margin_ms = self.fixation_margin_spin.value()
+        experiment.fixation_max_changes_per_block = self.fixation_per_block_spin.value() or None
         experiment.instruction_text = self.instruction_text_edit.toPlainText()
         experiment.attention_question_text = self.attention_question_edit.toPlainText()
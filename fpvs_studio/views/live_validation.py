@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from fpvs_studio.controllers.validation import ValidationReport, validate_experiment
+from fpvs_studio.models import ExperimentModel
+
+
+class _ValidationSignals(QObject):
+    finished = Signal(int, object)
+
+
+class _ValidationTask(QRunnable):
+    def __init__(
+        self,
+        generation: int,
+        experiment: ExperimentModel,
+        signals: _ValidationSignals,
+    ) -> None:
+        super().__init__()
+        self._generation = generation
+        self._experiment = experiment
+        self._signals = signals
+
+    def run(self) -> None:
+        self._signals.finished.emit(self._generation, validate_experiment(self._experiment))
+
+
+class LiveValidator(QObject):
+    """Debounced background validation for the experiment editor.
+
+    :meth:`schedule` restarts a ``delay_ms`` single-shot timer; when it
+    fires, ``snapshot()`` is taken on the GUI thread and validated on the
+    global ``QThreadPool``. ``validated`` is emitted on the GUI thread with
+    the :class:`ValidationReport` of the latest snapshot only; results of
+    superseded snapshots are dropped.
+    """
+
+    validated = Signal(object)
+
+    def __init__(
+        self,
+        snapshot: Callable[[], Optional[ExperimentModel]],
+        delay_ms: int = 250,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._snapshot = snapshot
+        self._generation = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+        self._signals = _ValidationSignals(self)
+        self._signals.finished.connect(self._on_finished)
+
+    def schedule(self) -> None:
+        self._timer.start()
+
+    def _start(self) -> None:
+        experiment = self._snapshot()
+        if experiment is None:
+            return
+        self._generation += 1
+        QThreadPool.globalInstance().start(
+            _ValidationTask(self._generation, experiment, self._signals)
+        )
+
+    def _on_finished(self, generation: int, report: ValidationReport) -> None:
+        if generation == self._generation:
+            self.validated.emit(report)
@@ -0,0 +1,61 @@
+"""Shared model factories for the tests; each test overrides only the fields it cares about."""
+
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from fpvs_studio.models import ConditionModel, ExperimentModel
+
+
+def make_conditions(
+    condition_ids: Sequence[str] = ("A", "B"),
+    root: Path = Path("/missing"),
+) -> list[ConditionModel]:
+    """Return one condition per id, with triggers 11/12, 21/22, ... and folders under ``root``.
+
+    Condition ``A`` uses ``root/base_a`` and ``root/odd_a``; the folders need not exist.
+    """
+
+    return [
+        ConditionModel(
+            condition_id,
+            condition_id,
+            10 * index + 11,
+            10 * index + 12,
+            root / f"base_{condition_id.lower()}",
+            root / f"odd_{condition_id.lower()}",
+        )
+        for index, condition_id in enumerate(condition_ids)
+    ]
+
+
+def make_experiment(
+    conditions: Optional[Sequence[ConditionModel]] = None,
+    **overrides: Any,
+) -> ExperimentModel:
+    """Return a valid 60 Hz experiment: 6 Hz base, 1.2 Hz oddball, one cycle of 2 s blocks.
+
+    Rest and the attention task are off; ``conditions`` defaults to
+    :func:`make_conditions`.
+    """
+
+    values: dict[str, Any] = dict(
+        experiment_id="exp",
+        name="Example",
+        base_rate_hz=6.0,
+        oddball_rate_hz=1.2,
+        image_on_ms=50.0,
+        blank_ms=0.0,
+        block_duration_seconds=2,
+        num_cycles=1,
+        randomize_within_cycle=False,
+        rest_enabled=False,
+        rest_default_seconds=0,
+        attention_enabled=False,
+        fixation_min_changes=0,
+        fixation_max_changes=0,
+        monitor_refresh_hz=60,
+    )
+    values.update(overrides)
+    return ExperimentModel(
+        conditions=list(conditions) if conditions is not None else make_conditions(), **values
+    )
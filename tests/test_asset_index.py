@@ -0,0 +1,128 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+from fpvs_studio.config.asset_index import image_dimensions, update_asset_index
+from fpvs_studio.config.serialization import (
+    asset_index_path,
+    load_asset_index,
+    refresh_saved_asset_index,
+    save_asset_index,
+)
+from fpvs_studio.engine.run_session import SUMMARY_CSV_HEADER, write_run_summary
+from fpvs_studio.models import ConditionModel
+
+from factories import make_experiment
+
+
+def png_bytes(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    chunk = struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr
+    return b"\x89PNG\r\n\x1a\n" + chunk + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+
+
+def bmp_bytes(width: int, height: int) -> bytes:
+    info = struct.pack("<IiiHH", 40, width, -height, 1, 32) + bytes(24)
+    return b"BM" + struct.pack("<IHHI", 14 + len(info), 0, 0, 14 + len(info)) + info
+
+
+def jpeg_bytes(width: int, height: int) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + bytes(9)
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + bytes(3)
+    return b"\xff\xd8" + app0 + sof0 + b"\xff\xd9"
+
+
+class AssetIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for name in ("base", "odd_a", "odd_b"):
+            (self.root / name).mkdir()
+        (self.root / "base" / "b1.png").write_bytes(png_bytes(64, 32))
+        (self.root / "base" / "b2.bmp").write_bytes(bmp_bytes(64, 32))
+        (self.root / "base" / "notes.txt").write_text("ignored")
+        (self.root / "odd_a" / "o1.jpg").write_bytes(jpeg_bytes(48, 24))
+        (self.root / "odd_b" / "o1.jpg").write_bytes(jpeg_bytes(48, 24))
+        self.experiment = make_experiment(
+            [
+                ConditionModel("A", "A", 11, 12, self.root / "base", self.root / "odd_a"),
+                ConditionModel("B", "B", 21, 22, self.root / "base", self.root / "odd_b"),
+            ]
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_header_dimensions(self) -> None:
+        self.assertEqual(image_dimensions(self.root / "base" / "b1.png"), (64, 32))
+        self.assertEqual(image_dimensions(self.root / "base" / "b2.bmp"), (64, 32))
+        self.assertEqual(image_dimensions(self.root / "odd_a" / "o1.jpg"), (48, 24))
+        with self.assertRaises(ValueError):
+            image_dimensions(self.root / "base" / "notes.txt")
+
+    def test_shared_directories_and_duplicate_contents(self) -> None:
+        index, stats = update_asset_index(self.experiment.conditions)
+        self.assertEqual(stats.listed_dirs, 3)
+        self.assertEqual(stats.hashed_files, 4)
+        self.assertEqual(stats.parsed_contents, 3)
+        base, oddball = index.condition_paths("B")
+        self.assertEqual([path.name for path in base], ["b1.png", "b2.bmp"])
+        self.assertEqual(oddball, [self.root / "odd_b" / "o1.jpg"])
+        [duplicates] = index.duplicates().values()
+        self.assertEqual(len(duplicates), 2)
+
+    def test_unreadable_headers_are_recorded(self) -> None:
+        (self.root / "base" / "bad.png").write_bytes(b"not an image")
+        (self.root / "odd_a" / "bad.jpg").write_bytes(b"\xff\xd8\xff")
+        path = asset_index_path(self.root / "experiment.json")
+        index = refresh_saved_asset_index(path, self.experiment.conditions)
+        self.assertEqual(len(index.files), 6)
+        self.assertEqual(
+            [message.split(":")[0] for message in index.header_errors()],
+            [str(self.root / "base" / "bad.png"), str(self.root / "odd_a" / "bad.jpg")],
+        )
+        self.assertEqual(load_asset_index(path), index)
+
+    def test_incremental_refresh(self) -> None:
+        first, _ = update_asset_index(self.experiment.conditions)
+        unchanged, stats = update_asset_index(self.experiment.conditions, first)
+        self.assertEqual(unchanged, first)
+        self.assertEqual((stats.listed_dirs, stats.hashed_files, stats.parsed_contents), (0, 0, 0))
+
+        changed_file = self.root / "odd_a" / "o1.jpg"
+        changed_file.write_bytes(jpeg_bytes(96, 48))
+        mtime_ns = changed_file.stat().st_mtime_ns + 1_000_000_000
+        os.utime(changed_file, ns=(mtime_ns, mtime_ns))
+        changed, stats = update_asset_index(self.experiment.conditions, first)
+        self.assertEqual((stats.listed_dirs, stats.hashed_files, stats.parsed_contents), (0, 1, 1))
+        self.assertNotEqual(changed.index_hash(), first.index_hash())
+        self.assertEqual(changed.duplicates(), {})
+
+    def test_saved_index_round_trip(self) -> None:
+        path = asset_index_path(self.root / "experiment.json")
+        self.assertEqual(path.name, "experiment.assets.json")
+        index = refresh_saved_asset_index(path, self.experiment.conditions)
+        self.assertEqual(load_asset_index(path), index)
+        mtime_ns = path.stat().st_mtime_ns
+        self.assertEqual(refresh_saved_asset_index(path, self.experiment.conditions), index)
+        self.assertEqual(path.stat().st_mtime_ns, mtime_ns)
+
+        path.write_text('{"version": 0}', encoding="utf-8")
+        self.assertEqual(refresh_saved_asset_index(path, self.experiment.conditions), index)
+        save_asset_index(index, path)
+        self.assertEqual(load_asset_index(path).index_hash(), index.index_hash())
+
+    def test_summary_records_index_hash(self) -> None:
+        index, _ = update_asset_index(self.experiment.conditions)
+        summary = self.root / "run_summary.csv"
+        write_run_summary(summary, "p01", self.experiment, 0, None, 0, "", index.index_hash())
+        header, row = summary.read_text().splitlines()
+        self.assertEqual(header, SUMMARY_CSV_HEADER)
+        self.assertTrue(row.endswith(index.index_hash()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import threading
+import time
+import unittest
+
+from fpvs_studio.markers import AsyncMarkerBackend, NullMarkerBackend, PulseMarkerBackend
+from fpvs_studio.markers.loopback import LoopbackServer
+from fpvs_studio.markers.network_marker import NetworkMarkerBackend, decode_marker_messages
+
+
+class SlowBackend:
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+        self.sent: list[int] = []
+        self.closed = False
+        self.thread_ids: set[int] = set()
+
+    def send(self, code: int) -> None:
+        time.sleep(self.delay_s)
+        self.thread_ids.add(threading.get_ident())
+        self.sent.append(code)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class AsyncMarkerBackendTests(unittest.TestCase):
+    def test_sends_do_not_block_and_keep_order(self) -> None:
+        backend = SlowBackend(delay_s=0.02)
+        marker = AsyncMarkerBackend(backend)
+
+        start = time.perf_counter()
+        for code in (0, 11, 12, 11, 0):
+            marker.send(code)
+        queued_s = time.perf_counter() - start
+        marker.close()
+
+        self.assertLess(queued_s, 0.02)
+        self.assertEqual(backend.sent, [0, 11, 12, 11, 0])
+        self.assertEqual(list(marker.codes), [0, 11, 12, 11, 0])
+        self.assertTrue(backend.closed)
+        self.assertNotIn(threading.get_ident(), backend.thread_ids)
+
+    def test_latency_stats_use_request_timestamps(self) -> None:
+        sent_times = iter([100, 600])
+        marker = AsyncMarkerBackend(NullMarkerBackend(), clock=lambda: next(sent_times))
+        marker.send(1, request_ns=0)
+        marker.send(2, request_ns=0)
+        marker.close()
+
+        stats = marker.latency_stats()
+        self.assertEqual(stats.n_sends, 2)
+        self.assertEqual(list(marker.sent_ns), [100, 600])
+        self.assertAlmostEqual(stats.max_ms, 0.0006)
+        self.assertAlmostEqual(stats.p50_ms, 0.0001)
+
+    def test_send_after_close_raises(self) -> None:
+        marker = AsyncMarkerBackend(NullMarkerBackend())
+        marker.close()
+        with self.assertRaises(RuntimeError):
+            marker.send(1)
+        self.assertEqual(marker.latency_stats().n_sends, 0)
+
+
+class RecordingBackend:
+    def __init__(self) -> None:
+        self.sent: list[int] = []
+        self.closed = False
+
+    def send(self, code: int) -> None:
+        self.sent.append(code)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class PulseMarkerBackendTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0
+        self.backend = RecordingBackend()
+        self.pulse = PulseMarkerBackend(self.backend, pulse_width_ns=10, clock=lambda: self.now)
+
+    def test_resets_on_first_frame_after_width(self) -> None:
+        self.pulse.send(11)
+        self.now = 5
+        self.pulse.on_frame()
+        self.assertEqual(self.backend.sent, [11])
+        self.pulse.on_frame(now_ns=12)
+
+        self.assertEqual(self.backend.sent, [11, 0])
+        self.assertEqual(list(self.pulse.onset_ns), [0])
+        self.assertEqual(list(self.pulse.reset_ns), [5])
+        self.assertFalse(self.pulse.line_high)
+
+    def test_identical_codes_get_distinct_edges(self) -> None:
+        self.pulse.send(11)
+        self.now = 3
+        self.pulse.send(11)
+        self.pulse.close()
+
+        self.assertEqual(self.backend.sent, [11, 0, 11, 0])
+        self.assertEqual(list(self.pulse.codes), [11, 11])
+        self.assertTrue(self.backend.closed)
+
+    def test_runs_on_dispatcher_when_wrapped(self) -> None:
+        marker = AsyncMarkerBackend(PulseMarkerBackend(self.backend, pulse_width_ns=1))
+        marker.send(12)
+        time.sleep(0.01)
+        marker.on_frame()
+        marker.close()
+
+        self.assertEqual(self.backend.sent, [12, 0])
+
+    def test_frames_reach_a_coalescing_inner_backend(self) -> None:
+        with LoopbackServer("tcp") as server:
+            network = NetworkMarkerBackend(*server.address, coalesce=True)
+            pulse = PulseMarkerBackend(network, pulse_width_ns=10, clock=lambda: self.now)
+            pulse.send(11)
+            pulse.on_frame()
+            self.assertTrue(server.wait_for(6))
+            self.now = 10
+            pulse.on_frame()
+            self.assertTrue(server.wait_for(12))
+            pulse.close()
+
+            self.assertEqual(
+                [codes for _, codes in decode_marker_messages(server.received)], [[11], [0]]
+            )
+
+    def test_rejects_non_positive_width(self) -> None:
+        with self.assertRaises(ValueError):
+            PulseMarkerBackend(self.backend, pulse_width_ns=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
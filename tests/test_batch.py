@@ -0,0 +1,78 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.controllers.batch import (
+    participant_ids,
+    participant_seed,
+    run_batch,
+    write_batch_table,
+)
+
+from factories import make_conditions, make_experiment
+
+
+# Three conditions over two cycles, with a random number of fixation changes.
+SIMULATED_RUN = dict(
+    num_cycles=2,
+    randomize_within_cycle=True,
+    attention_enabled=True,
+    fixation_min_changes=1,
+    fixation_max_changes=5,
+)
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_seeds_and_ids_are_deterministic(self) -> None:
+        self.assertEqual(participant_seed(7, 3), participant_seed(7, 3))
+        self.assertEqual(len({participant_seed(7, index) for index in range(1000)}), 1000)
+        self.assertNotEqual(participant_seed(7, 0), participant_seed(8, 0))
+        self.assertEqual(participant_ids(3), ["sim0001", "sim0002", "sim0003"])
+        self.assertEqual(participant_ids(12345, "p")[-1], "p12345")
+
+    def test_pool_matches_serial_run(self) -> None:
+        experiment = make_experiment(make_conditions(("A", "B", "C")), **SIMULATED_RUN)
+        serial = run_batch(experiment, self.root / "serial", 4, base_seed=5, max_workers=1)
+        pooled = run_batch(
+            experiment, self.root / "pooled", 4, base_seed=5, max_workers=2, frame_accurate=True
+        )
+
+        self.assertEqual([result.participant_id for result in pooled], participant_ids(4))
+        for a, b in zip(serial, pooled):
+            self.assertIsNone(a.error)
+            self.assertIsNone(b.error)
+            self.assertEqual(
+                (a.seed, a.block_order, a.n_fixation_changes),
+                (b.seed, b.block_order, b.n_fixation_changes),
+            )
+            self.assertEqual(a.n_blocks, 6)
+            self.assertGreater(b.n_events, a.n_events)
+            self.assertTrue(b.output_dir.is_dir())
+        self.assertEqual(len({result.output_dir for result in pooled}), 4)
+
+        table = self.root / "batch_results.csv"
+        write_batch_table(table, pooled)
+        with table.open(newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["participant_id"], "sim0001")
+        self.assertEqual(rows[0]["error"], "")
+
+    def test_participant_errors_are_recorded(self) -> None:
+        experiment = make_experiment(make_conditions(("A", "B", "C")), **SIMULATED_RUN)
+        experiment.fixation_min_changes = 9
+        results = run_batch(experiment, self.root, 2, max_workers=1)
+
+        self.assertTrue(all(result.error and "ValueError" in result.error for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+from fpvs_studio.controllers.run_controller import RunConfig, RunController
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.engine.checkpoint import read_checkpoint, run_plan_from_checkpoint, write_checkpoint
+from fpvs_studio.engine.dummy_presenter import DummyPresenter
+from fpvs_studio.engine.event_log_file import read_event_log
+from fpvs_studio.engine.headless_presenter import HeadlessPresenter
+from fpvs_studio.markers.null_marker import NullMarkerBackend
+
+from factories import make_experiment
+
+
+PLAN = RunPlan(
+    segments=[
+        RunSegment("BLOCK", condition_id="A"),
+        RunSegment("REST", duration_seconds=1),
+        RunSegment("BLOCK", condition_id="B"),
+    ],
+    fixation_change_frames=[40, 150],
+    rng_state=random.Random(5).getstate(),
+)
+
+
+class FailingMarker(NullMarkerBackend):
+    """Raises on the first trigger of the given code, like a cable pulled mid-block."""
+
+    def __init__(self, fail_on: int) -> None:
+        self.fail_on = fail_on
+
+    def send(self, code: int) -> None:
+        if code == self.fail_on:
+            raise OSError("marker port lost")
+
+
+class FrameTimingMarker(NullMarkerBackend):
+    def __init__(self) -> None:
+        self.frame_times: list[float] = []
+
+    def on_frame(self, now_ns: Optional[int] = None) -> None:
+        self.frame_times.append(time.perf_counter())
+
+
+class CheckpointResumeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_resume_continues_from_unfinished_block(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        presenter = HeadlessPresenter(self.root)
+        aborted = presenter.run_experiment(experiment, "p01", PLAN, 2, FailingMarker(21))
+        self.assertTrue(aborted.aborted)
+
+        [checkpoint_file] = self.root.glob("*_checkpoint.json")
+        checkpoint = read_checkpoint(checkpoint_file)
+        self.assertEqual(checkpoint.next_segment_index, 2)
+        self.assertEqual(checkpoint.fixation_changes_done, 1)
+        self.assertEqual(checkpoint.fixation_state, 1)
+        self.assertEqual(checkpoint.texture_cursors, {"A": [10, 2]})
+        self.assertFalse(checkpoint.complete)
+        self.assertEqual(run_plan_from_checkpoint(checkpoint), PLAN)
+
+        resumed = presenter.resume_experiment(experiment, checkpoint_file, NullMarkerBackend())
+        self.assertFalse(resumed.aborted)
+        self.assertTrue(resumed.correct)
+        self.assertEqual(resumed.event_log_path, aborted.event_log_path)
+        self.assertTrue(read_checkpoint(checkpoint_file).complete)
+
+        assert resumed.event_log_path is not None and resumed.binary_event_log_path is not None
+        event_types = [line.split(",")[1] for line in resumed.event_log_path.read_text().splitlines()]
+        self.assertEqual(event_types.count("event_type"), 1)
+        self.assertEqual(event_types.count("aborted"), 1)
+        self.assertEqual(event_types.count("resumed"), 1)
+        self.assertEqual(event_types.count("run_complete"), 1)
+        with read_event_log(resumed.binary_event_log_path) as log:
+            self.assertEqual(len(log), len(event_types) - 1)
+            [resume] = log.metadata["resumes"]
+            self.assertEqual(resume["segment_index"], 2)
+            block_b = log.select(event_type="block_start", condition_id="B")
+            self.assertEqual(len(block_b["event_codes"]), 2)
+            self.assertEqual(len(log.select(event_type="fixation_change")["event_codes"]), 2)
+        self.assertIn("resumed_from_segment=2", resumed.run_summary_path.read_text())
+
+        with self.assertRaises(ValueError):
+            presenter.resume_experiment(experiment, checkpoint_file, NullMarkerBackend())
+
+    def test_interrupted_block_is_repeated_on_resume(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        interrupted = HeadlessPresenter(self.root, interrupt_after_frames=200).run_experiment(
+            experiment, "p01", PLAN, 2, NullMarkerBackend()
+        )
+        self.assertTrue(interrupted.aborted)
+
+        [checkpoint_file] = self.root.glob("*_checkpoint.json")
+        checkpoint = read_checkpoint(checkpoint_file)
+        self.assertFalse(checkpoint.complete)
+        self.assertEqual(checkpoint.next_segment_index, 2)
+        self.assertEqual(checkpoint.texture_cursors, {"A": [10, 2]})
+
+        resumed = HeadlessPresenter(self.root).resume_experiment(
+            experiment, checkpoint_file, NullMarkerBackend()
+        )
+        self.assertFalse(resumed.aborted)
+        self.assertTrue(resumed.correct)
+        self.assertTrue(read_checkpoint(checkpoint_file).complete)
+        assert resumed.binary_event_log_path is not None
+        with read_event_log(resumed.binary_event_log_path) as log:
+            self.assertEqual(len(log.select(event_type="aborted")["event_codes"]), 1)
+            self.assertEqual(len(log.select(event_type="block_end", condition_id="B")["event_codes"]), 1)
+            self.assertEqual(len(log.select(event_type="block_start", condition_id="B")["event_codes"]), 2)
+
+    def test_interrupt_before_first_block_resumes_at_start(self) -> None:
+        interrupted = HeadlessPresenter(self.root, interrupt_after_frames=0).run_experiment(
+            make_experiment(attention_enabled=True), "p01", PLAN, 2, NullMarkerBackend()
+        )
+        self.assertTrue(interrupted.aborted)
+        [checkpoint_file] = self.root.glob("*_checkpoint.json")
+        self.assertEqual(read_checkpoint(checkpoint_file).next_segment_index, 0)
+
+    def test_slow_checkpoint_writes_do_not_block_frames(self) -> None:
+        def slow_write(path: Path, checkpoint) -> None:
+            time.sleep(0.2)
+            write_checkpoint(path, checkpoint)
+
+        marker = FrameTimingMarker()
+        with mock.patch("fpvs_studio.engine.checkpoint.write_checkpoint", side_effect=slow_write):
+            result = HeadlessPresenter(self.root).run_experiment(
+                make_experiment(attention_enabled=True), "p01", PLAN, 2, marker
+            )
+
+        self.assertFalse(result.aborted)
+        gaps = [later - earlier for earlier, later in zip(marker.frame_times, marker.frame_times[1:])]
+        self.assertLess(max(gaps), 0.1)
+        [checkpoint_file] = self.root.glob("*_checkpoint.json")
+        self.assertTrue(read_checkpoint(checkpoint_file).complete)
+
+    def test_resume_rejects_changed_experiment(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        presenter = HeadlessPresenter(self.root)
+        presenter.run_experiment(experiment, "p01", PLAN, 2, FailingMarker(21))
+        [checkpoint_file] = self.root.glob("*_checkpoint.json")
+
+        experiment.oddball_rate_hz = 2.0
+        with self.assertRaises(ValueError):
+            presenter.resume_experiment(experiment, checkpoint_file, NullMarkerBackend())
+
+    def test_controller_requires_resumable_presenter(self) -> None:
+        with self.assertRaises(ValueError):
+            RunController(DummyPresenter(self.root)).resume_experiment(
+                make_experiment(attention_enabled=True),
+                self.root / "missing.json",
+                RunConfig("p", self.root),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
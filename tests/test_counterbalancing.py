@@ -0,0 +1,103 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.controllers.batch import run_batch
+from fpvs_studio.controllers.counterbalancing import (
+    build_order_table,
+    carryover_counts,
+    latin_square,
+    williams_square,
+)
+from fpvs_studio.controllers.run_controller import RunConfig, RunController
+from fpvs_studio.controllers.scheduling import build_run_plan
+from fpvs_studio.engine.dummy_presenter import DummyPresenter
+
+from factories import make_conditions, make_experiment
+
+
+class SquareTests(unittest.TestCase):
+    def test_latin_square_positions_are_balanced(self) -> None:
+        rows = latin_square(5)
+        for position in range(5):
+            self.assertEqual(sorted(row[position] for row in rows), list(range(5)))
+
+    def test_williams_balances_first_order_carryover(self) -> None:
+        for n_conditions, expected in ((2, 1), (5, 2), (8, 1), (9, 2), (40, 1)):
+            rows = williams_square(n_conditions)
+            counts = carryover_counts(rows, n_conditions)
+            pairs = {
+                counts[i][j] for i in range(n_conditions) for j in range(n_conditions) if i != j
+            }
+            self.assertEqual(pairs, {expected}, n_conditions)
+            self.assertTrue(all(sorted(row) == list(range(n_conditions)) for row in rows))
+
+
+class OrderTableTests(unittest.TestCase):
+    def test_no_repeat_across_cycle_boundaries(self) -> None:
+        table = build_order_table(tuple("ABCDEF"), 6, "williams")
+        self.assertEqual(len(table.sequences), 6)
+        for sequence in table.sequences:
+            for previous, current in zip(sequence, sequence[1:]):
+                self.assertNotEqual(previous[-1], current[0])
+
+    def test_every_cycle_keeps_the_square_balanced(self) -> None:
+        designs = ((3, "williams"), (4, "williams"), (5, "williams"), (4, "latin_square"))
+        for n_conditions, scheme in designs:
+            conditions = tuple(f"C{index}" for index in range(n_conditions))
+            table = build_order_table(conditions, 4, scheme)
+            for cycle in range(4):
+                orders = [
+                    [conditions.index(condition) for condition in sequence[cycle]]
+                    for sequence in table.sequences
+                ]
+                for position in range(n_conditions):
+                    counts = [row[position] for row in orders]
+                    self.assertEqual(
+                        {counts.count(value) for value in range(n_conditions)},
+                        {len(orders) // n_conditions},
+                    )
+                if scheme == "williams":
+                    counts = carryover_counts(orders, n_conditions)
+                    pairs = {
+                        counts[i][j]
+                        for i in range(n_conditions)
+                        for j in range(n_conditions)
+                        if i != j
+                    }
+                    self.assertEqual(len(pairs), 1, (n_conditions, cycle))
+
+    def test_lookup_is_cached_and_cyclic(self) -> None:
+        table = build_order_table(tuple("ABC"), 2, "latin_square")
+        self.assertIs(table, build_order_table(tuple("ABC"), 2, "latin_square"))
+        self.assertEqual(table.cycle_orders(1), table.cycle_orders(4))
+        first_blocks = [table.cycle_orders(index)[0][0] for index in range(3)]
+        self.assertEqual(sorted(first_blocks), ["A", "B", "C"])
+        with self.assertRaises(ValueError):
+            table.cycle_orders(-1)
+
+    def test_build_run_plan_uses_cycle_orders(self) -> None:
+        experiment = make_experiment(make_conditions(("C0", "C1")), num_cycles=2)
+        plan = build_run_plan(experiment, random.Random(0), [("C1", "C0"), ("C0", "C1")])
+        self.assertEqual([segment.condition_id for segment in plan], ["C1", "C0", "C0", "C1"])
+        with self.assertRaises(ValueError):
+            build_run_plan(experiment, random.Random(0), [("C1", "C1"), ("C0", "C1")])
+
+    def test_batch_assigns_orders_by_participant_index(self) -> None:
+        experiment = make_experiment(make_conditions(("C0", "C1", "C2", "C3")), num_cycles=3)
+        table = build_order_table(("C0", "C1", "C2", "C3"), 3, "williams")
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run_batch(experiment, Path(tmp), 5, max_workers=1, counterbalance="williams")
+            with self.assertRaises(ValueError):
+                RunController(DummyPresenter(Path(tmp))).run_experiment(
+                    experiment, RunConfig("p", Path(tmp), counterbalance="williams")
+                )
+        for index, result in enumerate(results):
+            self.assertIsNone(result.error)
+            expected = [condition for order in table.cycle_orders(index) for condition in order]
+            self.assertEqual(result.block_order.split("|"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.engine.dummy_presenter import DummyPresenter, simulate_run_events
+from fpvs_studio.engine.event_buffer import EVENT_CSV_HEADER
+from fpvs_studio.engine.event_log_file import read_event_log
+from fpvs_studio.engine.headless_presenter import HeadlessPresenter
+from fpvs_studio.markers.null_marker import NullMarkerBackend
+
+from factories import make_experiment
+
+
+PLAN = RunPlan(
+    segments=[
+        RunSegment("BLOCK", condition_id="A"),
+        RunSegment("REST", duration_seconds=1),
+        RunSegment("REST"),
+        RunSegment("BLOCK", condition_id="B", duration_seconds=3),
+    ]
+)
+
+
+def without_wall_clock(csv_text: str) -> list[str]:
+    return [line.split(",", 1)[1] for line in csv_text.splitlines()]
+
+
+class FrameAccurateDummyPresenterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_matches_headless_run_frame_for_frame(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        simulated = DummyPresenter(self.root / "dummy", frame_accurate=True).run_experiment(
+            experiment, "p01", PLAN, 4, NullMarkerBackend()
+        )
+        headless = HeadlessPresenter(self.root / "headless").run_experiment(
+            experiment, "p01", PLAN, 4, NullMarkerBackend()
+        )
+
+        assert simulated.event_log_path is not None and headless.event_log_path is not None
+        simulated_text = simulated.event_log_path.read_text()
+        self.assertTrue(simulated_text.startswith(EVENT_CSV_HEADER + "\n"))
+        self.assertEqual(
+            without_wall_clock(simulated_text), without_wall_clock(headless.event_log_path.read_text())
+        )
+
+        assert simulated.binary_event_log_path is not None
+        with read_event_log(simulated.binary_event_log_path) as log:
+            self.assertEqual(len(log.select(event_type="fixation_change")["event_codes"]), 4)
+            self.assertEqual(log.metadata["timing"]["frames_per_second"], 60)
+
+    def test_multi_hour_session(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        plan = RunPlan(
+            segments=[RunSegment("BLOCK", condition_id="A", duration_seconds=60) for _ in range(180)]
+        )
+        timing = experiment.derive_timing()
+        batch = simulate_run_events(experiment, plan, timing, change_frame_indices=[0, 10, 648_000 - 1])
+
+        n_onsets = 180 * 60 * 6
+        self.assertEqual(len(batch), 2 + 2 * 180 + n_onsets + 3 + 1)
+        self.assertEqual(batch.timestamps_ns[-1], 3 * 3600 * 1_000_000_000)
+        self.assertEqual(list(batch.trigger_codes).count(12), n_onsets // 5)
+
+    def test_requires_refresh_rate(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        experiment.monitor_refresh_hz = None
+        with self.assertRaises(ValueError):
+            DummyPresenter(self.root, frame_accurate=True).run_experiment(
+                experiment, "p01", PLAN, 0, NullMarkerBackend()
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
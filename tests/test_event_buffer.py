@@ -0,0 +1,146 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.controllers.scheduling import RunSegment
+from fpvs_studio.engine.event_buffer import (
+    EVENT_CSV_HEADER,
+    LOG_BASE_ONSET,
+    LOG_FIXATION_CHANGE,
+    LOG_INSTRUCTION_START,
+    LOG_PREFETCH_COMPLETE,
+    EventBuffer,
+    experiment_condition_ids,
+    format_event_rows,
+)
+from fpvs_studio.engine.event_log_file import EventLogSpool, read_event_log
+from fpvs_studio.engine.event_log_writer import EventLogWriter
+from fpvs_studio.engine.frame_schedule import FIXATION_TARGET
+from fpvs_studio.models import ConditionModel, ExperimentModel
+
+
+class EventBufferTests(unittest.TestCase):
+    def test_columns_grow_past_capacity(self) -> None:
+        buffer = EventBuffer(capacity=2)
+        for index in range(5):
+            buffer.record(LOG_BASE_ONSET, buffer.anchor_ns + index, cycle_index=index)
+
+        self.assertEqual(buffer.count, 5)
+        self.assertGreaterEqual(buffer.capacity, 5)
+        self.assertEqual(list(buffer.cycle_indices[: buffer.count]), [0, 1, 2, 3, 4])
+
+    def test_csv_resolves_indices_and_monotonic_times(self) -> None:
+        segments = [RunSegment("BLOCK", condition_id="faces")]
+        buffer = EventBuffer(capacity=8)
+        start = buffer.anchor_ns
+        buffer.record(LOG_INSTRUCTION_START, start)
+        buffer.record(LOG_BASE_ONSET, start + 1_500, 0, 0, cycle_index=3, trigger_code=11)
+        buffer.record(
+            LOG_FIXATION_CHANGE, start + 2_000_000, 0, 0, frame_index=42, fixation_state=FIXATION_TARGET
+        )
+        buffer.record(LOG_PREFETCH_COMPLETE, start + 3_000_000, condition_index=1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.csv"
+            buffer.write_csv(path, segments, ["faces", "houses"])
+            lines = path.read_text().splitlines()
+
+        self.assertEqual(lines[0], EVENT_CSV_HEADER)
+        rows = [line.split(",") for line in lines[1:]]
+        self.assertEqual(rows[0][1:], ["instruction_start", "", "", "", "", "", "", "0"])
+        self.assertEqual(rows[1][1:], ["base_onset", "BLOCK", "faces", "3", "11", "", "", "1500"])
+        self.assertEqual(rows[2][1:], ["fixation_change", "BLOCK", "faces", "", "", "42", "target", "2000000"])
+        self.assertEqual(rows[3][1:4], ["prefetch_complete", "", "houses"])
+        self.assertEqual(
+            buffer.wall_time(start + 2_000_000) - buffer.wall_time(start),
+            buffer.wall_time(start + 2_000_000) - buffer.anchor_wall,
+        )
+
+    def test_condition_indices_follow_experiment_conditions(self) -> None:
+        experiment = ExperimentModel(
+            experiment_id="exp",
+            name="Example",
+            base_rate_hz=6.0,
+            oddball_rate_hz=1.2,
+            image_on_ms=50.0,
+            blank_ms=0.0,
+            block_duration_seconds=2,
+            num_cycles=1,
+            randomize_within_cycle=False,
+            rest_enabled=False,
+            rest_default_seconds=0,
+            attention_enabled=False,
+            fixation_min_changes=0,
+            fixation_max_changes=0,
+            conditions=[
+                ConditionModel("houses", "Houses", 21, 22, Path("base_h"), Path("odd_h")),
+                ConditionModel("faces", "Faces", 11, 12, Path("base_f"), Path("odd_f")),
+            ],
+        )
+
+        self.assertEqual(experiment_condition_ids(experiment), ["houses", "faces"])
+
+
+class EventLogWriterTests(unittest.TestCase):
+    def test_batches_are_appended_in_order(self) -> None:
+        segments = [RunSegment("BLOCK", condition_id="faces")]
+        buffer = EventBuffer(capacity=4)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.csv"
+            writer = EventLogWriter(
+                path,
+                EVENT_CSV_HEADER,
+                lambda batch: format_event_rows(
+                    batch, buffer.anchor_wall, buffer.anchor_ns, segments, ["faces"]
+                ),
+            )
+            self.assertEqual(path.read_text(), EVENT_CSV_HEADER + "\n")
+
+            buffer.record(LOG_INSTRUCTION_START, buffer.anchor_ns)
+            writer.submit(buffer.take())
+            for cycle in range(2):
+                buffer.record(LOG_BASE_ONSET, buffer.anchor_ns + 10 + cycle, 0, 0, cycle_index=cycle)
+            writer.submit(buffer.take())
+            writer.close()
+            lines = path.read_text().splitlines()
+
+        self.assertEqual(buffer.count, 0)
+        self.assertEqual([line.split(",")[1] for line in lines[1:]], ["instruction_start", "base_onset", "base_onset"])
+        self.assertEqual([line.split(",")[4] for line in lines[2:]], ["0", "1"])
+
+    def test_batches_are_spooled_into_the_binary_log(self) -> None:
+        buffer = EventBuffer(capacity=2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            binary_path = Path(tmp) / "events.fpvsev"
+            writer = EventLogWriter(
+                Path(tmp) / "events.csv",
+                EVENT_CSV_HEADER,
+                lambda batch: [],
+                binary_log=EventLogSpool(binary_path, {"experiment_id": "exp"}),
+            )
+            for cycle in range(5):
+                buffer.record(LOG_BASE_ONSET, buffer.anchor_ns + cycle, 0, 0, cycle_index=cycle)
+                if cycle % 2:
+                    writer.submit(buffer.take())
+            writer.submit(buffer.take())
+            self.assertFalse(binary_path.exists())
+            writer.close()
+
+            with read_event_log(binary_path) as log:
+                self.assertEqual(log.metadata["experiment_id"], "exp")
+                self.assertEqual(list(log.columns["cycle_indices"]), [0, 1, 2, 3, 4])
+            self.assertEqual(
+                sorted(path.name for path in Path(tmp).iterdir()), ["events.csv", "events.fpvsev"]
+            )
+        self.assertEqual(buffer.capacity, 2)
+
+    def test_rejects_unknown_fsync_policy(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                EventLogWriter(Path(tmp) / "events.csv", EVENT_CSV_HEADER, list, fsync_policy="always")  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":
+    unittest.main()
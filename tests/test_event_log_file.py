@@ -0,0 +1,88 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.controllers.scheduling import build_run_plan
+from fpvs_studio.engine.dummy_presenter import DummyPresenter
+from fpvs_studio.engine.event_buffer import LOG_BASE_ONSET, LOG_ODDBALL_ONSET, EventBuffer
+from fpvs_studio.engine.event_log_file import read_event_log, write_event_log
+from fpvs_studio.markers.null_marker import NullMarkerBackend
+from fpvs_studio.models import ConditionModel, ExperimentModel
+
+
+class EventLogFileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_round_trip_and_filters(self) -> None:
+        buffer = EventBuffer(capacity=4)
+        buffer.record(LOG_BASE_ONSET, 100, 0, 0, cycle_index=0, trigger_code=1)
+        buffer.record(LOG_ODDBALL_ONSET, 200, 0, 0, cycle_index=1, trigger_code=2)
+        buffer.record(LOG_BASE_ONSET, 300, 2, 1, cycle_index=0, trigger_code=3)
+        path = self.root / "events.fpvsev"
+        write_event_log(path, buffer.snapshot(), {"experiment_id": "exp", "condition_ids": ["A", "B"]})
+
+        with read_event_log(path) as log:
+            self.assertEqual(len(log), 3)
+            self.assertEqual(log.metadata["experiment_id"], "exp")
+            self.assertEqual(list(log.columns["timestamps_ns"]), [100, 200, 300])
+            self.assertEqual(list(log.select(event_type="base_onset")["trigger_codes"]), [1, 3])
+            self.assertEqual(list(log.select(condition_id="A")["cycle_indices"]), [0, 1])
+            self.assertEqual(
+                list(log.select(event_type="base_onset", segment_index=2)["timestamps_ns"]), [300]
+            )
+            self.assertEqual(len(log.select(condition_id="missing")["event_codes"]), 0)
+
+    def test_rejects_other_files(self) -> None:
+        path = self.root / "events.fpvsev"
+        path.write_bytes(b"timestamp,event_type\n" + b"\0" * 32)
+        with self.assertRaises(ValueError):
+            read_event_log(path)
+
+    def test_dummy_presenter_writes_binary_log(self) -> None:
+        conditions = [
+            ConditionModel("A", "A", 1, 2, Path("/tmp/base_a"), Path("/tmp/odd_a")),
+            ConditionModel("B", "B", 3, 4, Path("/tmp/base_b"), Path("/tmp/odd_b")),
+        ]
+        experiment = ExperimentModel(
+            experiment_id="exp",
+            name="Example",
+            base_rate_hz=6.0,
+            oddball_rate_hz=1.2,
+            image_on_ms=166.0,
+            blank_ms=0.0,
+            block_duration_seconds=60,
+            num_cycles=1,
+            randomize_within_cycle=False,
+            rest_enabled=False,
+            rest_default_seconds=0,
+            attention_enabled=False,
+            fixation_min_changes=0,
+            fixation_max_changes=0,
+            instruction_text="",
+            attention_question_text="",
+            conditions=conditions,
+        )
+        plan = build_run_plan(experiment, random.Random(1))
+        result = DummyPresenter(self.root).run_experiment(experiment, "p01", plan, 0, NullMarkerBackend())
+
+        assert result.binary_event_log_path is not None
+        with read_event_log(result.binary_event_log_path) as log:
+            self.assertEqual(len(log), 2 * len(plan.segments))
+            self.assertEqual(log.metadata["participant_id"], "p01")
+            block_starts = log.select(event_type="block_start")
+            self.assertEqual(
+                [log.condition_ids[index] for index in block_starts["condition_indices"]],
+                [segment.condition_id for segment in plan.segments if segment.segment_type == "BLOCK"],
+            )
+            ends = log.select(event_type="block_end")["timestamps_ns"]
+            self.assertEqual(ends[0] - block_starts["timestamps_ns"][0], 60_000_000_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
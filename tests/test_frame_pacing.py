@@ -0,0 +1,70 @@
+import unittest
+
+from fpvs_studio.engine.frame_pacing import FramePacer
+from fpvs_studio.engine.frame_timing import FrameTimingRecorder
+
+PERIOD_NS = 16_666_667
+
+
+class FramePacerTests(unittest.TestCase):
+    def test_extend_policy_advances_one_frame_per_flip(self) -> None:
+        pacer = FramePacer(60, "extend")
+        advances = [pacer.on_flip(t) for t in (0, PERIOD_NS, 2 * PERIOD_NS, 5 * PERIOD_NS)]
+
+        self.assertEqual(advances, [1, 1, 1, 1])
+        self.assertEqual(pacer.missed_refreshes, 2)
+
+    def test_catch_up_policy_skips_missed_frames(self) -> None:
+        pacer = FramePacer(60, "catch_up")
+        advances = [pacer.on_flip(t) for t in (0, PERIOD_NS, 4 * PERIOD_NS, 5 * PERIOD_NS)]
+
+        self.assertEqual(advances, [1, 1, 3, 1])
+        self.assertEqual(pacer.missed_refreshes, 2)
+
+    def test_jitter_below_threshold_is_not_a_miss(self) -> None:
+        pacer = FramePacer(60, "catch_up")
+        pacer.on_flip(0)
+
+        self.assertEqual(pacer.on_flip(int(PERIOD_NS * 1.4)), 1)
+        self.assertEqual(pacer.missed_refreshes, 0)
+
+    def test_uncounted_flips_advance_without_counting_misses(self) -> None:
+        pacer = FramePacer(60, "catch_up")
+        pacer.on_flip(0)
+
+        self.assertEqual(pacer.on_flip(600 * PERIOD_NS, count_misses=False), 600)
+        self.assertEqual(pacer.on_flip(603 * PERIOD_NS), 3)
+        self.assertEqual(pacer.missed_refreshes, 2)
+
+    def test_rejects_unknown_policy(self) -> None:
+        with self.assertRaises(ValueError):
+            FramePacer(60, "drop")  # type: ignore[arg-type]
+
+
+class FrameTimingRecorderTests(unittest.TestCase):
+    def test_summary_counts_drops_per_block_and_condition(self) -> None:
+        recorder = FrameTimingRecorder(capacity=6, refresh_hz=60)
+        flips = [(0, 0), (0, PERIOD_NS), (0, 3 * PERIOD_NS), (2, 100 * PERIOD_NS), (2, 101 * PERIOD_NS)]
+        for frame, (segment_index, flip_ns) in enumerate(flips):
+            recorder.record(segment_index, frame, flip_ns - 1000, 500, flip_ns)
+
+        summary = recorder.summarize({0: "A", 2: "B"})
+
+        self.assertEqual(summary.run.n_frames, 5)
+        self.assertEqual(summary.run.n_intervals, 3)
+        self.assertEqual(summary.run.dropped_frames, 1)
+        self.assertEqual(summary.by_segment[0].dropped_frames, 1)
+        self.assertEqual(summary.by_condition["B"].dropped_frames, 0)
+        self.assertAlmostEqual(summary.by_segment[0].max_lateness_ms, PERIOD_NS / 1_000_000, places=3)
+
+    def test_record_beyond_capacity_is_counted_not_stored(self) -> None:
+        recorder = FrameTimingRecorder(capacity=1, refresh_hz=60)
+        recorder.record(0, 0, 0, 0, 0)
+        recorder.record(0, 1, 0, 0, PERIOD_NS)
+
+        self.assertEqual(recorder.count, 1)
+        self.assertEqual(recorder.overflow, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
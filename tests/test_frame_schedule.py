@@ -0,0 +1,110 @@
+import unittest
+
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.engine.frame_schedule import (
+    EVENT_BASE_ONSET,
+    EVENT_NONE,
+    EVENT_ODDBALL_ONSET,
+    FIXATION_BASE,
+    FIXATION_TARGET,
+    NO_TEXTURE,
+    NO_TRIGGER,
+    compile_block_schedule,
+    compile_run_schedules,
+)
+from fpvs_studio.models import ConditionModel, ExperimentModel
+
+
+class CompileBlockScheduleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.experiment = ExperimentModel(
+            experiment_id="exp",
+            name="Example",
+            base_rate_hz=6.0,
+            oddball_rate_hz=1.2,
+            image_on_ms=50.0,
+            blank_ms=0.0,
+            block_duration_seconds=2,
+            num_cycles=1,
+            randomize_within_cycle=False,
+            rest_enabled=False,
+            rest_default_seconds=0,
+            attention_enabled=True,
+            fixation_min_changes=0,
+            fixation_max_changes=0,
+            monitor_refresh_hz=60,
+            conditions=[
+                ConditionModel(
+                    id="A",
+                    label="Condition A",
+                    trigger_code_base=1,
+                    trigger_code_oddball=2,
+                    base_image_dir="/tmp/base_a",
+                    oddball_image_dir="/tmp/odd_a",
+                ),
+                ConditionModel(
+                    id="B",
+                    label="Condition B",
+                    trigger_code_base=3,
+                    trigger_code_oddball=4,
+                    base_image_dir="/tmp/base_b",
+                    oddball_image_dir="/tmp/odd_b",
+                ),
+            ],
+        )
+        self.timing = self.experiment.derive_timing()
+
+    def test_onsets_textures_and_triggers(self) -> None:
+        schedule = compile_block_schedule(
+            condition_id="A",
+            n_frames=120,
+            timing=self.timing,
+            trigger_code_base=1,
+            trigger_code_oddball=2,
+            n_base_textures=3,
+            n_oddball_textures=2,
+        )
+
+        onsets = [frame for frame in range(120) if schedule.event_types[frame] != EVENT_NONE]
+        self.assertEqual(onsets, list(range(0, 120, 10)))
+        self.assertEqual(schedule.event_types[40], EVENT_ODDBALL_ONSET)
+        self.assertEqual(schedule.event_types[30], EVENT_BASE_ONSET)
+        self.assertEqual(schedule.trigger_codes[40], 2)
+        self.assertEqual(schedule.trigger_codes[41], NO_TRIGGER)
+
+        # Base textures cycle 0, 1, 2, 0; the first oddball uses id n_base + 0.
+        self.assertEqual([schedule.texture_ids[f] for f in (0, 10, 20, 30, 40)], [0, 1, 2, 0, 3])
+        self.assertEqual(schedule.texture_ids[2], 0)
+        self.assertEqual(schedule.texture_ids[3], NO_TEXTURE)
+        self.assertEqual(schedule.cycle_indices[119], 11)
+
+    def test_fixation_state_carries_across_blocks(self) -> None:
+        plan = RunPlan(
+            segments=[
+                RunSegment(segment_type="BLOCK", condition_id="A", duration_seconds=1),
+                RunSegment(segment_type="REST", duration_seconds=5),
+                RunSegment(segment_type="BLOCK", condition_id="B", duration_seconds=1),
+            ]
+        )
+
+        schedules = compile_run_schedules(
+            self.experiment,
+            plan,
+            self.timing,
+            {"A": (2, 2), "B": (2, 2)},
+            change_frame_indices=[30, 90],
+        )
+
+        first, rest, second = schedules
+        self.assertIsNone(rest)
+        self.assertEqual(second.frame_offset, 60)
+        self.assertEqual(first.fixation_states[29], FIXATION_BASE)
+        self.assertEqual(first.fixation_states[59], FIXATION_TARGET)
+        self.assertEqual(second.fixation_states[0], FIXATION_TARGET)
+        self.assertTrue(second.fixation_changes[30])
+        self.assertEqual(second.fixation_states[30], FIXATION_BASE)
+        self.assertEqual(second.trigger_codes[0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
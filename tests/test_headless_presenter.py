@@ -0,0 +1,130 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.config.serialization import experiment_to_dict, load_experiment
+from fpvs_studio.controllers.run_controller import RunConfig, RunController
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.controllers.validation import validate_experiment
+from fpvs_studio.engine.event_log_file import read_event_log
+from fpvs_studio.engine.headless_presenter import HeadlessPresenter
+from fpvs_studio.engine.run_session import KEY_ANY, KEY_BACKSPACE, KEY_ENTER, KEY_NO, KEY_YES
+from fpvs_studio.markers.null_marker import NullMarkerBackend
+
+from factories import make_experiment
+
+
+PLAN = RunPlan(
+    segments=[
+        RunSegment("BLOCK", condition_id="A"),
+        RunSegment("REST", duration_seconds=1),
+        RunSegment("BLOCK", condition_id="B"),
+    ]
+)
+
+
+class RecordingMarker(NullMarkerBackend):
+    def __init__(self) -> None:
+        self.codes: list[int] = []
+
+    def send(self, code: int) -> None:
+        self.codes.append(code)
+
+
+def strip_timestamps(csv_text: str) -> list[str]:
+    return [",".join(line.split(",")[1:-1]) for line in csv_text.splitlines()]
+
+
+class HeadlessPresenterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_runs_without_pyglet_and_answers_attention_prompt(self) -> None:
+        marker = RecordingMarker()
+        result = HeadlessPresenter(self.root / "a").run_experiment(
+            make_experiment(attention_enabled=True), "p01", PLAN, 3, marker
+        )
+
+        self.assertFalse(result.aborted)
+        self.assertTrue(result.confirmed)
+        self.assertEqual(result.reported_change_count, 3)
+        self.assertTrue(result.correct)
+        self.assertEqual(marker.codes.count(0), 4)
+        self.assertEqual(marker.codes.count(12), 2)
+        self.assertEqual(marker.codes.count(21), 10)
+
+        assert result.binary_event_log_path is not None
+        with read_event_log(result.binary_event_log_path) as log:
+            self.assertEqual(len(log.select(event_type="fixation_change")["event_codes"]), 3)
+            rest_start = log.select(event_type="rest_start")["timestamps_ns"][0]
+            rest_end = log.select(event_type="rest_end")["timestamps_ns"][0]
+        self.assertEqual(rest_end - rest_start, 1_000_000_000)
+
+    def test_event_logs_are_identical_apart_from_timestamps(self) -> None:
+        first = HeadlessPresenter(self.root / "a").run_experiment(
+            make_experiment(attention_enabled=True), "p01", PLAN, 2, NullMarkerBackend()
+        )
+        second = HeadlessPresenter(self.root / "b").run_experiment(
+            make_experiment(attention_enabled=True), "p01", PLAN, 2, NullMarkerBackend()
+        )
+
+        assert first.event_log_path is not None and second.event_log_path is not None
+        first_rows = strip_timestamps(first.event_log_path.read_text())
+        self.assertEqual(first_rows, strip_timestamps(second.event_log_path.read_text()))
+        self.assertEqual(first_rows[1], "instruction_start,,,,,,")
+        self.assertEqual(first_rows[-1], "run_complete,,,,,,")
+
+    def test_experiment_saved_before_fixation_constraints_runs(self) -> None:
+        experiment = make_experiment(attention_enabled=True)
+        experiment.fixation_min_changes = experiment.fixation_max_changes = 4
+        data = experiment_to_dict(experiment)
+        for key in ("fixation_min_gap_ms", "fixation_edge_margin_ms"):
+            del data[key]
+        del data["fixation_max_changes_per_block"]
+        path = self.root / "experiment.json"
+        path.write_text(json.dumps(data))
+
+        restored = load_experiment(path)
+        self.assertEqual(validate_experiment(restored).errors, ())
+        result = RunController(HeadlessPresenter(self.root / "run")).run_experiment(
+            restored, RunConfig("p01", self.root / "run", rng_seed=1)
+        )
+
+        self.assertFalse(result.aborted)
+        assert result.binary_event_log_path is not None
+        with read_event_log(result.binary_event_log_path) as log:
+            changes = log.select(event_type="fixation_change")
+            segments = list(changes["segment_indices"])
+            frames = list(changes["frame_indices"])
+        # Two 120-frame blocks: four changes evenly spaced over 240 block frames.
+        self.assertEqual(len(set(segments)), 2)
+        self.assertEqual(frames, [48, 96, 144, 192])
+
+    def test_scripted_keys_edit_the_response(self) -> None:
+        keys = [KEY_ANY, "4", KEY_BACKSPACE, "1", KEY_ENTER, KEY_NO, "2", KEY_ENTER, KEY_YES, KEY_ANY]
+        result = HeadlessPresenter(self.root, key_script=keys).run_experiment(
+            make_experiment(attention_enabled=True), "p01", PLAN, 2, NullMarkerBackend()
+        )
+
+        self.assertFalse(result.aborted)
+        self.assertEqual(result.reported_change_count, 2)
+        self.assertTrue(result.correct)
+
+    def test_exhausted_key_script_aborts(self) -> None:
+        result = HeadlessPresenter(self.root, key_script=[KEY_ANY]).run_experiment(
+            make_experiment(attention_enabled=True), "p01", PLAN, 2, NullMarkerBackend()
+        )
+
+        self.assertTrue(result.aborted)
+        self.assertIn("attention_input", result.abort_reason or "")
+        assert result.event_log_path is not None
+        self.assertEqual(result.event_log_path.read_text().splitlines()[-1].split(",")[1], "aborted")
+
+
+if __name__ == "__main__":
+    unittest.main()
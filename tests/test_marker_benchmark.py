@@ -0,0 +1,83 @@
+import unittest
+from typing import Optional
+
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.markers.benchmark import (
+    STAND_IN_BACKENDS,
+    benchmark_backend,
+    benchmark_stand_ins,
+    run_send_pattern,
+)
+from fpvs_studio.markers.loopback import LoopbackServer, LoopbackSocketBackend
+
+from factories import make_conditions, make_experiment
+
+
+class RunSendPatternTests(unittest.TestCase):
+    def test_matches_block_triggers_and_rest_frames(self) -> None:
+        experiment = make_experiment(make_conditions(("A",)))
+        plan = RunPlan(
+            segments=[
+                RunSegment("BLOCK", condition_id="A"),
+                RunSegment("REST", duration_seconds=1),
+                RunSegment("BLOCK", condition_id="A"),
+            ]
+        )
+        sends = run_send_pattern(experiment, plan, experiment.derive_timing())
+
+        first_block = sends[:14]
+        self.assertEqual(first_block[0], (0, 0))
+        self.assertEqual([code for _, code in first_block[1:6]], [11, 11, 11, 11, 12])
+        self.assertEqual([frame for frame, _ in first_block[1:4]], [0, 10, 20])
+        self.assertEqual(first_block[-1], (120, 0))
+        self.assertEqual(sends[14], (180, 0))
+        self.assertEqual(len(sends), 28)
+
+
+class FrameRecordingBackend:
+    def __init__(self) -> None:
+        self.calls: list[object] = []
+
+    def send(self, code: int) -> None:
+        self.calls.append(code)
+
+    def on_frame(self, now_ns: Optional[int] = None) -> None:
+        self.calls.append("frame")
+
+    def close(self) -> None:
+        pass
+
+
+class MarkerBenchmarkTests(unittest.TestCase):
+    def test_stand_ins_receive_every_send(self) -> None:
+        sends = [(frame, 11) for frame in range(50)]
+        results = benchmark_stand_ins(sends, refresh_hz=60, speed=None)
+
+        self.assertEqual([result.backend_name for result in results], list(STAND_IN_BACKENDS))
+        for result in results:
+            self.assertEqual(result.n_sends, 50)
+            self.assertIsNotNone(result.latency_p99_us)
+            self.assertLessEqual(result.latency_p50_us, result.latency_max_us)
+
+    def test_loopback_server_records_payloads(self) -> None:
+        with LoopbackServer("tcp") as server:
+            backend = LoopbackSocketBackend(server.address)
+            result = benchmark_backend(backend, [(0, 1), (0, 2), (1, 3)], refresh_hz=1000, speed=10.0)
+            backend.close()
+            self.assertTrue(server.wait_for(6))
+            self.assertEqual(server.received, b"\x01\x00\x02\x00\x03\x00")
+        self.assertEqual(result.backend_name, "LoopbackSocketBackend")
+        self.assertEqual(result.n_frames, 0)
+
+    def test_frame_synced_backends_get_every_flip(self) -> None:
+        backend = FrameRecordingBackend()
+        result = benchmark_backend(backend, [(2, 1), (2, 2), (4, 3)], refresh_hz=60, speed=None)
+
+        self.assertEqual(backend.calls, [1, 2, "frame", "frame", 3, "frame"])
+        self.assertEqual(result.n_sends, 3)
+        self.assertEqual(result.n_frames, 3)
+        self.assertIsNotNone(result.frame_latency_max_us)
+
+
+if __name__ == "__main__":
+    unittest.main()
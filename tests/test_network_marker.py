@@ -0,0 +1,202 @@
+import socket
+import time
+import unittest
+from unittest import mock
+
+from fpvs_studio.markers.loopback import LoopbackServer
+from fpvs_studio.markers.network_marker import (
+    NetworkMarkerBackend,
+    decode_marker_messages,
+    encode_marker_message,
+)
+
+
+class WireFormatTests(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        data = encode_marker_message(7, [11]) + encode_marker_message(8, [0, 12, 65535])
+
+        self.assertEqual(len(data), 6 + 10)
+        self.assertEqual(decode_marker_messages(data), [(7, [11]), (8, [0, 12, 65535])])
+
+    def test_rejects_truncated_and_empty_messages(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_marker_messages(encode_marker_message(1, [11, 12])[:-1])
+        with self.assertRaises(ValueError):
+            encode_marker_message(1, [])
+
+
+class NetworkMarkerBackendTests(unittest.TestCase):
+    def test_tcp_uses_one_connection_with_low_latency(self) -> None:
+        with LoopbackServer("tcp") as server:
+            backend = NetworkMarkerBackend(*server.address)
+            send_ns = []
+            for code in (0, 11, 12, 0):
+                send_ns.append(time.perf_counter_ns())
+                backend.send(code)
+                self.assertTrue(server.wait_for(6 * len(send_ns)))
+            backend.close()
+
+            self.assertEqual(server.connections, 1)
+            messages = decode_marker_messages(server.received)
+            self.assertEqual([codes for _, codes in messages], [[0], [11], [12], [0]])
+            self.assertEqual([sequence for sequence, _ in messages], [0, 1, 2, 3])
+            latencies_ms = [
+                (arrival - sent) / 1_000_000 for arrival, sent in zip(server.arrival_ns, send_ns)
+            ]
+            self.assertLess(max(latencies_ms), 50.0)
+
+    def test_udp_round_trip_latency(self) -> None:
+        with LoopbackServer("udp", echo=True) as server:
+            backend = NetworkMarkerBackend(*server.address, transport="udp")
+            sock = backend._socket
+            assert sock is not None
+            sock.settimeout(1.0)
+            round_trips_ms = []
+            for code in range(20):
+                start = time.perf_counter_ns()
+                backend.send(code)
+                echoed = sock.recv(64)
+                round_trips_ms.append((time.perf_counter_ns() - start) / 1_000_000)
+                self.assertEqual(decode_marker_messages(echoed)[0][1], [code])
+            backend.close()
+
+        self.assertLess(sorted(round_trips_ms)[len(round_trips_ms) // 2], 10.0)
+
+    def test_coalesces_sends_within_a_frame(self) -> None:
+        with LoopbackServer("tcp") as server:
+            backend = NetworkMarkerBackend(*server.address, coalesce=True)
+            backend.send(0)
+            backend.send(11)
+            time.sleep(0.01)
+            self.assertEqual(server.received, b"")
+            backend.on_frame()
+            backend.send(12)
+            backend.close()
+            self.assertTrue(server.wait_for(8 + 6))
+
+            self.assertEqual(
+                [codes for _, codes in decode_marker_messages(server.received)], [[0, 11], [12]]
+            )
+
+    def test_reconnects_after_connection_loss(self) -> None:
+        with LoopbackServer("tcp") as server:
+            backend = NetworkMarkerBackend(*server.address, backoff_initial_s=0.01)
+            backend.send(1)
+            self.assertTrue(server.wait_for(6))
+            server.drop_client()
+
+            deadline = time.monotonic() + 5.0
+            while backend.reconnects == 0 and time.monotonic() < deadline:
+                backend.send(2)
+                time.sleep(0.005)
+            backend.send(3)
+            backend.close()
+            self.assertEqual(backend.reconnects, 1)
+
+            deadline = time.monotonic() + 5.0
+            while decode_marker_messages(server.received)[-1][1] != [3] and time.monotonic() < deadline:
+                time.sleep(0.001)
+            self.assertEqual(server.connections, 2)
+            self.assertEqual(decode_marker_messages(server.received)[-1][1], [3])
+
+    def test_reconnect_never_blocks_the_caller(self) -> None:
+        with LoopbackServer("tcp") as server:
+            backend = NetworkMarkerBackend(
+                *server.address, backoff_initial_s=0.0, connect_timeout_s=0.05
+            )
+            backend.send(1)
+            self.assertTrue(server.wait_for(6))
+            server.drop_client()
+
+            # A connect that never completes, as when the acquisition PC is off the network.
+            slowest_s = 0.0
+            with mock.patch(
+                "fpvs_studio.markers.network_marker.select.select", return_value=([], [], [])
+            ), mock.patch.object(NetworkMarkerBackend, "_connect", side_effect=AssertionError):
+                deadline = time.monotonic() + 0.3
+                while time.monotonic() < deadline:
+                    start = time.perf_counter()
+                    backend.send(2)
+                    backend.on_frame()
+                    slowest_s = max(slowest_s, time.perf_counter() - start)
+                    time.sleep(0.001)
+            self.assertFalse(backend.connected)
+            self.assertEqual(backend.reconnects, 0)
+            self.assertGreater(backend.dropped_codes, 0)
+            self.assertLess(slowest_s, 0.02)
+
+            deadline = time.monotonic() + 5.0
+            while not backend.connected and time.monotonic() < deadline:
+                backend.on_frame()
+                time.sleep(0.001)
+            backend.send(3)
+            backend.close()
+            self.assertEqual(backend.reconnects, 1)
+            deadline = time.monotonic() + 5.0
+            while decode_marker_messages(server.received)[-1][1] != [3] and time.monotonic() < deadline:
+                time.sleep(0.001)
+            self.assertEqual(decode_marker_messages(server.received)[-1][1], [3])
+
+    def test_close_releases_socket(self) -> None:
+        with LoopbackServer("tcp") as server:
+            backend = NetworkMarkerBackend(*server.address)
+            sock = backend._socket
+            backend.close()
+            backend.close()
+
+            self.assertFalse(backend.connected)
+            self.assertEqual(sock.fileno(), -1)
+            with self.assertRaises(RuntimeError):
+                backend.send(1)
+
+    def test_initial_connect_is_retried_with_backoff(self) -> None:
+        connected = mock.MagicMock()
+        with mock.patch.object(
+            NetworkMarkerBackend, "_connect", side_effect=[OSError(), OSError(), connected]
+        ) as connect, mock.patch("fpvs_studio.markers.network_marker.time.sleep") as sleep:
+            backend = NetworkMarkerBackend("127.0.0.1", 1, backoff_initial_s=0.01)
+
+        self.assertEqual(connect.call_count, 3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.01, 0.02])
+        self.assertIs(backend._socket, connected)
+        self.assertEqual(backend._backoff_s, 0.01)
+
+    def test_stalled_receiver_drops_codes_instead_of_blocking(self) -> None:
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        try:
+            backend = NetworkMarkerBackend(
+                *listener.getsockname(), coalesce=True, send_timeout_s=0.005, backoff_initial_s=10.0
+            )
+            assert backend._socket is not None
+            backend._socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+            slowest_s = 0.0
+            for _ in range(100_000):
+                for code in range(255):
+                    backend.send(code)
+                start = time.perf_counter()
+                backend.on_frame()
+                slowest_s = max(slowest_s, time.perf_counter() - start)
+                if backend.dropped_codes:
+                    break
+            backend.close()
+        finally:
+            listener.close()
+
+        self.assertEqual(backend.dropped_codes, 255)
+        self.assertFalse(backend.connected)
+        self.assertLess(slowest_s, 0.5)
+
+    def test_initial_connection_failure_raises(self) -> None:
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        address = probe.getsockname()
+        probe.close()
+        with self.assertRaises(OSError):
+            NetworkMarkerBackend(*address, backoff_initial_s=0.001)
+
+
+if __name__ == "__main__":
+    unittest.main()
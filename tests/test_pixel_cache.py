@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fpvs_studio.config.asset_index import file_sha256
+from fpvs_studio.engine.pixel_cache import DecodedPixelCache
+from fpvs_studio.engine.stimulus_loading import DecodedImage
+
+
+def fake_decode(path: Path) -> DecodedImage:
+    return DecodedImage(path=path, width=2, height=1, data=path.read_bytes()[:1] * 8)
+
+
+class DecodedPixelCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cache = DecodedPixelCache(self.root / "cache", max_bytes=1024)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, content: bytes) -> Path:
+        path = self.root / name
+        path.write_bytes(content)
+        return path
+
+    def test_entries_are_keyed_by_content(self) -> None:
+        first = self._write("a.png", b"A-content")
+        copy = self._write("copy.png", b"A-content")
+        other = self._write("b.png", b"B-content")
+
+        self.assertEqual(self.cache.entry_key(first, "rgba"), self.cache.entry_key(copy, "rgba"))
+        self.assertNotEqual(self.cache.entry_key(first, "rgba"), self.cache.entry_key(other, "rgba"))
+        self.assertNotEqual(
+            self.cache.entry_key(first, "rgba"), self.cache.entry_key(first, "rgba|1920x1080|fit")
+        )
+
+    def test_warm_load_is_memory_mapped_without_decoding(self) -> None:
+        paths = [self._write("a.png", b"A"), self._write("b.png", b"B")]
+        cold = self.cache.load_images(paths, decoder=fake_decode, max_workers=1)
+
+        def fail_decode(path: Path) -> DecodedImage:
+            raise AssertionError("warm load must not decode")
+
+        warm = self.cache.load_images(paths, decoder=fail_decode, max_workers=1)
+
+        self.assertEqual([bytes(image.data) for image in warm], [bytes(image.data) for image in cold])
+        self.assertEqual((warm[0].width, warm[0].height), (2, 1))
+        self.assertEqual(warm[1].path, paths[1])
+
+    def test_unchanged_sources_are_not_rehashed(self) -> None:
+        paths = [self._write("a.png", b"A"), self._write("b.png", b"B")]
+        self.cache.load_images(paths, decoder=fake_decode, max_workers=1)
+
+        with mock.patch(
+            "fpvs_studio.engine.pixel_cache.file_sha256", side_effect=file_sha256
+        ) as hashed:
+            reopened = DecodedPixelCache(self.cache.cache_dir, max_bytes=1024)
+            reopened.load_images(paths, decoder=fake_decode, max_workers=1)
+            self.assertEqual(hashed.call_count, 0)
+
+            paths[1].write_bytes(b"C-edited")
+            reopened.load_images(paths, decoder=fake_decode, max_workers=1)
+            self.assertEqual([call.args[0] for call in hashed.call_args_list], [paths[1]])
+
+    def test_eviction_removes_least_recently_used_entries(self) -> None:
+        cache = DecodedPixelCache(self.root / "small", max_bytes=2 * (16 + 8))
+        paths = [self._write(f"{name}.png", name.encode()) for name in "abc"]
+        keys = [cache.entry_key(path, "rgba") for path in paths]
+        for age, (key, path) in enumerate(zip(keys, paths)):
+            cache.put(key, fake_decode(path))
+            entry = cache.cache_dir / f"{key}.fpvspix"
+            os.utime(entry, ns=(age * 10**9, age * 10**9))
+
+        cache.evict()
+
+        self.assertIsNone(cache.get(keys[0], paths[0]))
+        self.assertIsNotNone(cache.get(keys[2], paths[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
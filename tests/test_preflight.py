@@ -0,0 +1,144 @@
+import importlib.util
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+from fpvs_studio.config.asset_index import image_dimensions
+from fpvs_studio.config.serialization import save_experiment
+from fpvs_studio.controllers.preflight import (
+    ImageCheck,
+    check_image,
+    main,
+    preflight_cache_path,
+    preflight_experiment,
+)
+from fpvs_studio.models import ConditionModel
+
+from factories import make_experiment
+
+
+def png_bytes(width: int, height: int, color_type: int = 6) -> bytes:
+    """Return a valid black PNG (color type 6 is RGBA, 2 is RGB)."""
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        crc = zlib.crc32(kind + payload)
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", crc)
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    row = bytes(1 + width * (4 if color_type == 6 else 3))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+
+
+def fake_check(path: Path) -> ImageCheck:
+    """Header-only stand-in for the pyglet decoder: 'bad' files fail, color type is the mode."""
+
+    if "bad" in path.name:
+        return ImageCheck(decode_s=0.5, error="ImageDecodeException: truncated")
+    width, height = image_dimensions(path)
+    return ImageCheck(width, height, "RGBA" if path.read_bytes()[25] == 6 else "RGB", 0.5)
+
+
+class PreflightTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "base").mkdir()
+        (self.root / "odd").mkdir()
+        for index in range(3):
+            (self.root / "base" / f"b{index}.png").write_bytes(png_bytes(64, 32 + index % 2))
+        (self.root / "odd" / "o0.png").write_bytes(png_bytes(64, 32))
+        self.experiment = make_experiment(
+            [ConditionModel("A", "A", 11, 12, self.root / "base", self.root / "odd")]
+        )
+        self.cache = self.root / "exp.preflight.json"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_clean_set_reports_memory_and_uses_cache(self) -> None:
+        (self.root / "base" / "b1.png").write_bytes(png_bytes(64, 32))
+        first = preflight_experiment(
+            self.experiment, cache_path=self.cache, max_workers=1, checker=fake_check
+        )
+        self.assertTrue(first.ok, first.errors)
+        self.assertEqual((first.n_files, first.n_contents, first.n_decoded), (4, 1, 1))
+        self.assertEqual(first.texture_bytes, 4 * 64 * 32 * 4)
+        self.assertEqual(first.max_condition_texture_bytes, first.texture_bytes)
+        self.assertAlmostEqual(first.projected_load_s, 2.0)
+        self.assertEqual(first.validation.n_blocks, 1)
+
+        again = preflight_experiment(
+            self.experiment, cache_path=self.cache, max_workers=1, checker=fake_check
+        )
+        self.assertEqual((again.n_decoded, again.n_cached), (0, 1))
+        self.assertEqual(again.asset_index_hash, first.asset_index_hash)
+
+    def test_reports_sizes_modes_and_decode_failures(self) -> None:
+        (self.root / "odd" / "o1.png").write_bytes(png_bytes(64, 32, color_type=2))
+        (self.root / "odd" / "bad.png").write_bytes(png_bytes(64, 32) + b"junk")
+        report = preflight_experiment(self.experiment, max_workers=1, checker=fake_check)
+        self.assertFalse(report.ok)
+        self.assertTrue(any("mixes image sizes: 64x32 (5), 64x33 (1)" in e for e in report.errors))
+        self.assertTrue(any("bad.png does not decode" in e for e in report.errors))
+        self.assertTrue(any("mixes color modes" in w for w in report.warnings))
+
+        headers_only = preflight_experiment(self.experiment, decode=False, checker=fake_check)
+        self.assertEqual(headers_only.n_decoded, 0)
+        self.assertFalse(any("does not decode" in e for e in headers_only.errors))
+
+    def test_unreadable_headers_do_not_stop_the_other_checks(self) -> None:
+        (self.root / "base" / "bad1.png").write_bytes(b"garbage")
+        (self.root / "odd" / "bad2.png").write_bytes(b"\x89PNG")
+        report = preflight_experiment(self.experiment, max_workers=1, checker=fake_check)
+
+        header_errors = [e for e in report.errors if "unreadable header" in e]
+        self.assertEqual(
+            [Path(error.split(" has ")[0]).name for error in header_errors],
+            ["bad1.png", "bad2.png"],
+        )
+        self.assertEqual((report.n_files, report.n_decoded), (6, 2))
+        self.assertTrue(any("mixes image sizes: 64x32 (3), 64x33 (1)" in e for e in report.errors))
+        self.assertEqual(report.texture_bytes, (3 * 64 * 32 + 64 * 33) * 4)
+        self.assertAlmostEqual(report.projected_load_s, 2.0)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyglet"), "pyglet is not installed")
+    def test_pyglet_check_needs_no_display(self) -> None:
+        rgb = self.root / "odd" / "o1.png"
+        rgb.write_bytes(png_bytes(64, 32, color_type=2))
+        broken = self.root / "odd" / "bad.png"
+        broken.write_bytes(png_bytes(64, 32)[:40])
+
+        rgba_check = check_image(self.root / "base" / "b1.png")
+        rgb_check = check_image(rgb)
+
+        self.assertEqual((rgba_check.width, rgba_check.height, rgba_check.mode), (64, 33, "RGBA"))
+        self.assertEqual((rgb_check.width, rgb_check.height, rgb_check.mode), (64, 32, "RGB"))
+        self.assertIsNone(rgba_check.error)
+        self.assertIsNotNone(check_image(broken).error)
+
+    def test_timing_and_missing_folders_are_errors(self) -> None:
+        self.experiment.monitor_refresh_hz = 59
+        self.experiment.conditions[0].oddball_image_dir = self.root / "missing"
+        report = preflight_experiment(self.experiment, max_workers=1, checker=fake_check)
+        self.assertEqual(len(report.errors), 2)
+        self.assertEqual(report.n_files, 0)
+
+    def test_cli_writes_index_and_cache(self) -> None:
+        (self.root / "base" / "b1.png").write_bytes(png_bytes(64, 32))
+        manifest = self.root / "exp.json"
+        save_experiment(self.experiment, manifest)
+        self.assertEqual(main(["preflight", str(manifest), "1", "--headers-only"]), 0)
+        self.assertTrue((self.root / "exp.assets.json").exists())
+        self.assertEqual(preflight_cache_path(manifest), self.cache)
+        self.assertEqual(main(["preflight"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from fpvs_studio.engine.prescale import (
+    FitGeometry,
+    compute_fit_geometry,
+    prescale_available,
+    prescale_image,
+)
+
+try:  # Optional import: prescale_image needs Pillow
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow missing
+    Image = None  # type: ignore[assignment]
+
+RED = (255, 0, 0, 255)
+BLUE = (0, 0, 255, 255)
+GREEN = (0, 255, 0, 255)
+
+
+class ComputeFitGeometryTests(unittest.TestCase):
+    def test_stretch_fills_destination(self) -> None:
+        self.assertEqual(
+            compute_fit_geometry(800, 600, 1920, 1080, "stretch"),
+            FitGeometry(0, 0, 800, 600, 0, 0, 1920, 1080),
+        )
+
+    def test_fit_letterboxes_centered(self) -> None:
+        geometry = compute_fit_geometry(800, 600, 1920, 1080, "fit")
+
+        self.assertEqual((geometry.width, geometry.height), (1440, 1080))
+        self.assertEqual((geometry.x, geometry.y), (240, 0))
+
+    def test_fill_crops_centered_source_region(self) -> None:
+        geometry = compute_fit_geometry(800, 600, 1920, 1080, "fill")
+
+        self.assertEqual((geometry.crop_width, geometry.crop_height), (800, 450))
+        self.assertEqual((geometry.crop_x, geometry.crop_y), (0, 75))
+        self.assertEqual((geometry.width, geometry.height), (1920, 1080))
+
+    def test_prescaled_image_is_placed_one_to_one(self) -> None:
+        geometry = compute_fit_geometry(1440, 1080, 1920, 1080, "fit")
+
+        self.assertEqual((geometry.width, geometry.height), (1440, 1080))
+
+
+@unittest.skipUnless(prescale_available(), "Pillow is not installed")
+class PrescaleImageTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cache_dir = self.root / "cache"
+        self.source = self.root / "stimulus.png"
+        self.write_source(RED, BLUE)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def write_source(self, top: tuple[int, ...], bottom: tuple[int, ...]) -> None:
+        image = Image.new("RGBA", (40, 30), top)
+        image.paste(Image.new("RGBA", (40, 15), bottom), (0, 15))
+        image.save(self.source)
+
+    def test_resamples_to_destination_bottom_up(self) -> None:
+        decoded = prescale_image(self.source, 80, 60, "fit")
+
+        self.assertEqual((decoded.width, decoded.height), (80, 60))
+        self.assertEqual(decoded.data[:4], bytes(BLUE))
+        self.assertEqual(decoded.data[-4:], bytes(RED))
+
+    def test_cache_hit_reuses_stored_image(self) -> None:
+        prescale_image(self.source, 80, 60, "stretch", self.cache_dir)
+        [cached] = self.cache_dir.iterdir()
+        Image.new("RGBA", (80, 60), GREEN).save(cached, format="PNG")
+
+        decoded = prescale_image(self.source, 80, 60, "stretch", self.cache_dir)
+
+        self.assertEqual(decoded.data[:4], bytes(GREEN))
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 1)
+
+    def test_cache_misses_after_source_or_target_change(self) -> None:
+        prescale_image(self.source, 80, 60, "stretch", self.cache_dir)
+        prescale_image(self.source, 40, 30, "stretch", self.cache_dir)
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 2)
+
+        self.write_source(GREEN, GREEN)
+        mtime_ns = self.source.stat().st_mtime_ns + 1_000_000_000
+        os.utime(self.source, ns=(mtime_ns, mtime_ns))
+        decoded = prescale_image(self.source, 80, 60, "stretch", self.cache_dir)
+
+        self.assertEqual(decoded.data[:4], bytes(GREEN))
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
 import random
 import unittest
 
-from fpvs_studio.controllers.scheduling import build_run_plan
+from fpvs_studio.config.serialization import experiment_from_dict, experiment_to_dict
+from fpvs_studio.controllers.scheduling import (
+    build_run_plan,
+    draw_fixation_schedule,
+    rest_after_blocks,
+    sample_fixation_changes,
+)
 from fpvs_studio.models import ConditionModel, ExperimentModel
 
 
@@ -60,5 +66,97 @@ class BuildRunPlanRestTests(unittest.TestCase):
         self.assertEqual(rest.duration_seconds, experiment.rest_default_seconds)
 
 
+class FixationSamplerTests(unittest.TestCase):
+    def assert_constraints(
+        self, frames: list[int], block_frame_counts: list[int], gap: int, margin: int
+    ) -> None:
+        offset = 0
+        for n_frames in block_frame_counts:
+            in_block = [frame - offset for frame in frames if offset <= frame < offset + n_frames]
+            for frame in in_block:
+                self.assertGreaterEqual(frame, margin)
+                self.assertLess(frame, n_frames - margin)
+            for previous, current in zip(in_block, in_block[1:]):
+                self.assertGreaterEqual(current - previous, gap)
+            offset += n_frames
+
+    def test_constraints_hold_at_full_capacity(self) -> None:
+        blocks = [120, 300, 61, 0, 200]
+        # windows 60, 240, 1, 0, 140 -> capacities 4, 16, 1, 0, 10
+        for seed in range(20):
+            frames = sample_fixation_changes(blocks, 31, 15, 30, random.Random(seed))
+            self.assertEqual(len(frames), 31)
+            self.assertEqual(frames, sorted(frames))
+            self.assert_constraints(frames, blocks, 15, 30)
+
+    def test_per_block_quota_and_reproducibility(self) -> None:
+        blocks = [600] * 10
+        frames = sample_fixation_changes(blocks, 20, 30, 60, random.Random(7), max_per_block=2)
+        self.assertEqual(frames, sample_fixation_changes(blocks, 20, 30, 60, random.Random(7), 2))
+        per_block = [sum(1 for frame in frames if frame // 600 == index) for index in range(10)]
+        self.assertEqual(per_block, [2] * 10)
+        self.assert_constraints(frames, blocks, 30, 60)
+
+    def test_long_session_is_drawn_directly(self) -> None:
+        blocks = [3600] * 180
+        frames = sample_fixation_changes(blocks, 900, 60, 30, random.Random(1))
+        self.assertEqual(len(frames), 900)
+        self.assert_constraints(frames, blocks, 60, 30)
+
+    def test_gap_holds_across_blocks_without_rest(self) -> None:
+        for seed in range(200):
+            frames = sample_fixation_changes([120, 120], 2, 30, 0, random.Random(seed), 1)
+            self.assertGreaterEqual(frames[1] - frames[0], 30, seed)
+        rested = [
+            sample_fixation_changes([120, 120], 2, 30, 0, random.Random(seed), 1, [True, False])
+            for seed in range(200)
+        ]
+        self.assertLess(min(frames[1] - frames[0] for frames in rested), 30)
+
+    def test_infeasible_constraints_raise(self) -> None:
+        with self.assertRaises(ValueError):
+            sample_fixation_changes([120, 120], 3, 60, 30, random.Random(0))
+        with self.assertRaises(ValueError):
+            sample_fixation_changes([120], 1, 0, 0, random.Random(0))
+
+    def test_draw_from_experiment(self) -> None:
+        experiment = ExperimentModel(
+            experiment_id="exp",
+            name="Example",
+            base_rate_hz=6.0,
+            oddball_rate_hz=1.2,
+            image_on_ms=166.0,
+            blank_ms=0.0,
+            block_duration_seconds=60,
+            num_cycles=2,
+            randomize_within_cycle=False,
+            rest_enabled=True,
+            rest_default_seconds=10,
+            attention_enabled=True,
+            fixation_min_changes=0,
+            fixation_max_changes=12,
+            fixation_min_gap_ms=2000.0,
+            fixation_edge_margin_ms=1000.0,
+            fixation_max_changes_per_block=3,
+            conditions=[
+                ConditionModel("A", "A", 1, 2, "/tmp/base_a", "/tmp/odd_a"),
+                ConditionModel("B", "B", 3, 4, "/tmp/base_b", "/tmp/odd_b"),
+            ],
+        )
+        plan = build_run_plan(experiment, random.Random(0))
+        frames = draw_fixation_schedule(experiment, plan, 12, random.Random(3), 60)
+        self.assertEqual(len(frames), 12)
+        self.assert_constraints(frames, [3600] * 4, 120, 60)
+        self.assertEqual(rest_after_blocks(plan), [False, True, False, False])
+        first_cycle = [frame for frame in frames if frame < 7200]
+        for previous, current in zip(first_cycle, first_cycle[1:]):
+            self.assertGreaterEqual(current - previous, 120)
+
+        restored = experiment_from_dict(experiment_to_dict(experiment))
+        self.assertEqual(restored.fixation_min_gap_ms, 2000.0)
+        self.assertEqual(restored.fixation_edge_margin_ms, 1000.0)
+        self.assertEqual(restored.fixation_max_changes_per_block, 3)
+
+
 if __name__ == "__main__":
     unittest.main()
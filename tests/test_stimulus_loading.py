@@ -0,0 +1,116 @@
+import importlib.util
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+from fpvs_studio.engine.stimulus_loading import (
+    DecodedImage,
+    collect_condition_stimuli,
+    decode_image,
+    decode_images,
+    expand_to_rgba,
+)
+from fpvs_studio.models import ConditionModel
+
+
+def fake_decode(path: Path) -> DecodedImage:
+    return DecodedImage(path=path, width=1, height=1, data=path.name.encode())
+
+
+def write_png(path: Path, width: int, height: int, pixel: bytes) -> None:
+    """Write a minimal valid RGB or RGBA PNG with every pixel set to ``pixel``."""
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        crc = zlib.crc32(kind + payload)
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", crc)
+
+    rows = b"".join(b"\x00" + pixel * width for _ in range(height))
+    color_type = 6 if len(pixel) == 4 else 2
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+class StimulusLoadingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for folder, names in {"base": ["b.png", "a.JPG", "notes.txt"], "odd": ["z.bmp"]}.items():
+            (self.root / folder).mkdir()
+            for name in names:
+                (self.root / folder / name).write_bytes(b"")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_collect_filters_and_sorts(self) -> None:
+        condition = ConditionModel(
+            id="A",
+            label="A",
+            trigger_code_base=1,
+            trigger_code_oddball=2,
+            base_image_dir=self.root / "base",
+            oddball_image_dir=self.root / "odd",
+        )
+
+        (stimuli,) = collect_condition_stimuli([condition])
+
+        self.assertEqual([path.name for path in stimuli.base_paths], ["a.JPG", "b.png"])
+        self.assertEqual([path.name for path in stimuli.oddball_paths], ["z.bmp"])
+
+    def test_missing_directory_raises(self) -> None:
+        condition = ConditionModel(
+            id="A",
+            label="A",
+            trigger_code_base=1,
+            trigger_code_oddball=2,
+            base_image_dir=self.root / "missing",
+            oddball_image_dir=self.root / "odd",
+        )
+
+        with self.assertRaises(FileNotFoundError):
+            collect_condition_stimuli([condition])
+
+    def test_parallel_decode_keeps_input_order(self) -> None:
+        paths = [self.root / f"{index:03d}.png" for index in range(40)]
+        progress: list[int] = []
+
+        decoded = decode_images(
+            paths,
+            max_workers=4,
+            progress=lambda done, total: progress.append(done),
+            decoder=fake_decode,
+        )
+
+        self.assertEqual([image.path for image in decoded], paths)
+        self.assertEqual(progress, list(range(1, 41)))
+
+    def test_expand_to_rgba(self) -> None:
+        self.assertEqual(
+            expand_to_rgba(b"\x01\x02\x03\x04\x05\x06", "RGB", 2),
+            b"\x01\x02\x03\xff\x04\x05\x06\xff",
+        )
+        self.assertEqual(expand_to_rgba(b"\x03\x02\x01\x80", "BGRA", 1), b"\x01\x02\x03\x80")
+        self.assertEqual(expand_to_rgba(b"\x07\x40", "LA", 1), b"\x07\x07\x07\x40")
+        self.assertIsNone(expand_to_rgba(b"\x00\x00", "XY", 1))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyglet"), "pyglet is not installed")
+    def test_pyglet_decode_needs_no_display(self) -> None:
+        paths = [self.root / f"{index}.png" for index in range(2)]
+        write_png(paths[0], 4, 3, b"\x10\x20\x30\xff")
+        write_png(paths[1], 4, 3, b"\x10\x20\x30")
+
+        decoded = decode_images(paths, max_workers=2) + [decode_image(paths[0])]
+
+        for image in decoded:
+            self.assertEqual((image.width, image.height), (4, 3))
+            self.assertEqual(bytes(image.data), b"\x10\x20\x30\xff" * 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from fpvs_studio.engine.texture_atlas import AtlasSlot, extrude_border, plan_atlas_layout
+
+
+class AtlasLayoutTests(unittest.TestCase):
+    def test_slots_follow_image_order_and_keep_borders_clear(self) -> None:
+        sizes = [(30, 20), (30, 10), (40, 25), (60, 60), (10, 10)]
+        slots = plan_atlas_layout(sizes, atlas_size=64, border=1)
+
+        self.assertEqual(
+            slots,
+            [
+                AtlasSlot(0, 1, 1, 30, 20),
+                AtlasSlot(0, 33, 1, 30, 10),
+                AtlasSlot(0, 1, 23, 40, 25),
+                AtlasSlot(1, 1, 1, 60, 60),
+                AtlasSlot(2, 1, 1, 10, 10),
+            ],
+        )
+        cells = [
+            (slot.atlas, slot.x - 1, slot.y - 1, slot.x + slot.width + 1, slot.y + slot.height + 1)
+            for slot in slots
+            if slot is not None
+        ]
+        for index, (atlas, left, bottom, right, top) in enumerate(cells):
+            self.assertTrue(0 <= left and right <= 64 and 0 <= bottom and top <= 64)
+            for other in cells[index + 1 :]:
+                overlap = (
+                    other[0] == atlas
+                    and other[1] < right
+                    and left < other[3]
+                    and other[2] < top
+                    and bottom < other[4]
+                )
+                self.assertFalse(overlap, (cells[index], other))
+
+    def test_oversized_images_get_their_own_texture(self) -> None:
+        slots = plan_atlas_layout([(64, 8), (62, 8)], atlas_size=64, border=1)
+        self.assertEqual(slots, [None, AtlasSlot(0, 1, 1, 62, 8)])
+        with self.assertRaises(ValueError):
+            plan_atlas_layout([(8, 8)], atlas_size=64, border=-1)
+
+    def test_extrude_border_repeats_edge_pixels(self) -> None:
+        red, green, blue, white = b"R..\xff", b"G..\xff", b"B..\xff", b"W..\xff"
+        padded = extrude_border(red + green + blue + white, 2, 2, 1)
+
+        rows = [padded[start : start + 16] for start in range(0, len(padded), 16)]
+        self.assertEqual(
+            rows,
+            [
+                red + red + green + green,
+                red + red + green + green,
+                blue + blue + white + white,
+                blue + blue + white + white,
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
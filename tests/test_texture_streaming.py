@@ -0,0 +1,123 @@
+import threading
+import unittest
+from pathlib import Path
+
+from fpvs_studio.controllers.scheduling import RunPlan, RunSegment
+from fpvs_studio.engine.stimulus_loading import DecodedImage
+from fpvs_studio.engine.texture_streaming import ConditionTextureStreamer, next_block_condition
+
+
+def fake_images(condition_id: str) -> tuple[list[DecodedImage], list[DecodedImage]]:
+    image = DecodedImage(path=Path(f"{condition_id}.png"), width=4, height=4, data=b"\0" * 64)
+    return [image], [image]
+
+
+def upload_steps(uploads: list[str]):
+    def upload(base: list[DecodedImage], oddball: list[DecodedImage]):
+        for image in [*base, *oddball]:
+            uploads.append(image.path.stem)
+            yield
+        return base[0].path.stem
+
+    return upload
+
+
+def upload_ok(base: list[DecodedImage], oddball: list[DecodedImage]):
+    yield
+    return "ok"
+
+
+class ConditionTextureStreamerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.uploads: list[str] = []
+        self.streamer = ConditionTextureStreamer(
+            fake_images,
+            upload_steps(self.uploads),
+            budget_bytes=256,
+        )
+
+    def tearDown(self) -> None:
+        self.streamer.close()
+
+    def test_unprefetched_condition_is_cold(self) -> None:
+        uploaded, cold = self.streamer.acquire("a")
+
+        self.assertEqual(uploaded, "a")
+        self.assertTrue(cold)
+        self.assertEqual(self.streamer.acquire("a"), ("a", False))
+        self.assertEqual(self.uploads, ["a", "a"])
+
+    def test_prefetch_is_reported_once_and_uploaded_between_blocks(self) -> None:
+        self.streamer.prefetch("b")
+        self.streamer._pending["b"].result()
+
+        self.assertEqual([result.condition_id for result in self.streamer.poll()], ["b"])
+        self.assertEqual(self.streamer.poll(), [])
+        self.assertEqual(self.streamer.upload_ready(), ["b"])
+        self.assertEqual(self.streamer.acquire("b"), ("b", False))
+
+    def test_uploads_are_spread_over_steps(self) -> None:
+        self.streamer.prefetch("b")
+        self.streamer._pending["b"].result()
+
+        self.assertEqual(self.streamer.upload_step(1), [])
+        self.assertEqual(self.uploads, ["b"])
+        self.assertFalse(self.streamer.is_resident("b"))
+        self.assertEqual(self.streamer.upload_step(2), ["b"])
+        self.assertEqual(self.uploads, ["b", "b"])
+        self.assertEqual(self.streamer.upload_step(2), [])
+        self.assertEqual(self.streamer.acquire("b"), ("b", False))
+
+    def test_partly_uploaded_condition_is_cold(self) -> None:
+        self.streamer.prefetch("b")
+        self.streamer._pending["b"].result()
+        self.streamer.upload_step(1)
+
+        self.assertEqual(self.streamer.acquire("b"), ("b", True))
+        self.assertEqual(self.uploads, ["b", "b"])
+
+    def test_acquire_waits_for_pending_decode(self) -> None:
+        release = threading.Event()
+
+        def slow_decode(condition_id: str):
+            release.wait(5)
+            return fake_images(condition_id)
+
+        streamer = ConditionTextureStreamer(slow_decode, upload_ok, budget_bytes=256)
+        try:
+            streamer.prefetch("a")
+            threading.Timer(0.05, release.set).start()
+            self.assertEqual(streamer.acquire("a"), ("ok", True))
+        finally:
+            streamer.close()
+
+    def test_least_recently_used_conditions_are_evicted_over_budget(self) -> None:
+        # Each condition is 128 bytes, so the 256-byte budget holds two.
+        self.streamer.acquire("a")
+        self.streamer.acquire("b")
+        self.streamer.acquire("a")
+        self.streamer.acquire("c")
+
+        self.assertTrue(self.streamer.is_resident("a"))
+        self.assertFalse(self.streamer.is_resident("b"))
+        self.assertTrue(self.streamer.is_resident("c"))
+        self.assertEqual(self.streamer.resident_bytes, 256)
+
+
+class NextBlockConditionTests(unittest.TestCase):
+    def test_skips_rest_segments(self) -> None:
+        plan = RunPlan(
+            segments=[
+                RunSegment("BLOCK", condition_id="a"),
+                RunSegment("REST", duration_seconds=5),
+                RunSegment("BLOCK", condition_id="b"),
+            ]
+        )
+
+        self.assertEqual(next_block_condition(plan, -1), "a")
+        self.assertEqual(next_block_condition(plan, 0), "b")
+        self.assertIsNone(next_block_condition(plan, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
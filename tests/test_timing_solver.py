@@ -0,0 +1,67 @@
+import unittest
+
+from fpvs_studio.models import compute_timing
+from fpvs_studio.models.timing_solver import (
+    compatible_refresh_rates,
+    frame_splits,
+    suggest_timing,
+    timing_grid,
+)
+
+from factories import make_experiment
+
+
+class TimingSolverTests(unittest.TestCase):
+    def test_compatible_refresh_rates(self) -> None:
+        options = compatible_refresh_rates(6.0, 1.2)
+
+        self.assertEqual([option.monitor_refresh_hz for option in options], [60, 120, 144, 240])
+        self.assertEqual(options[0].frames_per_base_cycle, 10)
+        self.assertEqual(options[0].oddball_every_n_base, 5)
+        self.assertEqual(len(options[0].splits), 10)
+        self.assertEqual(compatible_refresh_rates(6.0, 1.3), [])
+
+    def test_every_split_passes_compute_timing(self) -> None:
+        for refresh_hz in (60, 75, 85, 100, 120, 144, 165, 240):
+            for base_rate in (5.0, 7.5):
+                for option in compatible_refresh_rates(base_rate, 1.0, [refresh_hz]):
+                    for split in option.splits:
+                        experiment = make_experiment(
+                            base_rate_hz=base_rate,
+                            oddball_rate_hz=1.0,
+                            image_on_ms=split.image_on_ms,
+                            blank_ms=split.blank_ms,
+                        )
+                        timing = compute_timing(experiment, refresh_hz)
+                        self.assertEqual(timing.image_on_frames, split.image_on_frames)
+                        self.assertEqual(timing.blank_frames, split.blank_frames)
+
+    def test_timing_grid(self) -> None:
+        grid = timing_grid([5.0, 6.0, 7.0], [1.0, 1.2])
+
+        self.assertEqual(len(grid), 6)
+        self.assertEqual(grid[(5.0, 1.0)], [60, 75, 85, 100, 120, 165, 240])
+        self.assertEqual(grid[(5.0, 1.2)], [])
+        self.assertEqual(grid[(7.0, 1.0)], [])
+        self.assertEqual(frame_splits(2, 100)[0].image_on_ms, 10.0)
+
+    def test_suggestion_is_valid_and_minimal(self) -> None:
+        experiment = make_experiment(base_rate_hz=6.2, image_on_ms=40.0, blank_ms=60.0)
+        suggestion = suggest_timing(experiment, 60)
+
+        self.assertEqual(suggestion.base_rate_hz, 6.0)
+        self.assertEqual(suggestion.oddball_rate_hz, 1.2)
+        self.assertEqual(suggestion.changed, ["base_rate_hz", "image_on_ms", "blank_ms"])
+        fixed = make_experiment(
+            base_rate_hz=suggestion.base_rate_hz,
+            oddball_rate_hz=suggestion.oddball_rate_hz,
+            image_on_ms=suggestion.image_on_ms,
+            blank_ms=suggestion.blank_ms,
+        )
+        self.assertEqual(compute_timing(fixed, 60).image_on_frames, 2)
+
+        self.assertEqual(suggest_timing(make_experiment(), 60).changed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
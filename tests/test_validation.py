@@ -0,0 +1,61 @@
+import unittest
+
+from fpvs_studio.controllers.validation import _validate_key, validate_experiment
+
+from factories import make_experiment
+
+
+# Two cycles of two 10 s blocks with a 5 s rest between them and the attention task on.
+RUN_SETTINGS = dict(
+    block_duration_seconds=10,
+    num_cycles=2,
+    randomize_within_cycle=True,
+    rest_enabled=True,
+    rest_default_seconds=5,
+    attention_enabled=True,
+    fixation_min_changes=1,
+    fixation_max_changes=4,
+)
+
+
+class ValidationTests(unittest.TestCase):
+    def test_valid_experiment_report(self) -> None:
+        report = validate_experiment(make_experiment(**RUN_SETTINGS))
+
+        self.assertTrue(report.ok)
+        self.assertEqual(report.n_blocks, 4)
+        self.assertEqual(report.n_segments, 5)
+        self.assertEqual(report.total_duration_seconds, 45)
+        self.assertEqual(report.total_block_frames, 2400)
+
+    def test_reports_timing_and_fixation_errors(self) -> None:
+        experiment = make_experiment(**RUN_SETTINGS)
+        experiment.monitor_refresh_hz = 75
+        self.assertIn("integer multiple", validate_experiment(experiment).errors[0])
+
+        experiment = make_experiment(**RUN_SETTINGS)
+        experiment.block_duration_seconds = 1
+        experiment.fixation_max_changes = 500
+        self.assertIn("do not fit", validate_experiment(experiment).errors[0])
+
+        experiment.monitor_refresh_hz = None
+        report = validate_experiment(experiment)
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report.warnings), 1)
+
+        experiment.conditions = []
+        self.assertFalse(validate_experiment(experiment).ok)
+
+    def test_memoized_on_relevant_fields(self) -> None:
+        _validate_key.cache_clear()
+        experiment = make_experiment(**RUN_SETTINGS)
+        first = validate_experiment(experiment)
+        experiment.instruction_text = "Look at the cross"
+        experiment.conditions[0].label = "Faces"
+
+        self.assertIs(validate_experiment(experiment), first)
+        self.assertEqual(_validate_key.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()